@@ -1,8 +1,23 @@
-from pydantic import BaseModel
+import asyncio
+
+from pydantic import BaseModel, ValidationError
 from pydantic_ai import Agent
-from typing import Optional
+from pydantic_ai.exceptions import UnexpectedModelBehavior
+from typing import List, Optional, Tuple, Type
 
 from schemas.services_schemas import FileReadInput, FileReadOutput, ParsedCV, ParsedJobDescription, SkillMatchingInput, SkillMatchingOutput, CandidateInsights, RedFlagReport
+from schemas.services_schemas import CVBatchInput, IndexedDocument, ParsedCVBatch
+from services.cache_service import AgentCache
+from services.call_policy import CallPolicy
+from services.cascade_service import ModelCascade
+from services.single_flight import SingleFlight
+from services.input_service import InMemoryDocument
+from services.rate_limiter import RateLimiter
+from services.tokens import estimate_tokens
+from services.metrics_service import current_call
+from core.async_utils import run_sync
+from config import DefaultCFG
+
 
 
 
@@ -10,19 +25,35 @@ from schemas.services_schemas import FileReadInput, FileReadOutput, ParsedCV, Pa
 
 
 
+def _record_usage(result):
+    """Adds a run's token usage to the stage being observed, if any, and returns the usage."""
+    usage = result.usage()
+    stats = current_call()
+    if stats is not None:
+        stats.model_calls += usage.requests
+        stats.input_tokens += usage.input_tokens
+        stats.output_tokens += usage.output_tokens
+    return usage
+
 
 class FileManagerAgent:
-    def __init__(self, service, model):
+    """Reads a file and returns its path and content"""
+
+    def __init__(self, service, model, direct_extraction: bool = DefaultCFG.direct_file_extraction, rate_limiter: Optional[RateLimiter] = None):
         """
         service: instance of FileManagerService
         model: pydantic_ai compatible LLM or model object
+        direct_extraction: if True, read files in-process through the service
+            without any LLM round-trip; if False, let the model call the read tool.
+        rate_limiter: optional shared RateLimiter for the LLM path
         """
         self.service = service
+        self.direct_extraction = direct_extraction
+        self.rate_limiter = rate_limiter
         # bind the service method as a tool
         self.agent = Agent(
             name="FileManagerAgent",
-            result_type=FileReadOutput,
-            description="Reads a file and returns its path and content",
+            output_type=FileReadOutput,
             tools=[self._read_file_tool],
             system_prompt=(
                 "You are a File Manager Agent. "
@@ -37,143 +68,467 @@ class FileManagerAgent:
         return FileReadOutput(file_path=file_path, file_content=content)
 
     def run(self, input_data: FileReadInput) -> FileReadOutput:
-        # pass JSON string to run_sync
-        output = self.agent.run_sync(input_data.json()).output
-        return output
-
-
-class CVParserAgent:
-    def __init__(self, model):
+        if self.direct_extraction:
+            # deterministic fast path: zero model calls
+            return self._read_file_tool(input_data.file_path)
+        return run_sync(self.arun(input_data))
+
+    def read_document(self, document: InMemoryDocument) -> FileReadOutput:
+        """Extracts an in-memory document in-process; the LLM read tool only works with paths."""
+        return FileReadOutput(file_path=document.name, file_content=self.service.read_file(document))
+
+    async def aread_document(self, document: InMemoryDocument) -> FileReadOutput:
+        stats = current_call()
+        if stats is not None:
+            stats.agent = self.agent.name
+        if hasattr(self.service, "aread_file"):
+            return FileReadOutput(file_path=document.name, file_content=await self.service.aread_file(document))
+        return await asyncio.to_thread(self.read_document, document)
+
+    async def arun(self, input_data: FileReadInput) -> FileReadOutput:
+        stats = current_call()
+        if stats is not None:
+            stats.agent = self.agent.name
+        if self.direct_extraction:
+            # file parsing is blocking I/O + CPU, keep it off the event loop
+            if hasattr(self.service, "aread_file"):
+                content = await self.service.aread_file(input_data.file_path)
+                return FileReadOutput(file_path=input_data.file_path, file_content=content)
+            return await asyncio.to_thread(self._read_file_tool, input_data.file_path)
+        payload = input_data.json()
+        if self.rate_limiter is None:
+            result = await self.agent.run(payload)
+        else:
+            result = await self.rate_limiter.arun(lambda: self.agent.run(payload), estimate_tokens(payload))
+        _record_usage(result)
+        return result.output
+
+
+class LLMAgent:
+    """
+    Shared base for the structured-output agents.
+
+    Subclasses declare `name`, `output_type` and `system_prompt`; the base builds
+    the pydantic_ai Agent and routes every call through the optional result cache,
+    the optional single-flight coalescing, the optional model cascade, the
+    optional call policy (timeouts, retries, hedging) and the optional shared
+    rate limiter.
+    """
+
+    name: str
+    output_type: Type[BaseModel]
+    system_prompt: str
+
+    def __init__(
+        self,
+        model,
+        cache: Optional[AgentCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        cascade: Optional[ModelCascade] = None,
+        single_flight: Optional[SingleFlight] = None,
+        call_policy: Optional[CallPolicy] = None,
+    ):
+        """
+        model: pydantic_ai compatible LLM or model object
+        cache: optional AgentCache consulted before every model call
+        rate_limiter: optional RateLimiter shared by every agent hitting the same provider
+        cascade: optional ModelCascade; requests go to its fast model first and
+            are escalated to `model` on validation failure or low confidence
+        single_flight: optional SingleFlight shared across sessions; identical requests
+            in flight at the same time (same agent, model and document content)
+            make one model call
+        call_policy: optional CallPolicy giving every model request a timeout,
+            retries on transient errors and, if enabled, hedging
+        """
+        self.model = model
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.cascade = cascade
+        self.single_flight = single_flight
+        self.call_policy = call_policy
         self.agent = Agent(
-            name="CVParserAgent",
-            description="Parses the raw CV text and extracts structured fields such as name, email, skills, education, and experience.",
-            result_type=ParsedCV,
-            tools=[],  # No custom tools — all handled by the LLM
-            system_prompt=(
-                "You are a CV parsing expert. When given a CV as plain text, "
-                "extract the candidate's name, email, phone, skills (as a list), "
-                "education (as a list), and work experience (as a list). "
-                "If available, also extract certifications and a brief professional summary. "
-                "Return the result as a structured response."
-            ),
+            name=self.name,
+            output_type=self.output_type,
+            tools=[],  # LLM handles all logic
+            system_prompt=self.system_prompt,
             model=model
         )
+        self.fast_agent = None
+        if cascade is not None:
+            self.fast_agent = Agent(
+                name=self.name,
+                output_type=self.output_type,
+                tools=[],
+                system_prompt=self.system_prompt,
+                model=cascade.fast_model
+            )
+
+    def _model_name(self, escalated: bool = False) -> str:
+        model_name = getattr(self.model, "model_name", None) or DefaultCFG.model_name
+        if self.cascade is not None and not escalated:
+            # answers may come from either model
+            model_name = f"{self.cascade.fast_model_name}>{model_name}"
+        return model_name
+
+    def _cache_key(self, payload: str) -> str:
+        return AgentCache.make_key(self.name, self.system_prompt, self.output_type, self._model_name(), payload)
+
+    def _flight_key(self, input_data: BaseModel, payload: str, escalated: bool = False) -> str:
+        """
+        Single-flight key: like the cache key, but a document is identified by its content alone, not its
+        file name, and the model part names the models the call may reach (an escalated call skips the fast one).
+        """
+        if isinstance(input_data, FileReadOutput):
+            payload = input_data.file_content
+        return AgentCache.make_key(self.name, self.system_prompt, self.output_type, self._model_name(escalated), payload)
+
+    async def _arun(self, input_data: BaseModel, escalated: bool = False) -> BaseModel:
+        stats = current_call()
+        if stats is not None:
+            stats.agent = self.name
+        payload = input_data.json()
+        key = self._cache_key(payload) if self.cache is not None else None
+        if key is not None:
+            cached = self.cache.get(key, self.output_type)
+            if cached is not None:
+                if stats is not None:
+                    stats.cache_hits += 1
+                return cached
+
+        async def compute() -> BaseModel:
+            output = await self._call_routed(payload, escalated)
+            if key is not None:
+                # stored before the flight lands, so later callers find it in the cache
+                self.cache.set(key, self.name, output)
+            return output
+
+        if self.single_flight is None:
+            return await compute()
+        return await self.single_flight.run(self._flight_key(input_data, payload, escalated), compute)
+
+    async def _call_routed(self, payload: str, escalated: bool = False) -> BaseModel:
+        """
+        Calls the model, through the cascade if there is one.
+
+        `escalated` skips the fast model (its answer was already rejected, e.g. in a batch call).
+        """
+        if self.cascade is None or escalated:
+            return await self._call_model(payload)
+        try:
+            output = await self._call_model(payload, agent=self.fast_agent)
+        except (UnexpectedModelBehavior, ValidationError):
+            escalation = "validation"
+        else:
+            if self.cascade.accepts(output, payload):
+                self.cascade.record(self.name)
+                return output
+            escalation = "low_confidence"
+        self.cascade.record(self.name, escalation)
+        stats = current_call()
+        if stats is not None:
+            stats.escalations += 1
+        return await self._call_model(payload)
+
+    async def _call_model(self, payload: str, agent: Optional[Agent] = None, documents: int = 1) -> BaseModel:
+        agent = agent or self.agent
+        if self.rate_limiter is None and self.call_policy is None:
+            result = await agent.run(payload)
+            _record_usage(result)
+            return result.output
+
+        estimated = estimate_tokens(self.system_prompt) + estimate_tokens(payload)
+        if self.call_policy is not None:
+            # fast-model and batch requests keep latency histories of their own
+            route = "fast" if agent is self.fast_agent else agent.name
+            result = await self.call_policy.arun(
+                self.name, lambda: agent.run(payload), self.rate_limiter, estimated, route,
+                # the agent's timeout is per document; answers grow with the documents packed into a request
+                timeout_scale=documents, input_tokens=lambda result: result.usage().input_tokens,
+            )
+        else:
+            result = await self.rate_limiter.arun(lambda: agent.run(payload), estimated)
+        usage = _record_usage(result)
+        if self.rate_limiter is not None:
+            self.rate_limiter.settle(estimated, usage.input_tokens + usage.output_tokens)
+        return result.output
+
+    def _run(self, input_data: BaseModel) -> BaseModel:
+        return run_sync(self._arun(input_data))
+
+
+class CVParserAgent(LLMAgent):
+    """Parses the raw CV text and extracts structured fields such as name, email, skills, education, and experience."""
+
+    name = "CVParserAgent"
+    output_type = ParsedCV
+    system_prompt = (
+        "You are a CV parsing expert. When given a CV as plain text, "
+        "extract the candidate's name, email, phone, skills (as a list), "
+        "education (as a list), and work experience (as a list). "
+        "If available, also extract certifications and a brief professional summary. "
+        "Return the result as a structured response."
+    )
+
+    batch_system_prompt = (
+        "You are a CV parsing expert. You will receive several CVs at once as a JSON object "
+        "with a list of documents, each carrying an integer index, a file path and the CV as plain text. "
+        "Parse every document independently: extract the candidate's name, email, phone, skills (as a list), "
+        "education (as a list), and work experience (as a list), plus certifications and a brief professional "
+        "summary if available. Never mix information between documents. "
+        "Return exactly one item per document, tagged with that document's index."
+    )
+
+    def __init__(
+        self,
+        model,
+        cache: Optional[AgentCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        cascade: Optional[ModelCascade] = None,
+        single_flight: Optional[SingleFlight] = None,
+        call_policy: Optional[CallPolicy] = None,
+    ):
+        super().__init__(
+            model, cache=cache, rate_limiter=rate_limiter, cascade=cascade, single_flight=single_flight, call_policy=call_policy
+        )
+        # with a cascade, batches go to the fast model; rejected documents are re-parsed by `model`
+        self.batch_agent = Agent(
+            name="CVParserBatchAgent",
+            output_type=ParsedCVBatch,
+            tools=[],
+            system_prompt=self.batch_system_prompt,
+            model=model if cascade is None else cascade.fast_model
+        )
 
     def run(self, input_data: FileReadOutput) -> ParsedCV:
-        return  self.agent.run_sync(input_data.json()).output
-        
+        return self._run(input_data)
+
+    async def arun(self, input_data: FileReadOutput) -> ParsedCV:
+        return await self._arun(input_data)
+
+    def _pack(self, inputs: List[FileReadOutput], token_budget: int, max_documents: int) -> List[List[int]]:
+        """Greedily groups input indices into batches that fit the token budget."""
+        batches: List[List[int]] = []
+        current: List[int] = []
+        used = 0
+        for idx, input_data in enumerate(inputs):
+            tokens = estimate_tokens(input_data.file_content)
+            if current and (used + tokens > token_budget or len(current) >= max_documents):
+                batches.append(current)
+                current, used = [], 0
+            current.append(idx)
+            used += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _arun_batch(self, inputs: List[FileReadOutput], indices: List[int]) -> Tuple[dict, set]:
+        """
+        Parses one packed batch.
 
+        Each item of the answer is validated on its own, so a malformed CV only costs its own
+        document a single re-parse; a failed call returns nothing.
 
+        Returns:
+            Tuple[dict, set]: {input index: ParsedCV} for every document that came back valid, and
+                the indices whose answer the cascade rejected (to be re-parsed without the fast model).
+        """
+        if len(indices) == 1:
+            return {indices[0]: await self._arun(inputs[indices[0]])}, set()
+
+        payload = CVBatchInput(documents=[
+            IndexedDocument(index=idx, file_path=inputs[idx].file_path, file_content=inputs[idx].file_content)
+            for idx in indices
+        ]).json()
+        try:
+            batch: ParsedCVBatch = await self._call_model(payload, agent=self.batch_agent, documents=len(indices))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            return {}, set()
+
+        parsed, escalated = {}, set()
+        for item in batch.items:
+            if item.index in indices and item.index not in parsed and item.index not in escalated:
+                try:
+                    cv = ParsedCV.model_validate(item.cv)
+                except ValidationError:
+                    # re-parsed on its own; like a single call's invalid answer, the fast model is not asked again
+                    if self.cascade is not None:
+                        self.cascade.record(self.name, "validation")
+                        escalated.add(item.index)
+                    continue
+                if self.cascade is not None and not self.cascade.accepts(cv, inputs[item.index].json()):
+                    self.cascade.record(self.name, "low_confidence")
+                    escalated.add(item.index)
+                    continue
+                if self.cascade is not None:
+                    self.cascade.record(self.name)
+                parsed[item.index] = cv
+        stats = current_call()
+        if stats is not None:
+            stats.escalations += len(escalated)
+        if self.cache is not None:
+            for idx, cv in parsed.items():
+                self.cache.set(self._cache_key(inputs[idx].json()), self.name, cv)
+        return parsed, escalated
+
+    async def arun_batch(
+        self,
+        inputs: List[FileReadOutput],
+        token_budget: int = DefaultCFG.cv_batch_token_budget,
+        max_documents: int = DefaultCFG.cv_batch_max_documents,
+        max_concurrency: int = DefaultCFG.max_concurrent_cvs,
+    ) -> List[ParsedCV]:
+        """
+        Parses several CVs, packing as many as fit `token_budget` into each model call.
+
+        Cached documents are answered from the cache and never sent. Any document
+        missing from, duplicated in or invalid in a batch answer (or every document
+        of a batch call that fails) is re-parsed on its own. With a cascade, batch
+        calls go to the fast model and documents whose answer it rejects are
+        re-parsed by the agent's own model.
+
+        Args:
+            inputs (List[FileReadOutput]): Raw CVs.
+            token_budget (int): Estimated input tokens allowed per batch call.
+            max_documents (int): Maximum number of CVs per batch call.
+            max_concurrency (int): Maximum number of batch calls in flight.
+
+        Returns:
+            List[ParsedCV]: Parsed CVs aligned by index with `inputs`.
+        """
+        results: List[Optional[ParsedCV]] = [None] * len(inputs)
+        if self.cache is not None:
+            for idx, input_data in enumerate(inputs):
+                results[idx] = self.cache.get(self._cache_key(input_data.json()), self.output_type)
+        todo = [idx for idx, cv in enumerate(results) if cv is None]
+        stats = current_call()
+        if stats is not None:
+            stats.agent = self.batch_agent.name
+            stats.cache_hits += len(inputs) - len(todo)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def parse(batch: List[int]) -> None:
+            async with semaphore:
+                parsed, escalated = await self._arun_batch(inputs, batch)
+            retry = [idx for idx in batch if idx not in parsed]
+            for idx, cv in zip(retry, await asyncio.gather(*(self._arun(inputs[idx], escalated=idx in escalated) for idx in retry))):
+                parsed[idx] = cv
+            for idx in batch:
+                results[idx] = parsed[idx]
+
+        packed = [[todo[i] for i in batch] for batch in self._pack([inputs[idx] for idx in todo], token_budget, max_documents)]
+        await asyncio.gather(*(parse(batch) for batch in packed))
+        return results
+
+    def run_batch(self, inputs: List[FileReadOutput], token_budget: int = DefaultCFG.cv_batch_token_budget, max_documents: int = DefaultCFG.cv_batch_max_documents) -> List[ParsedCV]:
+        return run_sync(self.arun_batch(inputs, token_budget=token_budget, max_documents=max_documents))
+
+
+
+
+
+
+class JobDescriptionAgent(LLMAgent):
+    """Parses raw job description text and extracts structured job attributes such as title, skills, and responsibilities."""
+
+    name = "JobDescriptionAgent"
+    output_type = ParsedJobDescription
+    system_prompt = (
+        "You are a job description interpretation expert. "
+        "Given a plain text job description, extract the following:\n"
+        "- Job title\n"
+        "- Company name (if present)\n"
+        "- Location (if mentioned)\n"
+        "- Summary or short description\n"
+        "- Required skills (as a list)\n"
+        "- Responsibilities (as a list)\n"
+        "- Qualifications (degrees, certifications, etc.)\n"
+        "- Employment type (Full-Time, Contract, etc.)\n"
+        "- Seniority level (Entry, Mid, Senior)\n"
+        "- Industry (if deducible)\n"
+        "Return the result in a structured format."
+    )
 
+    def run(self, input_data: FileReadOutput) -> ParsedJobDescription:
+        return self._run(input_data)
 
+    async def arun(self, input_data: FileReadOutput) -> ParsedJobDescription:
+        return await self._arun(input_data)
 
 
-class JobDescriptionAgent:
-    def __init__(self, model):
-        self.agent = Agent(
-            name="JobDescriptionAgent",
-            description="Parses raw job description text and extracts structured job attributes such as title, skills, and responsibilities.",
-            result_type=ParsedJobDescription,
-            tools=[],  # LLM handles all logic
-            system_prompt=(
-                "You are a job description interpretation expert. "
-                "Given a plain text job description, extract the following:\n"
-                "- Job title\n"
-                "- Company name (if present)\n"
-                "- Location (if mentioned)\n"
-                "- Summary or short description\n"
-                "- Required skills (as a list)\n"
-                "- Responsibilities (as a list)\n"
-                "- Qualifications (degrees, certifications, etc.)\n"
-                "- Employment type (Full-Time, Contract, etc.)\n"
-                "- Seniority level (Entry, Mid, Senior)\n"
-                "- Industry (if deducible)\n"
-                "Return the result in a structured format."
-            ),
-            model=model
-        )
 
-    def run(self, input_data: FileReadOutput) -> ParsedJobDescription:
-        return self.agent.run_sync(input_data.json()).output
-        
 
+class SkillMatchingAgent(LLMAgent):
+    """Matches a candidate CV to a job description using multi-factor scoring (skills, experience, education, etc.)"""
 
+    name = "SkillMatchingAgent"
+    output_type = SkillMatchingOutput
+    system_prompt = (
+        "You are a smart hiring assistant. When given structured CV and job description data, evaluate the candidate based on:\n\n"
+        "1. Skill match (do they know the required tools?)\n"
+        "2. Experience match (have they held relevant jobs?)\n"
+        "3. Education (do they meet degree requirements?)\n"
+        "4. Certifications/qualifications\n"
+        "5. Job responsibilities alignment\n\n"
+        "Calculate sub-scores (0-100) for each dimension, then compute a weighted total_score.\n"
+        "Return matched/missing elements, and a short summary justifying the score."
+    )
 
+    def run(self, input_data: SkillMatchingInput) -> SkillMatchingOutput:
+        return self._run(input_data)
 
-class SkillMatchingAgent:
-    def __init__(self, model):
-        self.agent = Agent(
-            name="SkillMatchingAgent",
-            description="Matches a candidate CV to a job description using multi-factor scoring (skills, experience, education, etc.)",
-            result_type=SkillMatchingOutput,
-            tools=[],
-            system_prompt=(
-                "You are a smart hiring assistant. When given structured CV and job description data, evaluate the candidate based on:\n\n"
-                "1. Skill match (do they know the required tools?)\n"
-                "2. Experience match (have they held relevant jobs?)\n"
-                "3. Education (do they meet degree requirements?)\n"
-                "4. Certifications/qualifications\n"
-                "5. Job responsibilities alignment\n\n"
-                "Calculate sub-scores (0-100) for each dimension, then compute a weighted total_score.\n"
-                "Return matched/missing elements, and a short summary justifying the score."
-            ),
-            model=model
-        )
+    async def arun(self, input_data: SkillMatchingInput) -> SkillMatchingOutput:
+        return await self._arun(input_data)
 
 
-    def run(self, input_data: SkillMatchingInput) -> SkillMatchingOutput:
-        return self.agent.run_sync(input_data.json()).output
 
+class InsightGeneratorAgent(LLMAgent):
+    """Generates interpretive insights for a candidate from their skill matching output"""
 
-
-class InsightGeneratorAgent:
-    def __init__(self, model):
-        self.agent = Agent(
-            name="InsightGeneratorAgent",
-            description="Generates interpretive insights for a candidate from their skill matching output",
-            result_type=CandidateInsights,
-            tools=[],
-            system_prompt=(
-                "You are a hiring strategist. Given a skill matching result for a candidate:\n"
-                "- Identify strengths (strong skills, excellent education, or relevant experience)\n"
-                "- Identify weaknesses or gaps (missing skills, mismatched responsibilities, or education gaps)\n"
-                "- Describe the candidate's potential (growth, leadership, adaptability, etc.)\n"
-                "- Summarize the overall impression of the candidate in 1-2 lines.\n\n"
-                "Be analytical but concise. Avoid vague statements."
-            ),
-            model=model
-        )
+    name = "InsightGeneratorAgent"
+    output_type = CandidateInsights
+    system_prompt = (
+        "You are a hiring strategist. Given a skill matching result for a candidate:\n"
+        "- Identify strengths (strong skills, excellent education, or relevant experience)\n"
+        "- Identify weaknesses or gaps (missing skills, mismatched responsibilities, or education gaps)\n"
+        "- Describe the candidate's potential (growth, leadership, adaptability, etc.)\n"
+        "- Summarize the overall impression of the candidate in 1-2 lines.\n\n"
+        "Be analytical but concise. Avoid vague statements."
+    )
 
     def run(self, input_data: SkillMatchingOutput) -> CandidateInsights:
-        return self.agent.run_sync(input_data.json()).output
+        return self._run(input_data)
+
+    async def arun(self, input_data: SkillMatchingOutput) -> CandidateInsights:
+        return await self._arun(input_data)
 
 
 
 # ----------------------------
 # 3. RedFlagDetectorAgent
 # ----------------------------
-class RedFlagDetectorAgent:
-    def __init__(self, model):
-        self.agent = Agent(
-            name="RedFlagDetectorAgent",
-            description="Detects red flags in a candidate's profile based on skill matching results.",
-            result_type=RedFlagReport,
-            tools=[],
-            system_prompt=(
-                "You are a red flag detection expert in HR screening.\n"
-                "Given a skill matching report, identify any major issues that may disqualify or concern a recruiter.\n"
-                "Common red flags include:\n"
-                "- Missing critical skills\n"
-                "- Major responsibility mismatches\n"
-                "- No relevant experience\n"
-                "- Poor education alignment\n"
-                "- Missing key certifications\n"
-                "- Low total score (e.g. < 60)\n\n"
-                "Return a list of red_flags, classify severity (Low, Medium, High), and summarize the concern."
-            ),
-            model=model
-        )
+class RedFlagDetectorAgent(LLMAgent):
+    """Detects red flags in a candidate's profile based on skill matching results."""
+
+    name = "RedFlagDetectorAgent"
+    output_type = RedFlagReport
+    system_prompt = (
+        "You are a red flag detection expert in HR screening.\n"
+        "Given a skill matching report, identify any major issues that may disqualify or concern a recruiter.\n"
+        "Common red flags include:\n"
+        "- Missing critical skills\n"
+        "- Major responsibility mismatches\n"
+        "- No relevant experience\n"
+        "- Poor education alignment\n"
+        "- Missing key certifications\n"
+        "- Low total score (e.g. < 60)\n\n"
+        "Return a list of red_flags, classify severity (Low, Medium, High), and summarize the concern."
+    )
 
     def run(self, input_data: SkillMatchingOutput) -> RedFlagReport:
-        return self.agent.run_sync(input_data.json()).output
-        
+        return self._run(input_data)
+
+    async def arun(self, input_data: SkillMatchingOutput) -> RedFlagReport:
+        return await self._arun(input_data)
@@ -15,37 +15,105 @@ from agents.agents import (
     RedFlagDetectorAgent,
 )
 from services.input_service import FileManager
+from services.cache_service import AgentCache
+from services.rate_limiter import RateLimiter
+from services.prescreen_service import SkillPreScreener
+from services.compaction_service import TextCompactor
+from services.metrics_service import PipelineMetrics
+from services.job_store import JobStore
+from services.dedup_service import DuplicateDetector
+from services.talent_pool import TalentPool
+from services.gating_service import ScoreGate
+from services.cascade_service import ModelCascade
+from services.single_flight import SingleFlight
+from services.call_policy import CallPolicy
 from config import DefaultCFG
-# --- LLM Provider ---
-from pydantic_ai.models.google import GoogleModel
-from pydantic_ai.providers.google import GoogleProvider
 
 
 
-# # === SETUP AI MODEL ===
-provider = GoogleProvider(api_key=DefaultCFG.api_key)
-model = GoogleModel(model_name=DefaultCFG.model_name, provider=provider)
+# === METRICS ===
+@st.cache_resource
+def get_metrics() -> PipelineMetrics:
+    # one collector (and at most one /metrics server) per process, across reruns and sessions
+    metrics = PipelineMetrics()
+    if DefaultCFG.metrics_port:
+        metrics.serve(DefaultCFG.metrics_port)
+    return metrics
 
 
+@st.cache_resource
+def get_job_store() -> JobStore:
+    # one SQLite connection per process; jobs outlive sessions so a reload resumes them
+    return JobStore()
 
 
-# === INITIALIZE AGENTS ===
-file_manager_agent = FileManagerAgent(service=FileManager(), model=model)
-cv_parser_agent = CVParserAgent(model=model)
-job_description_agent = JobDescriptionAgent(model=model)
-skill_matching_agent = SkillMatchingAgent(model=model)
-insight_generator_agent = InsightGeneratorAgent(model=model)
-red_flag_detector_agent = RedFlagDetectorAgent(model=model)
-
 # === SCREENING MANAGER ===
-screening_manager = CVScreeningManager(
-    file_manager_agent=file_manager_agent,
-    cv_parser_agent=cv_parser_agent,
-    job_description_agent=job_description_agent,
-    skill_matching_agent=skill_matching_agent,
-    insight_generator_agent=insight_generator_agent,
-    red_flag_detector_agent=red_flag_detector_agent,
-)
+@st.cache_resource
+def get_screening_manager() -> CVScreeningManager:
+    """
+    Builds the models, the six agents and the manager once per process.
+
+    Streamlit re-executes this script on every interaction and for every session;
+    caching the manager keeps reruns cheap and lets all sessions share one agent
+    cache, rate limiter and extraction pool.
+    """
+    # --- LLM Provider ---
+    from pydantic_ai.models.google import GoogleModel
+    from pydantic_ai.providers.google import GoogleProvider
+
+    provider = GoogleProvider(api_key=DefaultCFG.api_key)
+    models = {}
+
+    def model_for(model_name: str) -> GoogleModel:
+        # one model object per distinct name; "" means DefaultCFG.model_name
+        model_name = model_name or DefaultCFG.model_name
+        if model_name not in models:
+            models[model_name] = GoogleModel(model_name=model_name, provider=provider)
+        return models[model_name]
+
+    cascade = ModelCascade(model_for(DefaultCFG.cascade_fast_model)) if DefaultCFG.cascade_enabled else None
+
+    def cascade_for(agent_name: str):
+        return cascade if agent_name in DefaultCFG.cascade_agents else None
+
+    # --- Agents ---
+    agent_cache = AgentCache()
+    rate_limiter = RateLimiter()
+    # this function runs once per process, so every session shares the in-flight requests
+    single_flight = SingleFlight() if DefaultCFG.single_flight_enabled else None
+    # shared too, so hedging learns every agent's latencies from all sessions
+    call_policy = CallPolicy()
+    shared = dict(cache=agent_cache, rate_limiter=rate_limiter, single_flight=single_flight, call_policy=call_policy)
+    file_manager_agent = FileManagerAgent(service=FileManager(), model=model_for(DefaultCFG.file_manager_model), rate_limiter=rate_limiter)
+    cv_parser_agent = CVParserAgent(model=model_for(DefaultCFG.cv_parser_model), cascade=cascade_for("CVParserAgent"), **shared)
+    job_description_agent = JobDescriptionAgent(model=model_for(DefaultCFG.job_description_model), cascade=cascade_for("JobDescriptionAgent"), **shared)
+    skill_matching_agent = SkillMatchingAgent(model=model_for(DefaultCFG.skill_matching_model), cascade=cascade_for("SkillMatchingAgent"), **shared)
+    insight_generator_agent = InsightGeneratorAgent(model=model_for(DefaultCFG.insight_generator_model), cascade=cascade_for("InsightGeneratorAgent"), **shared)
+    red_flag_detector_agent = RedFlagDetectorAgent(model=model_for(DefaultCFG.red_flag_detector_model), cascade=cascade_for("RedFlagDetectorAgent"), **shared)
+
+    return CVScreeningManager(
+        file_manager_agent=file_manager_agent,
+        cv_parser_agent=cv_parser_agent,
+        job_description_agent=job_description_agent,
+        skill_matching_agent=skill_matching_agent,
+        insight_generator_agent=insight_generator_agent,
+        red_flag_detector_agent=red_flag_detector_agent,
+        prescreener=SkillPreScreener() if DefaultCFG.prescreen_enabled else None,
+        batch_cv_parsing=DefaultCFG.cv_batch_parsing,
+        compactor=TextCompactor() if DefaultCFG.compaction_enabled else None,
+        metrics=get_metrics() if DefaultCFG.metrics_enabled else None,
+        job_store=get_job_store() if DefaultCFG.job_store_enabled else None,
+        deduplicator=DuplicateDetector() if DefaultCFG.dedup_enabled else None,
+        talent_pool=TalentPool() if DefaultCFG.talent_pool_enabled else None,
+        score_gate=ScoreGate() if DefaultCFG.score_gate_enabled else None,
+    )
+
+
+@st.cache_data
+def load_styles(path: str) -> str:
+    with open(path, "r") as f:
+        return f.read()
+
 
 # === PAGE ROUTING ==
 
@@ -57,8 +125,8 @@ st.set_page_config(
         )
 
 
-with open('./ui/styles.css', "r") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+st.markdown(f"<style>{load_styles('./ui/styles.css')}</style>", unsafe_allow_html=True)
+screening_manager = get_screening_manager()
         
 if "show_results" not in st.session_state:
     st.session_state["show_results"] = False
@@ -69,7 +137,8 @@ if not st.session_state["show_results"]:
 else:
     results_page = ResultsPage(
         screening_manager=screening_manager,
-        jd_path=st.session_state["jd_path"],
-        cv_paths=st.session_state["cv_paths"]
+        jd_source=st.session_state["jd_document"],
+        cv_sources=st.session_state["cv_documents"],
+        batch_key=st.session_state.get("batch_key"),
     )
     results_page.render()
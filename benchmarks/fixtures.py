@@ -0,0 +1,152 @@
+import os
+import random
+from typing import List, Sequence, Tuple
+
+import docx
+
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn", "Robin", "Drew"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Okafor", "Novak", "Haddad", "Silva", "Kowalski", "Ivanova", "Mensah", "Tanaka", "Dubois"]
+ROLES = ["Backend Engineer", "Data Scientist", "Frontend Developer", "DevOps Engineer", "ML Engineer", "Full Stack Developer"]
+SKILLS = [
+    "Python", "SQL", "Docker", "Kubernetes", "AWS", "PostgreSQL", "React", "TypeScript", "JavaScript", "Go",
+    "Java", "Spark", "Airflow", "TensorFlow", "PyTorch", "scikit-learn", "FastAPI", "Django", "Redis", "Kafka",
+    "Terraform", "CI/CD", "Linux", "Git", "GraphQL", "MongoDB", "Pandas", "NumPy", "Excel", "Tableau",
+]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Analytics", "Hooli", "Vandelay"]
+DEGREES = ["BSc Computer Science", "MSc Data Science", "BEng Software Engineering", "BSc Mathematics", "MSc Statistics"]
+UNIVERSITIES = ["State University", "Institute of Technology", "City College", "Polytechnic University"]
+VERBS = ["Built", "Designed", "Maintained", "Migrated", "Optimised", "Led", "Automated", "Scaled"]
+THINGS = ["a payments API", "the data warehouse", "an ML feature store", "CI pipelines", "a customer dashboard", "event ingestion"]
+
+
+def cv_lines(rng: random.Random, index: int) -> List[str]:
+    """Generates the lines of one synthetic CV, with the section headings real CVs use."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    skills = rng.sample(SKILLS, rng.randint(4, 12))
+    lines = [
+        name,
+        rng.choice(ROLES),
+        f"Email: candidate{index}@example.com | Phone: +1 555 {index % 10000:04d}",
+        "",
+        "Summary",
+        f"Engineer with {rng.randint(1, 15)} years of experience shipping production systems.",
+        "",
+        "Skills",
+        ", ".join(skills),
+        "",
+        "Experience",
+    ]
+    for _ in range(rng.randint(2, 6)):
+        start = rng.randint(2005, 2020)
+        lines.append(f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)} ({start}-{start + rng.randint(1, 4)})")
+        lines.extend(f"- {rng.choice(VERBS)} {rng.choice(THINGS)} using {rng.choice(skills)}" for _ in range(rng.randint(2, 5)))
+    lines += ["", "Education", f"{rng.choice(DEGREES)}, {rng.choice(UNIVERSITIES)}"]
+    if rng.random() < 0.5:
+        lines += ["", "Certifications", rng.choice(["AWS Certified Developer", "CKA", "Google Data Engineer"])]
+    lines += ["", "Interests", "Running, chess, open-source contributions"]
+    return lines
+
+
+def jd_lines(rng: random.Random) -> List[str]:
+    """Generates the lines of one synthetic job description."""
+    return [
+        "Senior Backend Engineer",
+        f"Company: {rng.choice(COMPANIES)}",
+        "Location: Remote",
+        "Employment type: Full-time | Seniority: Senior | Industry: Software",
+        "",
+        "Summary",
+        "We are looking for an engineer to own our core services end to end.",
+        "",
+        "Requirements",
+        ", ".join(rng.sample(SKILLS[:12], 6)),
+        "",
+        "Responsibilities",
+        "- Design and operate backend services",
+        "- Review code and mentor engineers",
+        "- Improve reliability and performance",
+        "",
+        "Qualifications",
+        "- BSc in Computer Science or equivalent experience",
+        "- 5+ years of professional experience",
+        "",
+        "Benefits",
+        "Remote work, learning budget, health insurance",
+    ]
+
+
+def write_txt(path: str, lines: Sequence[str]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+def write_docx(path: str, lines: Sequence[str]) -> None:
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def write_pdf(path: str, lines: Sequence[str], lines_per_page: int = 20) -> None:
+    """
+    Writes `lines` as a minimal text PDF (Helvetica, one text object per page).
+
+    Every page gets a running header and a "Page i of n" footer, like exported
+    CVs do, so extraction and compaction see realistic page furniture.
+    """
+    chunks = [list(lines[i:i + lines_per_page]) for i in range(0, len(lines), lines_per_page)] or [[]]
+    header = f"{lines[0]} - Curriculum Vitae" if lines else "Curriculum Vitae"
+    pages = [[header, *chunk, f"Page {i} of {len(chunks)}"] for i, chunk in enumerate(chunks, 1)]
+
+    def escape(text: str) -> str:
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages)))
+    objects = {
+        1: "<< /Type /Catalog /Pages 2 0 R >>",
+        2: f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>",
+        3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for i, page in enumerate(pages):
+        stream = "BT /F1 10 Tf 14 TL 50 800 Td " + " ".join(f"({escape(line)}) '" for line in page) + " ET"
+        objects[4 + 2 * i] = (
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>"
+        )
+        objects[5 + 2 * i] = f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number in range(1, len(objects) + 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{objects[number]}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+WRITERS = {"txt": write_txt, "pdf": write_pdf, "docx": write_docx}
+
+
+def write_fixtures(directory: str, num_cvs: int, formats: Sequence[str] = ("txt", "pdf", "docx"), seed: int = 0) -> Tuple[str, List[str]]:
+    """
+    Writes one job description and `num_cvs` CVs into `directory`, cycling through `formats`.
+
+    Returns:
+        Tuple[str, List[str]]: The JD path and the CV paths.
+    """
+    rng = random.Random(seed)
+    jd_path = os.path.join(directory, "job_description.txt")
+    write_txt(jd_path, jd_lines(rng))
+
+    cv_paths = []
+    for index in range(num_cvs):
+        ext = formats[index % len(formats)]
+        path = os.path.join(directory, f"cv_{index:05d}.{ext}")
+        WRITERS[ext](path, cv_lines(rng, index))
+        cv_paths.append(path)
+    return jd_path, cv_paths
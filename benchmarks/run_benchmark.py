@@ -0,0 +1,231 @@
+"""
+Offline throughput benchmark of the screening pipeline.
+
+Runs CVScreeningManager and all six agents against StubModel (no network, no
+API key) over generated txt/pdf/docx fixtures, and reports CVs per minute,
+per-stage p50/p95 latency and peak RSS for each pool size. Every size runs in
+a fresh interpreter so the peak RSS figures do not leak into each other.
+
+    python -m benchmarks.run_benchmark --sizes 10 100 1000 --latency 0.05 --jitter 0.02
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+from agents.agents import (
+    FileManagerAgent,
+    CVParserAgent,
+    JobDescriptionAgent,
+    SkillMatchingAgent,
+    InsightGeneratorAgent,
+    RedFlagDetectorAgent,
+)
+from benchmarks.fixtures import write_fixtures
+from benchmarks.stub_models import RESPONDERS, StubModel, degraded
+from core.cv_manager import CVScreeningManager
+from services.cache_service import AgentCache
+from services.call_policy import CallPolicy
+from services.cascade_service import ModelCascade
+from services.compaction_service import TextCompactor
+from services.input_service import FileManager
+from services.metrics_service import PipelineMetrics
+from services.prescreen_service import SkillPreScreener
+from services.rate_limiter import RateLimiter
+from config import DefaultCFG
+
+BATCH_ID = "benchmark"
+
+
+def build_manager(args: argparse.Namespace, metrics: PipelineMetrics) -> CVScreeningManager:
+    """Wires the manager and every agent to their own StubModel, configured from the CLI options."""
+
+    def model(agent_name: str, seed_offset: int) -> StubModel:
+        return StubModel(
+            RESPONDERS[agent_name],
+            latency=args.latency,
+            jitter=args.jitter,
+            failure_rate=args.failure_rate,
+            seed=args.seed + seed_offset,
+            tail_rate=args.tail_rate,
+            tail_latency=args.tail_latency,
+        )
+
+    cache = AgentCache(db_path=":memory:") if args.cache else None
+    rate_limiter = RateLimiter(
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        base_backoff=args.backoff,
+        max_backoff=10 * args.backoff,
+    )
+    call_policy = CallPolicy(
+        timeout=args.timeout, timeouts={}, base_backoff=args.backoff, max_backoff=10 * args.backoff, hedge=args.hedge, hedge_min_samples=10
+    )
+    shared = dict(cache=cache, rate_limiter=rate_limiter, call_policy=call_policy)
+    cascades = {}
+    if args.cascade:
+        # one fast stub per routed agent, wrong on `cascade_degrade_rate` of its answers
+        for offset, name in enumerate(DefaultCFG.cascade_agents):
+            fast = StubModel(
+                degraded(RESPONDERS[name], args.cascade_degrade_rate, seed=args.seed + 10 + offset),
+                latency=args.latency / 4, jitter=args.jitter / 4, seed=args.seed + 20 + offset, model_name="stub-fast",
+            )
+            cascades[name] = ModelCascade(fast)
+    return CVScreeningManager(
+        file_manager_agent=FileManagerAgent(
+            service=FileManager(max_workers=args.extraction_workers), model=model("FileManagerAgent", 0), rate_limiter=rate_limiter
+        ),
+        cv_parser_agent=CVParserAgent(model=model("CVParserAgent", 1), cascade=cascades.get("CVParserAgent"), **shared),
+        job_description_agent=JobDescriptionAgent(model=model("JobDescriptionAgent", 2), cascade=cascades.get("JobDescriptionAgent"), **shared),
+        skill_matching_agent=SkillMatchingAgent(model=model("SkillMatchingAgent", 3), cascade=cascades.get("SkillMatchingAgent"), **shared),
+        insight_generator_agent=InsightGeneratorAgent(model=model("InsightGeneratorAgent", 4), cascade=cascades.get("InsightGeneratorAgent"), **shared),
+        red_flag_detector_agent=RedFlagDetectorAgent(model=model("RedFlagDetectorAgent", 5), cascade=cascades.get("RedFlagDetectorAgent"), **shared),
+        max_concurrency=args.concurrency,
+        prescreener=SkillPreScreener() if args.prescreen else None,
+        batch_cv_parsing=args.batch_parsing,
+        compactor=None if args.no_compaction else TextCompactor(),
+        metrics=metrics,
+    )
+
+
+def _peak_rss_mb(who: int) -> float:
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_once(args: argparse.Namespace, num_cvs: int) -> dict:
+    """Screens `num_cvs` generated CVs in this process and returns the measurements."""
+    with tempfile.TemporaryDirectory(prefix="cv_benchmark_") as directory:
+        jd_path, cv_paths = write_fixtures(directory, num_cvs, formats=args.formats, seed=args.seed)
+        metrics = PipelineMetrics(max_samples=max(DefaultCFG.metrics_max_samples, 2 * num_cvs))
+        manager = build_manager(args, metrics)
+
+        screened = 0
+        start = time.perf_counter()
+        try:
+            for _ in manager.iter_cvs_against_jd(cv_paths, jd_path, batch_id=BATCH_ID):
+                screened += 1
+        finally:
+            # reap the extraction workers so RUSAGE_CHILDREN includes them
+            manager.file_manager_agent.service.close(wait=True)
+        elapsed = time.perf_counter() - start
+
+    stages = metrics.report()["stages"]
+    agents = (manager.cv_parser_agent, manager.job_description_agent, manager.skill_matching_agent,
+              manager.insight_generator_agent, manager.red_flag_detector_agent)
+    models = [agent.model for agent in agents] + [agent.cascade.fast_model for agent in agents if agent.cascade is not None]
+    escalations = {}
+    for agent in agents:
+        if agent.cascade is not None:
+            escalations.update(agent.cascade.report())
+    call_policy = manager.cv_parser_agent.call_policy
+    return {
+        "cvs": num_cvs,
+        "screened": screened,
+        "seconds": round(elapsed, 3),
+        "cvs_per_minute": round(60 * screened / elapsed, 1) if elapsed else None,
+        "model_calls": sum(model.calls for model in models),
+        "simulated_failures": sum(model.failures for model in models),
+        "peak_rss_mb": _peak_rss_mb(resource.RUSAGE_SELF),
+        "peak_rss_children_mb": _peak_rss_mb(resource.RUSAGE_CHILDREN),
+        "stages": {
+            name: {
+                key: summary[key]
+                for key in ("count", "p50_seconds", "p95_seconds", "cache_hits", "retries", "timeouts", "hedges", "escalations", "input_tokens")
+            }
+            for name, summary in stages.items()
+        },
+        "escalations": escalations,
+        "call_policy": call_policy.report() if call_policy else {},
+    }
+
+
+def _child_argv(args: argparse.Namespace, num_cvs: int) -> List[str]:
+    argv = [
+        sys.executable, "-m", "benchmarks.run_benchmark", "--single", str(num_cvs),
+        "--formats", *args.formats,
+        "--latency", str(args.latency), "--jitter", str(args.jitter), "--failure-rate", str(args.failure_rate),
+        "--concurrency", str(args.concurrency), "--extraction-workers", str(args.extraction_workers),
+        "--rpm", str(args.rpm), "--tpm", str(args.tpm), "--backoff", str(args.backoff), "--seed", str(args.seed),
+        "--cascade-degrade-rate", str(args.cascade_degrade_rate),
+        "--tail-rate", str(args.tail_rate), "--tail-latency", str(args.tail_latency), "--timeout", str(args.timeout),
+    ]
+    for flag in ("cache", "batch_parsing", "prescreen", "no_compaction", "cascade", "hedge"):
+        if getattr(args, flag):
+            argv.append("--" + flag.replace("_", "-"))
+    return argv
+
+
+def print_report(results: List[dict]) -> None:
+    print(f"{'CVs':>6} {'seconds':>9} {'CVs/min':>9} {'calls':>7} {'RSS MB':>8} {'workers MB':>11}")
+    for result in results:
+        print(
+            f"{result['cvs']:>6} {result['seconds']:>9} {result['cvs_per_minute']:>9} {result['model_calls']:>7} "
+            f"{result['peak_rss_mb']:>8} {result['peak_rss_children_mb']:>11}"
+        )
+    for result in results:
+        print(f"\nPer-stage latency at {result['cvs']} CVs:")
+        print(f"  {'stage':<16} {'count':>6} {'p50 s':>9} {'p95 s':>9} {'cache':>6} {'retries':>8} {'timeouts':>9} {'hedges':>7}")
+        for name, stage in result["stages"].items():
+            print(
+                f"  {name:<16} {stage['count']:>6} {stage['p50_seconds']:>9} {stage['p95_seconds']:>9} "
+                f"{stage['cache_hits']:>6} {stage['retries']:>8} {stage['timeouts']:>9} {stage['hedges']:>7}"
+            )
+        for agent, counts in result["escalations"].items():
+            print(
+                f"  cascade {agent}: {counts['escalations']}/{counts['calls']} escalated ({100 * counts['escalation_rate']:.1f}%; "
+                f"{counts['validation']} validation, {counts['low_confidence']} low confidence)"
+            )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline CV screening benchmark against stub models.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="CV pool sizes to benchmark")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)  # one size in this process, JSON on stdout
+    parser.add_argument("--formats", nargs="+", default=["txt", "pdf", "docx"], choices=["txt", "pdf", "docx"])
+    parser.add_argument("--latency", type=float, default=0.05, help="mean seconds per model call")
+    parser.add_argument("--jitter", type=float, default=0.02, help="± seconds added to each call")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of calls answered with HTTP 429")
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="share of calls that are stragglers")
+    parser.add_argument("--tail-latency", type=float, default=1.0, help="seconds a straggler call takes")
+    parser.add_argument("--timeout", type=float, default=0.0, help="seconds a model call may take before it is retried (0 = no limit)")
+    parser.add_argument("--hedge", action="store_true", help="duplicate calls slower than the agent's p95")
+    parser.add_argument("--concurrency", type=int, default=DefaultCFG.max_concurrent_cvs)
+    parser.add_argument("--extraction-workers", type=int, default=DefaultCFG.extraction_workers)
+    parser.add_argument("--rpm", type=float, default=0, help="requests per minute (0 = unlimited)")
+    parser.add_argument("--tpm", type=float, default=0, help="tokens per minute (0 = unlimited)")
+    parser.add_argument("--backoff", type=float, default=0.05, help="base backoff after a simulated 429")
+    parser.add_argument("--cache", action="store_true", help="use an in-memory agent cache")
+    parser.add_argument("--batch-parsing", action="store_true", help="pack several CVs per parser call")
+    parser.add_argument("--prescreen", action="store_true", help="enable the local skill pre-screen")
+    parser.add_argument("--no-compaction", action="store_true", help="send raw extracted text to the parsers")
+    parser.add_argument("--cascade", action="store_true", help="route the cascade agents through a faster, less reliable stub first")
+    parser.add_argument("--cascade-degrade-rate", type=float, default=0.2, help="share of fast-stub answers that are invalid or hollow")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the results as JSON to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.single is not None:
+        print(json.dumps(run_once(args, args.single)))
+        return
+
+    results = []
+    for size in args.sizes:
+        completed = subprocess.run(_child_argv(args, size), check=True, capture_output=True, text=True)
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    print_report(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Startup and rerun timing of the Streamlit app.
+
+Drives app.py headless with Streamlit's AppTest (no browser, no model calls):
+the first run pays for the imports and for building the model, agents and
+manager; every later rerun should only re-execute the page script. For
+comparison, the same reruns are repeated with the resource caches cleared
+before each one, which is what every rerun cost when everything was built at
+module level. Runs in a fresh interpreter so the import time is real.
+
+    python -m benchmarks.startup_benchmark --reruns 20
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY_MODULES = ("PyPDF2", "docx", "pydantic_ai.models.google")
+
+
+def _summary(samples: List[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(1000 * statistics.fmean(ordered), 1),
+        "p95_ms": round(1000 * ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 1),
+    }
+
+
+def measure(reruns: int) -> dict:
+    """Times the first run, cached reruns and uncached reruns of app.py in this process."""
+    os.chdir(ROOT)  # app.py reads ./ui/styles.css
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    import streamlit as st
+
+    streamlit_import = time.perf_counter() - start
+
+    app = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+    start = time.perf_counter()
+    app.run()
+    first_run = time.perf_counter() - start
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    loaded_after_startup = {name: name in sys.modules for name in LAZY_MODULES}
+
+    cached = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        cached.append(time.perf_counter() - start)
+
+    uncached = []
+    for _ in range(reruns):
+        st.cache_resource.clear()
+        st.cache_data.clear()
+        start = time.perf_counter()
+        app.run()
+        uncached.append(time.perf_counter() - start)
+
+    return {
+        "streamlit_import_ms": round(1000 * streamlit_import, 1),
+        "first_run_ms": round(1000 * first_run, 1),
+        "cached_rerun": _summary(cached),
+        "uncached_rerun": _summary(uncached),
+        "loaded_after_startup": loaded_after_startup,
+    }
+
+
+def print_report(result: dict) -> None:
+    print(f"streamlit import        {result['streamlit_import_ms']:>9} ms")
+    print(f"first run (cold)        {result['first_run_ms']:>9} ms")
+    for label, key in (("rerun, cached", "cached_rerun"), ("rerun, caches cleared", "uncached_rerun")):
+        print(f"{label:<22} {result[key]['mean_ms']:>9} ms mean {result[key]['p95_ms']:>9} ms p95")
+    speedup = result["uncached_rerun"]["mean_ms"] / max(result["cached_rerun"]["mean_ms"], 1e-6)
+    print(f"cached reruns are {speedup:.1f}x faster")
+    for name, loaded in result["loaded_after_startup"].items():
+        print(f"{name} imported at startup: {'yes' if loaded else 'no'}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Streamlit app startup/rerun timing.")
+    parser.add_argument("--reruns", type=int, default=10, help="reruns timed in each mode")
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)  # measure in this process, JSON on stdout
+    parser.add_argument("--output", help="also write the result as JSON to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.single:
+        print(json.dumps(measure(args.reruns)))
+        return
+
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup_benchmark", "--single", "--reruns", str(args.reruns)],
+        check=True, capture_output=True, text=True, cwd=ROOT,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    print_report(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import asyncio
+import json
+import random
+import re
+from typing import Callable, Dict, List, Optional
+
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, ToolCallPart, UserPromptPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from services.prescreen_service import skill_tokens
+
+
+Responder = Callable[[dict], dict]
+
+_EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+_PHONE_PATTERN = re.compile(r"\+?\d[\d ()-]{6,}\d")
+
+
+class StubModel(FunctionModel):
+    """
+    Offline stand-in for an LLM provider.
+
+    Every request sleeps for `latency` ± `jitter` seconds (a straggler, with
+    probability `tail_rate`, for `tail_latency` seconds instead), fails with a
+    simulated HTTP 429 with probability `failure_rate`, and otherwise answers with the
+    output tool call built by `responder` from the agent's JSON payload. Token
+    usage is estimated by FunctionModel, so rate limiting and metrics behave as
+    they would against a real provider.
+    """
+
+    def __init__(
+        self,
+        responder: Responder,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+        model_name: str = "stub",
+        tail_rate: float = 0.0,
+        tail_latency: float = 1.0,
+    ):
+        """
+        Args:
+            responder (Responder): Maps the decoded user payload to the output tool arguments.
+            latency (float): Mean seconds per request.
+            jitter (float): Latency varies uniformly within ± this many seconds.
+            failure_rate (float): Probability (0-1) that a request fails with HTTP 429.
+            seed (int): Seed of the latency/failure random generator.
+            model_name (str): Name reported to the agents (part of their cache keys).
+            tail_rate (float): Probability (0-1) that a request is a straggler.
+            tail_latency (float): Seconds a straggler takes.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.calls = 0
+        self.failures = 0
+        self._rng = random.Random(seed)
+        self._responder = responder
+        super().__init__(self._respond, model_name=model_name)
+
+    async def _respond(self, messages: List[ModelMessage], info: AgentInfo) -> ModelResponse:
+        self.calls += 1
+        if self._rng.random() < self.tail_rate:
+            await asyncio.sleep(self.tail_latency)
+        else:
+            await asyncio.sleep(max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter)))
+        if self._rng.random() < self.failure_rate:
+            self.failures += 1
+            raise ModelHTTPError(status_code=429, model_name=self.model_name, body="simulated rate limit")
+        payload = json.loads(_last_user_prompt(messages))
+        return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, self._responder(payload))])
+
+
+def _last_user_prompt(messages: List[ModelMessage]) -> str:
+    for message in reversed(messages):
+        if isinstance(message, ModelRequest):
+            for part in message.parts:
+                if isinstance(part, UserPromptPart) and isinstance(part.content, str):
+                    return part.content
+    raise ValueError("No user prompt in the request")
+
+
+def _sections(text: str) -> Dict[str, List[str]]:
+    """Splits fixture text into {lowercase heading: lines}; the lines before the first heading go under ""."""
+    headings = {"summary", "skills", "experience", "education", "certifications", "interests",
+                "requirements", "responsibilities", "qualifications", "benefits"}
+    sections: Dict[str, List[str]] = {"": []}
+    current = ""
+    for line in (line.strip() for line in text.splitlines()):
+        if not line:
+            continue
+        if line.lower() in headings:
+            current = line.lower()
+            sections.setdefault(current, [])
+        else:
+            sections.setdefault(current, []).append(line)
+    return sections
+
+
+def _field(lines: List[str], label: str) -> Optional[str]:
+    for line in lines:
+        for part in line.split("|"):
+            key, _, value = part.partition(":")
+            if key.strip().lower() == label:
+                return value.strip()
+    return None
+
+
+def _split_list(lines: List[str]) -> List[str]:
+    return [item.strip() for line in lines for item in line.split(",") if item.strip()]
+
+
+def parse_cv(document: dict) -> dict:
+    text = document["file_content"]
+    sections = _sections(text)
+    preamble = sections[""]
+    email = _EMAIL_PATTERN.search(text)
+    phone = _PHONE_PATTERN.search(text)
+    return {
+        "name": preamble[0] if preamble else None,
+        "role": preamble[1] if len(preamble) > 1 else None,
+        "email": email.group(0) if email else None,
+        "phone": phone.group(0) if phone else None,
+        "skills": _split_list(sections.get("skills", [])),
+        "education": sections.get("education", []),
+        "experience": [line for line in sections.get("experience", []) if not line.startswith("-")],
+        "certifications": sections.get("certifications", []),
+        "summary": " ".join(sections.get("summary", [])) or None,
+    }
+
+
+def respond_cv_parser(payload: dict) -> dict:
+    """CVParserAgent (single FileReadOutput) and its batch agent (CVBatchInput)."""
+    if "documents" in payload:
+        return {"items": [{"index": document["index"], "cv": parse_cv(document)} for document in payload["documents"]]}
+    return parse_cv(payload)
+
+
+def respond_job_description(payload: dict) -> dict:
+    sections = _sections(payload["file_content"])
+    preamble = sections[""]
+    return {
+        "job_title": preamble[0] if preamble else None,
+        "company": _field(preamble, "company"),
+        "location": _field(preamble, "location"),
+        "job_summary": " ".join(sections.get("summary", [])) or None,
+        "required_skills": _split_list(sections.get("requirements", [])),
+        "responsibilities": [line.lstrip("- ") for line in sections.get("responsibilities", [])],
+        "qualifications": [line.lstrip("- ") for line in sections.get("qualifications", [])],
+        "employment_type": _field(preamble, "employment type"),
+        "seniority_level": _field(preamble, "seniority"),
+        "industry": _field(preamble, "industry"),
+    }
+
+
+def respond_skill_matching(payload: dict) -> dict:
+    candidate, job = payload["candidate"], payload["job"]
+    have = skill_tokens(candidate["skills"])
+    required = skill_tokens(job["required_skills"])
+    matched = sorted(required & have)
+    missing = sorted(required - have)
+    skill_score = 100.0 * len(matched) / len(required) if required else 100.0
+    experience_score = min(100.0, 20.0 * len(candidate["experience"]))
+    education_score = 80.0 if candidate["education"] else 0.0
+    total = 0.5 * skill_score + 0.3 * experience_score + 0.2 * education_score
+    return {
+        "skill_score": skill_score,
+        "experience_score": experience_score,
+        "education_score": education_score,
+        "qualification_score": education_score,
+        "responsibility_score": experience_score,
+        "total_score": total,
+        "matched_skills": matched,
+        "missing_skills": missing,
+        "matched_responsibilities": [],
+        "missing_responsibilities": [],
+        "summary": f"Covers {len(matched)} of {len(required)} required skills.",
+    }
+
+
+def respond_insights(payload: dict) -> dict:
+    return {
+        "strengths": [f"Strong in {skill}" for skill in payload["matched_skills"][:5]],
+        "weaknesses": [f"No {skill} experience" for skill in payload["missing_skills"][:5]],
+        "potential": "High" if payload["total_score"] >= 60 else "Moderate",
+        "insight_summary": payload.get("summary"),
+    }
+
+
+def respond_red_flags(payload: dict) -> dict:
+    flags = [f"Missing {skill}" for skill in payload["missing_skills"][:3]]
+    severity = "High" if payload["total_score"] < 40 else "Medium" if flags else "Low"
+    return {"red_flags": flags, "severity_level": severity, "flagged_summary": f"{len(flags)} concerns found."}
+
+
+def respond_file_manager(payload: dict) -> dict:
+    # only reached with direct extraction disabled; the stub never calls the read tool
+    return {"file_path": payload["file_path"], "file_content": ""}
+
+
+def degraded(responder: Responder, rate: float, seed: int = 0) -> Responder:
+    """
+    Wraps a parser responder as a weaker "fast model": with probability `rate` an
+    answer is broken, half the time invalid (required fields missing, so output
+    validation fails) and half the time hollow (skills, experience and
+    education dropped, so its parse confidence is low). In batch answers only
+    single documents are hollowed.
+    """
+    rng = random.Random(seed)
+
+    def hollow(answer: dict) -> dict:
+        emptied = ("skills", "experience", "education", "required_skills", "responsibilities")
+        return {**answer, **{key: [] for key in emptied if key in answer}}
+
+    def respond(payload: dict) -> dict:
+        answer = responder(payload)
+        if "items" in answer:
+            return {"items": [
+                {**item, "cv": hollow(item["cv"])} if rng.random() < rate else item for item in answer["items"]
+            ]}
+        if rng.random() >= rate:
+            return answer
+        return {} if rng.random() < 0.5 else hollow(answer)
+
+    return respond
+
+
+RESPONDERS: Dict[str, Responder] = {
+    "FileManagerAgent": respond_file_manager,
+    "CVParserAgent": respond_cv_parser,
+    "JobDescriptionAgent": respond_job_description,
+    "SkillMatchingAgent": respond_skill_matching,
+    "InsightGeneratorAgent": respond_insights,
+    "RedFlagDetectorAgent": respond_red_flags,
+}
@@ -0,0 +1,246 @@
+"""
+Headless batch screening: no Streamlit, one JSON result per line.
+
+    python cli.py job_description.pdf ./inbox/ --output results.jsonl
+    python cli.py job_description.pdf "./inbox/**/*.pdf" --concurrency 8 --rpm 60 --no-cache
+    python cli.py job_description.pdf ./inbox/ --job-id nightly   # re-run the same line to resume
+    python cli.py new_role.pdf --from-pool 20   # screen the 20 best previously parsed candidates
+
+CVs are discovered lazily and every CVAnalysisResult is written (and flushed)
+as soon as it finishes, so memory stays flat however many CVs the inbox holds
+(`--dedup` trades that for one fingerprint and parsed CV kept per distinct CV).
+"""
+import argparse
+import glob
+import os
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from agents.agents import (
+    FileManagerAgent,
+    CVParserAgent,
+    JobDescriptionAgent,
+    SkillMatchingAgent,
+    InsightGeneratorAgent,
+    RedFlagDetectorAgent,
+)
+from core.cv_manager import CVScreeningManager
+from services.cache_service import AgentCache
+from services.compaction_service import TextCompactor
+from services.input_service import FileManager
+from services.job_store import JobStore
+from services.dedup_service import DuplicateDetector
+from services.talent_pool import TalentPool
+from services.gating_service import ScoreGate
+from services.cascade_service import ModelCascade
+from services.call_policy import CallPolicy, default_timeouts
+from services.metrics_service import PipelineMetrics
+from services.prescreen_service import SkillPreScreener
+from services.rate_limiter import RateLimiter
+from config import DefaultCFG
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+# DefaultCFG field holding each agent's model name
+AGENT_MODEL_FIELDS = {
+    "FileManagerAgent": "file_manager_model",
+    "CVParserAgent": "cv_parser_model",
+    "JobDescriptionAgent": "job_description_model",
+    "SkillMatchingAgent": "skill_matching_model",
+    "InsightGeneratorAgent": "insight_generator_model",
+    "RedFlagDetectorAgent": "red_flag_detector_model",
+}
+
+
+def iter_cv_paths(sources: List[str], recursive: bool = False) -> Iterator[str]:
+    """
+    Lazily yields CV files from directories, glob patterns and plain paths.
+
+    Directories contribute their .pdf/.docx/.txt files (descending into
+    subdirectories with `recursive`); nothing is listed or sorted up front.
+    """
+    for source in sources:
+        if os.path.isdir(source):
+            stack = [source]
+            while stack:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir() and recursive:
+                            stack.append(entry.path)
+                        elif entry.is_file() and entry.name.lower().endswith(SUPPORTED_EXTENSIONS):
+                            yield entry.path
+        elif glob.has_magic(source):
+            for path in glob.iglob(source, recursive=True):
+                if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS):
+                    yield path
+        else:
+            yield source
+
+
+def iter_results(manager: CVScreeningManager, args: argparse.Namespace, cv_paths: Iterable[str], parsed_jd) -> Iterator:
+    """This run's CVs first, then (with --from-pool) the best prior candidates that were not among them."""
+    screened = set()
+    if args.cvs:
+        for result in manager.iter_cvs_against_parsed_jd(cv_paths, parsed_jd, batch_id=args.job_id):
+            screened.add(result.source_path)
+            yield result
+    if args.from_pool:
+        yield from manager.run_talent_pool(parsed_jd, top_k=args.from_pool, batch_id=args.job_id, exclude=screened)
+
+
+def build_model(model_name: str, api_key: str):
+    # imported here so --help works without the provider SDK configured
+    from pydantic_ai.models.google import GoogleModel
+    from pydantic_ai.providers.google import GoogleProvider
+
+    return GoogleModel(model_name=model_name, provider=GoogleProvider(api_key=api_key))
+
+
+def agent_model_names(args: argparse.Namespace) -> Dict[str, str]:
+    """Model name of every agent: --agent-model overrides, then the DefaultCFG per-agent fields, then --model."""
+    names = {agent: getattr(DefaultCFG, field) or args.model for agent, field in AGENT_MODEL_FIELDS.items()}
+    for override in args.agent_model:
+        agent, _, model_name = override.partition("=")
+        names[agent] = model_name
+    return names
+
+
+def build_manager(args: argparse.Namespace, model_for: Callable[[str], object], metrics: Optional[PipelineMetrics]) -> CVScreeningManager:
+    """`model_for(model name)` returns the model object of a name (one per distinct name)."""
+    cache = AgentCache(db_path=args.cache_path, enabled=not args.no_cache)
+    rate_limiter = RateLimiter(requests_per_minute=args.rpm, tokens_per_minute=args.tpm, max_retries=args.max_retries)
+    call_policy = CallPolicy(
+        timeout=args.timeout,
+        timeouts={**default_timeouts(), **args.agent_timeout},
+        max_retries=args.call_retries,
+        hedge=args.hedge,
+    )
+    shared = dict(cache=cache, rate_limiter=rate_limiter, call_policy=call_policy)
+    names = agent_model_names(args)
+    cascade = ModelCascade(model_for(args.cascade), min_confidence=args.cascade_min_confidence) if args.cascade else None
+
+    def routed(agent: str) -> dict:
+        return dict(model=model_for(names[agent]), cascade=cascade if agent in args.cascade_agents else None, **shared)
+
+    return CVScreeningManager(
+        file_manager_agent=FileManagerAgent(
+            service=FileManager(max_workers=args.extraction_workers), model=model_for(names["FileManagerAgent"]), rate_limiter=rate_limiter
+        ),
+        cv_parser_agent=CVParserAgent(**routed("CVParserAgent")),
+        job_description_agent=JobDescriptionAgent(**routed("JobDescriptionAgent")),
+        skill_matching_agent=SkillMatchingAgent(**routed("SkillMatchingAgent")),
+        insight_generator_agent=InsightGeneratorAgent(**routed("InsightGeneratorAgent")),
+        red_flag_detector_agent=RedFlagDetectorAgent(**routed("RedFlagDetectorAgent")),
+        max_concurrency=args.concurrency,
+        prescreener=SkillPreScreener() if args.prescreen else None,
+        batch_cv_parsing=args.batch_parsing,
+        compactor=TextCompactor() if DefaultCFG.compaction_enabled else None,
+        metrics=metrics,
+        job_store=JobStore(db_path=args.job_store) if args.job_id else None,
+        max_item_retries=args.item_retries,
+        deduplicator=DuplicateDetector() if args.dedup else None,
+        talent_pool=None if args.no_talent_pool else TalentPool(db_path=args.talent_pool),
+        score_gate=ScoreGate({"total_score": args.score_gate}) if args.score_gate is not None else None,
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Screen a folder of CVs against a job description and stream JSONL results.")
+    parser.add_argument("jd_path", help="job description file (.pdf, .docx or .txt)")
+    parser.add_argument("cvs", nargs="*", help="CV files, directories or glob patterns (quote globs)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL file to write; '-' for stdout (default)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="descend into subdirectories")
+    parser.add_argument("--model", default=DefaultCFG.model_name, help="model name")
+    parser.add_argument("--agent-model", action="append", default=[], metavar="AGENT=MODEL", help="model of one agent, e.g. CVParserAgent=gemini-2.0-flash-lite (repeatable)")
+    parser.add_argument("--cascade", metavar="FAST_MODEL", default=DefaultCFG.cascade_fast_model if DefaultCFG.cascade_enabled else None, help="try this model first for the cascade agents and escalate to their own model on invalid or low-confidence answers")
+    parser.add_argument("--cascade-agents", nargs="+", default=list(DefaultCFG.cascade_agents), metavar="AGENT", help="agents routed through --cascade")
+    parser.add_argument("--cascade-min-confidence", type=float, default=DefaultCFG.cascade_min_confidence, help="parse confidence (0-1) below which a fast answer is escalated")
+    parser.add_argument("--api-key", default=os.environ.get("GOOGLE_API_KEY", DefaultCFG.api_key), help="provider API key (default: $GOOGLE_API_KEY)")
+    parser.add_argument("--concurrency", type=int, default=DefaultCFG.max_concurrent_cvs, help="CVs screened at the same time")
+    parser.add_argument("--extraction-workers", type=int, default=DefaultCFG.extraction_workers, help="PDF/DOCX extraction processes")
+    parser.add_argument("--rpm", type=float, default=DefaultCFG.requests_per_minute, help="requests per minute (0 = unlimited)")
+    parser.add_argument("--tpm", type=float, default=DefaultCFG.tokens_per_minute, help="tokens per minute (0 = unlimited)")
+    parser.add_argument("--max-retries", type=int, default=DefaultCFG.rate_limit_max_retries, help="retries after a rate-limit error")
+    parser.add_argument("--timeout", type=float, default=DefaultCFG.call_timeout_seconds, help="seconds a model request may take (0 = no limit)")
+    parser.add_argument("--agent-timeout", action="append", default=[], metavar="AGENT=SECONDS", help="timeout of one agent's requests, e.g. SkillMatchingAgent=180 (repeatable)")
+    parser.add_argument("--call-retries", type=int, default=DefaultCFG.call_max_retries, help="retries after a timeout, 5xx or connection error")
+    parser.add_argument("--hedge", action="store_true", default=DefaultCFG.hedge_enabled, help="send a duplicate of requests slower than the agent's p95 and keep the first answer")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the agent result cache")
+    parser.add_argument("--cache-path", default=DefaultCFG.cache_path, help="SQLite file of the agent result cache")
+    parser.add_argument("--batch-parsing", action="store_true", help="pack several CVs per parser call (reads the whole pool first)")
+    parser.add_argument("--prescreen", action="store_true", help="local skill shortlist before the LLM stages (reads the whole pool first)")
+    parser.add_argument("--score-gate", type=float, metavar="SCORE", default=DefaultCFG.score_gate_min_total_score if DefaultCFG.score_gate_enabled else None, help="skip the insight/red-flag agents below this total score (0-100)")
+    parser.add_argument("--dedup", action="store_true", help="screen duplicate CVs once and copy the result (memory grows with the number of distinct CVs)")
+    parser.add_argument("--job-id", help="checkpoint the run under this id; re-running with the same id resumes it")
+    parser.add_argument("--job-store", default=DefaultCFG.job_store_path, help="SQLite file of job checkpoints")
+    parser.add_argument("--item-retries", type=int, default=DefaultCFG.job_max_item_retries, help="retries of a failing CV before it is reported as failed")
+    parser.add_argument("--from-pool", type=int, metavar="K", help="also screen the K best candidates already in the talent pool")
+    parser.add_argument("--talent-pool", default=DefaultCFG.talent_pool_path, help="SQLite file of the talent pool")
+    parser.add_argument("--no-talent-pool", action="store_true", help="neither add parsed CVs to the talent pool nor query it")
+    parser.add_argument("--metrics-json", help="write the per-stage metrics report of the run to this path")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print progress to stderr")
+    args = parser.parse_args(argv)
+    unknown = {override.partition("=")[0] for override in args.agent_model + args.agent_timeout} | set(args.cascade_agents)
+    unknown -= set(AGENT_MODEL_FIELDS)
+    if unknown:
+        parser.error(f"unknown agents: {', '.join(sorted(unknown))} (choose from {', '.join(AGENT_MODEL_FIELDS)})")
+    try:
+        args.agent_timeout = {agent: float(seconds) for agent, _, seconds in (timeout.partition("=") for timeout in args.agent_timeout)}
+    except ValueError:
+        parser.error("--agent-timeout takes AGENT=SECONDS")
+    if not args.cvs and not args.from_pool:
+        parser.error("give CVs to screen, --from-pool K, or both")
+    if args.from_pool and args.no_talent_pool:
+        parser.error("--from-pool needs the talent pool")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    metrics = PipelineMetrics() if args.metrics_json else None
+    models = {}
+
+    def model_for(model_name: str):
+        if model_name not in models:
+            models[model_name] = build_model(model_name, args.api_key)
+        return models[model_name]
+
+    manager = build_manager(args, model_for, metrics)
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    screened = 0
+    try:
+        parsed_jd = manager.parse_job_description(args.jd_path, batch_id=args.job_id)
+        jd_path = os.path.abspath(args.jd_path)
+        # the JD often sits in the same inbox as the CVs
+        cv_paths = (path for path in iter_cv_paths(args.cvs, args.recursive) if os.path.abspath(path) != jd_path)
+        for result in iter_results(manager, args, cv_paths, parsed_jd):
+            output.write(result.model_dump_json() + "\n")
+            output.flush()
+            screened += 1
+            if args.verbose:
+                score = f"{result.skill_match.total_score:.1f}%" if result.skill_match else result.error
+                print(f"[{screened}] {result.source_path}: {score} ({result.status})", file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        manager.file_manager_agent.service.close()
+        if args.metrics_json and metrics is not None:
+            metrics.to_json(path=args.metrics_json)
+
+    if args.verbose:
+        print(f"Screened {screened} CVs.", file=sys.stderr)
+        agents = (manager.cv_parser_agent, manager.job_description_agent, manager.skill_matching_agent,
+                  manager.insight_generator_agent, manager.red_flag_detector_agent)
+        cascade = next((agent.cascade for agent in agents if agent.cascade is not None), None)
+        for agent, counts in (cascade.report() if cascade else {}).items():
+            print(f"{agent}: {counts['escalations']}/{counts['calls']} escalated to the stronger model "
+                  f"({counts['validation']} invalid, {counts['low_confidence']} low confidence)", file=sys.stderr)
+        call_policy = manager.cv_parser_agent.call_policy
+        for agent, counts in (call_policy.report() if call_policy else {}).items():
+            print(f"{agent}: {counts['calls']} requests, {counts['timeouts']} timed out, {counts['retries']} retried, "
+                  f"{counts['hedges']} hedged ({counts['hedge_wins']} hedges answered first)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
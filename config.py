@@ -5,9 +5,111 @@ from dataclasses import dataclass
 @dataclass
 class DefaultCFG:
 
-    sleep_time_between_requests: int = 15
     api_key: str = "YOUR_API"
     model_name: str = "gemini-2.0-flash" # any model
+    direct_file_extraction: bool = True # read files in-process instead of through the LLM tool call
+    max_concurrent_cvs: int = 4 # CVs screened concurrently in batch runs
+
+    # --- Per-agent models ("" = model_name) ---
+    file_manager_model: str = "" # only used with direct_file_extraction off
+    cv_parser_model: str = ""
+    job_description_model: str = ""
+    skill_matching_model: str = ""
+    insight_generator_model: str = ""
+    red_flag_detector_model: str = ""
+
+    # --- Request coalescing ---
+    single_flight_enabled: bool = True # identical concurrent agent requests (any session) share one model call
+
+    # --- Model cascade ---
+    cascade_enabled: bool = False # try a fast model first, escalate to the agent's model when needed
+    cascade_fast_model: str = "gemini-2.0-flash-lite"
+    cascade_agents: tuple = ("CVParserAgent", "JobDescriptionAgent") # agents routed through the cascade
+    cascade_min_confidence: float = 0.6 # fast answers below this parse confidence (0-1) are escalated
+
+    # --- Document extraction ---
+    extraction_workers: int = 4 # process pool size for PDF/DOCX extraction; 0 = extract on a thread
+    extraction_max_pages: int = 50 # pages extracted per PDF
+    extraction_timeout_seconds: float = 60.0 # per-file extraction time limit
+    extraction_lookahead: int = 16 # batch runs start extracting this many CVs ahead of the LLM stages
+
+    # --- Prompt-size reduction ---
+    compaction_enabled: bool = True # compact extracted CV/JD text before the parser agents
+    compaction_cv_token_budget: int = 3000 # estimated tokens per CV sent to CVParserAgent; 0 = no limit
+    compaction_jd_token_budget: int = 2000 # estimated tokens per JD sent to JobDescriptionAgent; 0 = no limit
+    compaction_repeat_ratio: float = 0.5 # lines at the top/bottom of this share of pages count as headers/footers
+
+    # --- Rate limiting (shared by every agent) ---
+    requests_per_minute: int = 15 # provider request quota; 0 disables
+    tokens_per_minute: int = 1_000_000 # provider token quota; 0 disables
+    rate_limit_max_retries: int = 5 # retries after a 429 / RESOURCE_EXHAUSTED answer
+    rate_limit_base_backoff: float = 2.0 # seconds, doubled on every retry (with jitter)
+    rate_limit_max_backoff: float = 60.0
+
+    # --- Call timeouts, retries and hedging ---
+    call_timeout_seconds: float = 120.0 # per model request; 0 = no limit
+    cv_parser_timeout_seconds: float = 0.0 # per-agent overrides; 0 = call_timeout_seconds
+    job_description_timeout_seconds: float = 0.0
+    skill_matching_timeout_seconds: float = 0.0
+    insight_generator_timeout_seconds: float = 0.0
+    red_flag_detector_timeout_seconds: float = 0.0
+    call_max_retries: int = 2 # retries after a timeout, 408/5xx answer or connection error
+    call_base_backoff: float = 1.0 # seconds, doubled on every retry (with jitter)
+    call_max_backoff: float = 20.0
+    hedge_enabled: bool = False # duplicate requests running past the agent's recent latency quantile
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20 # latencies observed per agent before hedging starts
+    hedge_max_share: float = 0.05 # hedges allowed as a share of all requests
+
+    # --- Batched CV parsing (batch runs only) ---
+    cv_batch_parsing: bool = False # pack several CVs into one CVParserAgent call
+    cv_batch_token_budget: int = 12000 # estimated input tokens per batched call
+    cv_batch_max_documents: int = 8
+
+    # --- Local skill pre-screen (batch runs only) ---
+    prescreen_enabled: bool = False # shortlist locally before the LLM matching/insight/red-flag agents
+    prescreen_threshold: float = 20.0 # minimum weighted required-skill overlap (0-100)
+    prescreen_top_k: int = 0 # keep at most this many candidates; 0 = no limit
+
+    # --- Score gate ---
+    score_gate_enabled: bool = False # skip the insight/red-flag agents for low skill-match scores
+    score_gate_min_total_score: float = 30.0 # candidates below this total_score (0-100) are gated
+    score_gate_min_skill_score: float = 0.0 # also gate below this skill_score; 0 = not checked
+
+    # --- Results page ---
+    results_page_size: int = 25 # candidates per page of the results index (10, 25, 50 or 100)
+
+    # --- Duplicate CVs ---
+    dedup_enabled: bool = True # screen near-identical CVs once and copy the result to the others
+    dedup_threshold: float = 0.9 # minimum estimated Jaccard similarity of word shingles
+    dedup_num_perm: int = 128 # MinHash signature length
+    dedup_shingle_size: int = 5 # words per shingle
+
+    # --- Metrics ---
+    metrics_enabled: bool = True # per-stage latency/token/cache instrumentation
+    metrics_max_samples: int = 10000 # durations kept per stage for p50/p95
+    metrics_max_batches: int = 50 # batches kept for per-batch JSON reports
+    metrics_port: int = 0 # serve Prometheus text at :port/metrics; 0 = off
+
+    # --- Agent result cache ---
+    cache_enabled: bool = True # set False to bypass the cache
+    cache_path: str = ".cache/agent_cache.sqlite"
+    cache_max_entries: int = 20000
+    cache_max_age_seconds: int = 7 * 24 * 3600
+
+    # --- Resumable jobs ---
+    job_store_enabled: bool = True # checkpoint every stage so an interrupted batch resumes
+    job_store_path: str = ".cache/jobs.sqlite"
+    job_max_item_retries: int = 2 # retries of a failing CV before it is reported as "failed"
+    job_store_max_jobs: int = 200 # jobs kept before the least recently updated are evicted
+    job_store_max_age_seconds: int = 7 * 24 * 3600 # jobs not updated for this long are evicted
+
+    # --- Talent pool ---
+    talent_pool_enabled: bool = True # keep every parsed CV in a local index to query new JDs against
+    talent_pool_path: str = ".cache/talent_pool.sqlite"
+    talent_pool_top_k: int = 20 # prior candidates retrieved per job description
+    talent_pool_vector_dim: int = 0 # hashed bag-of-words vector size; 0 = keyword index only
+    talent_pool_vector_weight: float = 0.3 # share of the retrieval score taken from vector similarity
     
 
     
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Coroutine, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_thread_state = threading.local()
+
+
+def _thread_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns this thread's event loop, creating it on first use.
+
+    The loop is kept open and reused (the same way pydantic_ai's `run_sync` does),
+    so HTTP clients bound to it by the model providers stay valid across calls.
+    """
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_state.loop = loop
+    return loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Runs a coroutine to completion from synchronous code.
+
+    If the calling thread already has a running event loop (e.g. inside a notebook),
+    the coroutine is executed on a short-lived helper thread with its own loop instead.
+
+    Args:
+        coro (Coroutine): The coroutine to run.
+
+    Returns:
+        T: The coroutine's result.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return _thread_event_loop().run_until_complete(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def iterate_sync(agen: AsyncIterator[T]) -> Iterator[T]:
+    """
+    Exposes an async generator as a regular generator.
+
+    Each item is produced by advancing the async generator on this thread's event
+    loop, so work between items keeps running concurrently inside the loop while the
+    caller consumes results one at a time. Closing the returned generator closes the
+    async one (cancelling whatever it still has in flight).
+
+    Raises:
+        RuntimeError: If called from a thread with a running event loop; iterate the
+            async generator directly there.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError("iterate_sync() cannot be used inside a running event loop; use `async for` instead")
+
+    loop = _thread_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(agen.aclose())
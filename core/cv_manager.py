@@ -1,12 +1,103 @@
-from schemas.services_schemas import FileReadInput
+from schemas.services_schemas import FileReadInput, FileReadOutput
 from schemas.services_schemas import CVAnalysisResult
-from schemas.services_schemas import SkillMatchingInput
+from schemas.services_schemas import SkillMatchingInput, SkillMatchingOutput
+from schemas.services_schemas import ParsedCV, ParsedJobDescription
+from schemas.services_schemas import CandidateInsights, RedFlagReport
+from schemas.services_schemas import CompactedDocument, ScreeningMatrix
+from core.async_utils import run_sync, iterate_sync
+from core.pipeline import Stage, StageGraph
+from services.prescreen_service import SkillPreScreener
+from services.compaction_service import TextCompactor
+from services.metrics_service import PipelineMetrics
+from services.job_store import JobStore
+from services.dedup_service import DuplicateDetector, DuplicateIndex
+from services.talent_pool import TalentPool
+from services.gating_service import ScoreGate
+from services.input_service import DocumentSource, InMemoryDocument, document_key, source_name
+from config import DefaultCFG
+
+import asyncio
+import dataclasses
+import hashlib
+import uuid
+from collections import defaultdict, deque
+from contextlib import aclosing, nullcontext
+from typing import AsyncIterator, Iterable, Iterator, Optional
+
+_BUILTIN_STAGE_NAMES = {"raw_cv", "compact_cv", "parsed_cv", "raw_jd", "compact_jd", "parsed_jd", "skill_match", "insights", "red_flags"}
+
+
+class _DuplicateFanOut:
+    """
+    Copies each canonical CV's result to the duplicates grouped with it, whichever finishes first.
+
+    A canonical's result is only held while duplicates claimed for it have not received it yet,
+    and dropped after the last copy. With `late_duplicates` (streaming batches, where duplicates
+    are found while canonicals already finish), the parsed CV of every finished canonical is kept
+    instead, so a duplicate found after its canonical finished runs the LLM tail on it (see `claim`).
+    """
+
+    def __init__(self, late_duplicates: bool = False):
+        self.late_duplicates = late_duplicates
+        self._results: dict[str, CVAnalysisResult] = {}
+        self._waiting: dict[str, list[tuple[int, dict]]] = defaultdict(list)
+        self._claimed: dict[str, int] = defaultdict(int)
+        self._finished: dict[str, tuple[Optional[ParsedCV], Optional[str]]] = {}
+
+    @staticmethod
+    def _copy(result: CVAnalysisResult, context: dict) -> CVAnalysisResult:
+        return result.model_copy(update={"source_path": context["cv_path"], "item_key": context.get("item_key"), "duplicate_of": result.source_path})
+
+    def claim(self, canonical: str) -> Optional[tuple[Optional[ParsedCV], Optional[str]]]:
+        """
+        Called as soon as a streamed CV is found to duplicate `canonical` (an item key).
+
+        Returns the canonical's parsed CV (None if it failed) and source path if it already
+        finished; otherwise reserves its result for the duplicate, to be handed over through
+        add_duplicate, and returns None.
+        """
+        if canonical in self._finished:
+            return self._finished[canonical]
+        self._claimed[canonical] += 1
+        return None
+
+    def add_duplicate(self, idx: int, context: dict) -> list[tuple[int, CVAnalysisResult]]:
+        # groups are keyed by item key: upload names may repeat
+        canonical = context["duplicate_of"]
+        if self._claimed.get(canonical):
+            self._claimed[canonical] -= 1
+            if not self._claimed[canonical]:
+                del self._claimed[canonical]
+        if canonical in self._results:
+            # the last claimed duplicate releases the result
+            result = self._results[canonical] if canonical in self._claimed else self._results.pop(canonical)
+            return [(idx, self._copy(result, context))]
+        self._waiting[canonical].append((idx, context))
+        return []
+
+    def add_canonical(self, idx: int, result: CVAnalysisResult) -> list[tuple[int, CVAnalysisResult]]:
+        key = result.item_key
+        ready = [(idx, result)] + [(i, self._copy(result, context)) for i, context in self._waiting.pop(key, [])]
+        if self._claimed.get(key):
+            self._results[key] = result
+        if self.late_duplicates:
+            self._finished[key] = (result.cv, result.source_path)
+        return ready
+
+    def add_late_duplicate(self, idx: int, result: CVAnalysisResult, canonical: str) -> list[tuple[int, CVAnalysisResult]]:
+        """Marks the result of a duplicate that ran the tail on its finished canonical's parsed CV."""
+        return [(idx, result.model_copy(update={"duplicate_of": self._finished[canonical][1]}))]
 
-import time
 
 class CVScreeningManager:
     """
     Manages the end-to-end process of screening CVs against a job description.
+
+    The pipeline is implemented with asyncio (`arun_*` methods); the synchronous
+    `run_*` methods are thin wrappers that drive the async versions to completion.
+    Each CV is screened by scheduling the stage graph in `self.pipeline`; outputs of
+    any extra registered stages are returned in `CVAnalysisResult.extras`. Request
+    pacing is left to the agents' shared RateLimiter, so the manager never sleeps.
     """
 
     def __init__(
@@ -17,9 +108,50 @@ class CVScreeningManager:
         skill_matching_agent,
         insight_generator_agent,
         red_flag_detector_agent,
+        max_concurrency: int = DefaultCFG.max_concurrent_cvs,
+        prescreener: Optional[SkillPreScreener] = None,
+        batch_cv_parsing: bool = DefaultCFG.cv_batch_parsing,
+        extraction_lookahead: int = DefaultCFG.extraction_lookahead,
+        compactor: Optional[TextCompactor] = None,
+        metrics: Optional[PipelineMetrics] = None,
+        job_store: Optional[JobStore] = None,
+        max_item_retries: int = DefaultCFG.job_max_item_retries,
+        deduplicator: Optional[DuplicateDetector] = None,
+        talent_pool: Optional[TalentPool] = None,
+        score_gate: Optional[ScoreGate] = None,
     ):
         """
         Initializes the CVScreeningManager with required agents.
+
+        Args:
+            max_concurrency (int): Maximum number of CVs screened at the same time in batch calls.
+            prescreener (Optional[SkillPreScreener]): If given, batch calls shortlist candidates
+                locally and skip the LLM matching/insight/red-flag stages for the rest.
+            batch_cv_parsing (bool): If True, batch calls parse the pool with
+                CVParserAgent.arun_batch, several CVs per model call.
+            extraction_lookahead (int): In batch calls, how many CVs ahead of the LLM
+                stages document extraction is started (0 = only when a CV's turn comes).
+            compactor (Optional[TextCompactor]): If given, extracted CV/JD text is compacted
+                to the compactor's token budgets before it reaches the parser agents.
+            metrics (Optional[PipelineMetrics]): If given, every stage is observed (wall time,
+                rate-limit wait, tokens, retries, cache hits) and labelled with its batch id.
+            job_store (Optional[JobStore]): If given, batch calls checkpoint every stage output
+                under their batch id (plus a fingerprint of the agents' models and prompts) and
+                item key; running a batch again with the same batch id resumes it, skipping
+                completed stages. A batch whose items all succeed is deleted from the store.
+            max_item_retries (int): In batch calls, how many times a failing CV is retried on
+                its own before it is reported with status "failed" (the batch carries on).
+            deduplicator (Optional[DuplicateDetector]): If given, batch calls group exact and
+                near-duplicate CVs right after extraction, run the LLM stages once per group
+                and copy the result to the other members, marked with `duplicate_of`. The
+                index keeps a fingerprint per CV (and streaming calls every distinct parsed CV)
+                for the whole call, so memory grows with the number of CVs.
+            talent_pool (Optional[TalentPool]): If given, every CV parsed by any call is added
+                to the pool, and arun_talent_pool screens a job description against the
+                best prior candidates without reading or parsing their files again.
+            score_gate (Optional[ScoreGate]): If given, candidates whose skill match falls below
+                the gate skip the insight and red-flag agents; both are filled deterministically
+                from the skill match and the result gets status "low_score" (see arun_full_analysis).
         """
         self.file_manager_agent = file_manager_agent
         self.cv_parser_agent = cv_parser_agent
@@ -27,91 +159,868 @@ class CVScreeningManager:
         self.skill_matching_agent = skill_matching_agent
         self.insight_generator_agent = insight_generator_agent
         self.red_flag_detector_agent = red_flag_detector_agent
+        self.max_concurrency = max_concurrency
+        self.prescreener = prescreener
+        self.batch_cv_parsing = batch_cv_parsing
+        self.extraction_lookahead = extraction_lookahead
+        self.compactor = compactor
+        self.metrics = metrics
+        self.job_store = job_store
+        self.max_item_retries = max_item_retries
+        self.deduplicator = deduplicator
+        self.talent_pool = talent_pool
+        self.score_gate = score_gate
+        self._job_fingerprint: Optional[str] = None
+        # stage outputs persisted by the job store; add entries for extra stages to checkpoint them too
+        self.checkpoint_types = {
+            "compact_cv": CompactedDocument,
+            "parsed_cv": ParsedCV,
+            "compact_jd": CompactedDocument,
+            "parsed_jd": ParsedJobDescription,
+            "skill_match": SkillMatchingOutput,
+            "insights": CandidateInsights,
+            "red_flags": RedFlagReport,
+        }
+        # register extra stages with `manager.pipeline.add(Stage(...))`
+        self.pipeline = StageGraph(self.default_stages(), metrics=metrics)
+        if job_store is not None:
+            self.pipeline.add_listener(self._checkpoint)
+        if talent_pool is not None:
+            self.pipeline.add_listener(self._add_to_pool)
 
-    def run_cv_against_jd(self, cv_path: str, jd_path: str, verbose: bool = False, sleep_time_between_requests: int = 0) -> CVAnalysisResult:
-        """
-        Processes a single CV against a job description and returns the analysis result.
+    # --- Pipeline stages ---
 
-        Args:
-            cv_path (str): Path to the candidate's CV file.
-            jd_path (str): Path to the job description file.
-            verbose (bool): If True, prints step-by-step progress.
+    def default_stages(self) -> list[Stage]:
+        """
+        Returns the built-in screening stages.
 
-        Returns:
-            CVAnalysisResult: Structured result of the analysis.
+        CV and JD extraction/parsing are independent, and insights and red flags
+        both depend only on the skill match, so the critical path per CV is
+        read -> parse -> match -> (insights | red flags). With a `compactor`, a
+        compact_cv / compact_jd stage sits between reading and parsing.
         """
-        if verbose:
-            print(f"Reading CV from: {cv_path}")
-            
-        cv_input = FileReadInput(file_path=cv_path)
-        raw_cv = self.file_manager_agent.run(cv_input)
-        time.sleep(sleep_time_between_requests)
+        if self.compactor is None:
+            cv_text, jd_text, compaction = "raw_cv", "raw_jd", []
+        else:
+            cv_text, jd_text = "compact_cv", "compact_jd"
+            compaction = [
+                Stage("compact_cv", ("raw_cv",), self._compact_cv),
+                Stage("compact_jd", ("raw_jd",), self._compact_jd),
+            ]
+        return [
+            Stage("raw_cv", ("cv_path",), self._read_cv),
+            Stage("raw_jd", ("jd_path",), self._read_jd),
+            *compaction,
+            Stage("parsed_cv", (cv_text,), self._parse_cv),
+            Stage("parsed_jd", (jd_text,), self._parse_jd),
+            Stage("skill_match", ("parsed_cv", "parsed_jd"), self._match_skills),
+            Stage("insights", ("skill_match",), self._generate_insights),
+            Stage("red_flags", ("skill_match",), self._detect_red_flags),
+        ]
+
+    @staticmethod
+    def _source(document: str, source: DocumentSource) -> dict:
+        """Context entries of a "cv" or "jd" given as a path or as an InMemoryDocument (read from `<document>_document`)."""
+        if isinstance(source, InMemoryDocument):
+            return {f"{document}_path": source.name, f"{document}_document": source}
+        return {f"{document}_path": source}
 
+    async def _read(self, context: dict, document: str) -> FileReadOutput:
+        in_memory = context.get(f"{document}_document")
+        if in_memory is not None:
+            return await self.file_manager_agent.aread_document(in_memory)
+        return await self.file_manager_agent.arun(FileReadInput(file_path=context[f"{document}_path"]))
+
+    async def _read_cv(self, context: dict) -> FileReadOutput:
+        if context.get("verbose"):
+            print(f"Reading CV from: {context['cv_path']}")
+        raw_cv = await self._read(context, "cv")
+        return raw_cv
+
+    def _compact(self, document: FileReadOutput, token_budget: int, verbose: bool) -> CompactedDocument:
+        content, report = self.compactor.compact(document.file_content, token_budget)
         if verbose:
+            print(f"Compacted {document.file_path}: {report.tokens_before} -> {report.tokens_after} tokens")
+        return CompactedDocument(file_path=document.file_path, file_content=content, report=report)
+
+    async def _compact_cv(self, context: dict) -> CompactedDocument:
+        return self._compact(context["raw_cv"], self.compactor.cv_token_budget, context.get("verbose"))
+
+    async def _compact_jd(self, context: dict) -> CompactedDocument:
+        return self._compact(context["raw_jd"], self.compactor.jd_token_budget, context.get("verbose"))
+
+    @staticmethod
+    def _parser_input(context: dict, document: str) -> FileReadOutput:
+        """The text handed to a parser agent: the compacted document if there is one, else the raw one."""
+        compacted = context.get(f"compact_{document}")
+        if compacted is None:
+            return context[f"raw_{document}"]
+        return FileReadOutput(file_path=compacted.file_path, file_content=compacted.file_content)
+
+    async def _parse_cv(self, context: dict) -> ParsedCV:
+        if context.get("verbose"):
             print("Parsing CV...")
-        parsed_cv = self.cv_parser_agent.run(raw_cv)
-        time.sleep(sleep_time_between_requests)
+        parsed_cv = await self.cv_parser_agent.arun(self._parser_input(context, "cv"))
+        return parsed_cv
 
-        if verbose:
-            print(f"Reading Job Description from: {jd_path}")
-        jd_input = FileReadInput(file_path=jd_path)
-        raw_jd = self.file_manager_agent.run(jd_input)
-        time.sleep(sleep_time_between_requests)
+    async def _read_jd(self, context: dict) -> FileReadOutput:
+        if context.get("verbose"):
+            print(f"Reading Job Description from: {context['jd_path']}")
+        raw_jd = await self._read(context, "jd")
+        return raw_jd
 
-        if verbose:
+    async def _parse_jd(self, context: dict) -> ParsedJobDescription:
+        if context.get("verbose"):
             print("Parsing Job Description...")
-        parsed_jd = self.job_description_agent.run(raw_jd)
-        time.sleep(sleep_time_between_requests)
-
+        parsed_jd = await self.job_description_agent.arun(self._parser_input(context, "jd"))
+        return parsed_jd
 
-        if verbose:
+    async def _match_skills(self, context: dict) -> SkillMatchingOutput:
+        if context.get("verbose"):
             print("Matching skills between CV and Job Description...")
-        matching_input = SkillMatchingInput(candidate=parsed_cv, job=parsed_jd)
-        skill_match = self.skill_matching_agent.run(matching_input)
-        time.sleep(sleep_time_between_requests)
+        matching_input = SkillMatchingInput(candidate=context["parsed_cv"], job=context["parsed_jd"])
+        skill_match = await self.skill_matching_agent.arun(matching_input)
+        return skill_match
 
+    def _gated(self, context: dict) -> bool:
+        """Whether the score gate replaces the insight and red-flag agents for this context."""
+        return (
+            self.score_gate is not None
+            and not context.get("full_analysis")
+            and context.get("skill_match") is not None
+            and self.score_gate.gates(context["skill_match"])
+        )
 
-        if verbose:
+    async def _generate_insights(self, context: dict) -> CandidateInsights:
+        if self._gated(context):
+            return self.score_gate.local_insights(context["skill_match"])
+        if context.get("verbose"):
             print("Generating candidate insights...")
-        insights = self.insight_generator_agent.run(skill_match)
-        time.sleep(sleep_time_between_requests)
+        insights = await self.insight_generator_agent.arun(context["skill_match"])
+        return insights
 
-        if verbose:
+    async def _detect_red_flags(self, context: dict) -> RedFlagReport:
+        if self._gated(context):
+            return self.score_gate.local_red_flags(context["skill_match"])
+        if context.get("verbose"):
             print("Detecting red flags...")
-        red_flags = self.red_flag_detector_agent.run(skill_match)
-        time.sleep(sleep_time_between_requests)
+        red_flags = await self.red_flag_detector_agent.arun(context["skill_match"])
+        return red_flags
+
+    def _build_result(self, context: dict) -> CVAnalysisResult:
+        """Assembles a CVAnalysisResult from a completed (or, with an `error`, failed) pipeline context."""
+        extras = {
+            stage.name: context[stage.name]
+            for stage in self.pipeline.stages
+            if stage.name not in _BUILTIN_STAGE_NAMES and stage.name in context
+        }
+        return CVAnalysisResult(
+            cv=context.get("parsed_cv"),
+            job_description=context["parsed_jd"],
+            skill_match=context.get("skill_match"),
+            insights=context.get("insights"),
+            red_flags=context.get("red_flags"),
+            source_path=context.get("cv_path"),
+            item_key=context.get("item_key"),
+            status="failed" if "error" in context else "low_score" if self._gated(context) else "complete",
+            error=context.get("error"),
+            batch_id=context.get("batch_id"),
+            compaction=self._compaction_reports(context),
+            extras=extras,
+        )
+
+    @staticmethod
+    def _compaction_reports(context: dict) -> dict:
+        return {
+            document: context[f"compact_{document}"].report
+            for document in ("cv", "jd")
+            if f"compact_{document}" in context
+        }
+
+    # --- Checkpoints ---
+
+    def _checkpoint(self, context: dict, stage: str, output) -> None:
+        """Stage-graph listener: persists checkpointed stage outputs of batch items."""
+        if stage in ("insights", "red_flags") and self._gated(context):
+            return  # cheap to rebuild, and a run without the gate should call the agents
+        if context.get("batch_id") and context.get("item_key") and stage in self.checkpoint_types:
+            self.job_store.save_stage(self._job_id(context["batch_id"]), context["item_key"], stage, output)
+
+    def _add_to_pool(self, context: dict, stage: str, output) -> None:
+        """Stage-graph listener: keeps every freshly parsed CV in the talent pool."""
+        if stage == "parsed_cv":
+            self.talent_pool.add(output, context.get("cv_path"))
+
+    def _restore(self, context: dict) -> dict:
+        """Seeds a batch item's context with its checkpointed stage outputs, so they are not recomputed."""
+        if self.job_store is not None and context.get("batch_id") and context.get("item_key"):
+            context.update(self.job_store.load_stages(self._job_id(context["batch_id"]), context["item_key"], self.checkpoint_types))
+        return context
 
+    def _record_outcome(self, result: CVAnalysisResult, item_key: Optional[str] = None) -> CVAnalysisResult:
+        if self.job_store is not None and result.batch_id:
+            self.job_store.mark_item(self._job_id(result.batch_id), item_key or result.item_key or result.source_path, result.status, result.error)
+        return result
 
+    def _job_id(self, batch_id: str) -> str:
+        """
+        Job-store id of `batch_id`: the batch id plus a fingerprint of what the checkpoints depend on
+        (every agent's name, system prompt, schema and model, and the compaction budgets), so a batch
+        re-run with another model, prompt or configuration starts over instead of resuming stale outputs.
+        """
+        if self._job_fingerprint is None:
+            agents = (self.cv_parser_agent, self.job_description_agent, self.skill_matching_agent,
+                      self.insight_generator_agent, self.red_flag_detector_agent)
+            material = [agent._cache_key("") for agent in agents]
+            if self.compactor is not None:
+                material.append(f"{self.compactor.cv_token_budget}:{self.compactor.jd_token_budget}:{self.compactor.repeat_ratio}")
+            self._job_fingerprint = hashlib.sha256("|".join(material).encode("utf-8")).hexdigest()[:12]
+        return f"{batch_id}@{self._job_fingerprint}"
+
+    def _finish_job(self, batch_id: str) -> None:
+        """Deletes a job once none of its items failed; a job with failures is kept so it can be resumed."""
+        if self.job_store is not None and not self.job_store.items(self._job_id(batch_id), status="failed"):
+            self.job_store.delete_job(self._job_id(batch_id))
+
+    # --- Async API ---
+
+    def _observe(self, stage: str, batch_id: Optional[str]):
+        """Observes work done outside the stage graph (pool-wide steps) under `stage`."""
+        return self.metrics.observe(stage, batch_id) if self.metrics is not None else nullcontext()
+
+    async def aparse_job_description(self, jd_path: DocumentSource, verbose: bool = False, batch_id: Optional[str] = None) -> ParsedJobDescription:
+        """
+        Reads and parses a job description file.
+
+        The returned ParsedJobDescription can be reused across any number of
+        CVs and batches via run_cv_against_parsed_jd / run_cvs_against_parsed_jd.
+
+        Args:
+            jd_path (DocumentSource): Path to the job description file, or an InMemoryDocument.
+            verbose (bool): If True, prints step-by-step progress.
+            batch_id (Optional[str]): Metrics label for the parse; with a `job_store`, also the
+                job the parse is checkpointed in (and resumed from).
+
+        Returns:
+            ParsedJobDescription: Structured job description.
+        """
+        context = {**self._source("jd", jd_path), "verbose": verbose, "batch_id": batch_id}
+        context["item_key"] = f"jd:{document_key(jd_path)}"
+        if self.job_store is not None and batch_id:
+            self.job_store.start_job(self._job_id(batch_id), context["jd_path"])
+            self._restore(context)
+        await self.pipeline.run(context, targets=["parsed_jd"])
+        if self.job_store is not None and batch_id:
+            self.job_store.mark_item(self._job_id(batch_id), context["item_key"], "complete")
+        return context["parsed_jd"]
+
+    async def arun_cv_against_parsed_jd(self, cv_path: DocumentSource, parsed_jd: ParsedJobDescription, verbose: bool = False) -> CVAnalysisResult:
+        """
+        Processes a single CV against an already-parsed job description.
+
+        Args:
+            cv_path (DocumentSource): Path to the candidate's CV file, or an InMemoryDocument.
+            parsed_jd (ParsedJobDescription): Output of parse_job_description.
+            verbose (bool): If True, prints step-by-step progress.
+
+        Returns:
+            CVAnalysisResult: Structured result of the analysis.
+        """
+        context = {**self._source("cv", cv_path), "parsed_jd": parsed_jd, "verbose": verbose}
+        await self.pipeline.run(context)
         if verbose:
             print("Analysis complete.\n")
+        return self._build_result(context)
 
-        return CVAnalysisResult(
-            cv=parsed_cv,
-            job_description=parsed_jd,
-            skill_match=skill_match,
-            insights=insights,
-            red_flags=red_flags
+    async def arun_cv_against_jd(self, cv_path: DocumentSource, jd_path: DocumentSource, verbose: bool = False) -> CVAnalysisResult:
+        """
+        Processes a single CV against a job description and returns the analysis result.
+
+        The CV and the job description are read and parsed in parallel.
+
+        Args:
+            cv_path (DocumentSource): Path to the candidate's CV file, or an InMemoryDocument.
+            jd_path (DocumentSource): Path to the job description file, or an InMemoryDocument.
+            verbose (bool): If True, prints step-by-step progress.
+
+        Returns:
+            CVAnalysisResult: Structured result of the analysis.
+        """
+        context = {**self._source("cv", cv_path), **self._source("jd", jd_path), "verbose": verbose}
+        await self.pipeline.run(context)
+        if verbose:
+            print("Analysis complete.\n")
+        return self._build_result(context)
+
+    async def arun_full_analysis(self, result: CVAnalysisResult, verbose: bool = False) -> CVAnalysisResult:
+        """
+        Runs the insight and red-flag agents for a result the score gate stopped early.
+
+        The stored parsed CV, job description and skill match are reused, so only
+        the two skipped agent calls are made.
+
+        Args:
+            result (CVAnalysisResult): A result with status "low_score" (any result with a skill match works).
+            verbose (bool): If True, prints step-by-step progress.
+
+        Returns:
+            CVAnalysisResult: The same result with LLM insights and red flags and status "complete".
+
+        Raises:
+            ValueError: If the result has no skill match (failed or incomplete).
+        """
+        if result.cv is None or result.skill_match is None:
+            raise ValueError("Full analysis needs a result with a parsed CV and a skill match")
+        context = {
+            "cv_path": result.source_path, "item_key": result.item_key, "parsed_cv": result.cv, "parsed_jd": result.job_description,
+            "skill_match": result.skill_match, "verbose": verbose, "batch_id": result.batch_id, "full_analysis": True,
+        }
+        await self.pipeline.run(context)
+        full = self._build_result(context).model_copy(update={"compaction": result.compaction, "duplicate_of": result.duplicate_of})
+        return self._record_outcome(full)
+
+    async def _arun_context(self, context: dict, prefetch: Optional[asyncio.Task], targets: Optional[list[str]]) -> dict:
+        if prefetch is not None:
+            await prefetch
+        dedup: Optional[DuplicateIndex] = context.pop("dedup", None)
+        fan_out: Optional[_DuplicateFanOut] = context.pop("fan_out", None)
+        if dedup is not None and "parsed_cv" not in context and "raw_cv" in self.pipeline:
+            # fingerprint the text the parser would see (page furniture already compacted away)
+            await self.pipeline.run(context, targets=["compact_cv" if "compact_cv" in self.pipeline else "raw_cv"])
+            duplicate_of = dedup.add(context["item_key"], self._parser_input(context, "cv").file_content)
+            finished = fan_out.claim(duplicate_of) if duplicate_of is not None else None
+            if duplicate_of is not None and finished is None:
+                # the canonical CV's result is copied over; nothing else to run
+                context["duplicate_of"] = duplicate_of
+                context.pop("raw_cv")
+                return context
+            if finished is not None and finished[0] is not None:
+                # the canonical already finished and its result is gone: reuse its parsed CV only
+                context["duplicate_of"] = duplicate_of
+                context["parsed_cv"] = finished[0]
+                context.pop("raw_cv")
+        return await self.pipeline.run(context, targets=targets)
+
+    async def _arun_contexts(self, items: Iterable[tuple[int, dict]], targets: Optional[list[str]] = None) -> AsyncIterator[tuple[int, dict]]:
+        """
+        Runs the pipeline over many (index, context) pairs, at most `max_concurrency` at a time.
+
+        `items` is consumed lazily; completed contexts are yielded as soon as they finish.
+        Document extraction (the `raw_cv` stage) is started up to `extraction_lookahead`
+        items ahead of the window, so it overlaps with the LLM stages of earlier CVs.
+
+        A context whose pipeline raises is retried on its own (keeping the stages it
+        already completed) up to `max_item_retries` times; after that it is yielded
+        with an `error` entry instead of aborting the other items.
+        """
+        items = iter(items)
+        lookahead: deque[tuple[tuple[int, dict], Optional[asyncio.Task]]] = deque()
+        pending: dict[asyncio.Task, tuple[tuple[int, dict], int]] = {}
+
+        def fill_lookahead() -> None:
+            while len(lookahead) < max(1, self.extraction_lookahead):
+                item = next(items, None)
+                if item is None:
+                    return
+                context = item[1]
+                prefetch = None
+                if self.extraction_lookahead and "raw_cv" in self.pipeline and "cv_path" in context and not {"parsed_cv", "compact_cv"} & context.keys():
+                    prefetch = asyncio.ensure_future(self.pipeline.run(context, targets=["raw_cv"]))
+                lookahead.append((item, prefetch))
+
+        try:
+            while True:
+                fill_lookahead()
+                while len(pending) < self.max_concurrency and lookahead:
+                    item, prefetch = lookahead.popleft()
+                    idx, context = item
+                    if context.get("verbose"):
+                        print(f"\n--- Processing CV {idx + 1} ---")
+                    pending[asyncio.ensure_future(self._arun_context(context, prefetch, targets))] = (item, 0)
+                    fill_lookahead()
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    item, attempt = pending.pop(task)
+                    idx, context = item
+                    exc = task.exception()
+                    if exc is None:
+                        yield idx, context
+                    elif not isinstance(exc, Exception):
+                        raise exc
+                    elif attempt < self.max_item_retries:
+                        if context.get("verbose"):
+                            print(f"CV {idx + 1} failed ({type(exc).__name__}: {exc}), retrying...")
+                        pending[asyncio.ensure_future(self._arun_context(context, None, targets))] = (item, attempt + 1)
+                    else:
+                        context["error"] = f"{type(exc).__name__}: {exc}"
+                        yield idx, context
+        finally:
+            leftovers = list(pending) + [prefetch for _, prefetch in lookahead if prefetch is not None]
+            for task in leftovers:
+                task.cancel()
+            if leftovers:
+                await asyncio.gather(*leftovers, return_exceptions=True)
+
+    async def _aiter_indexed(
+        self,
+        cv_paths: Iterable[DocumentSource],
+        parsed_jd: ParsedJobDescription,
+        verbose: bool = False,
+        batch_id: Optional[str] = None,
+        shortlist: Optional[dict[str, bool]] = None,
+    ) -> AsyncIterator[tuple[int, CVAnalysisResult]]:
+        """Yields (position in `cv_paths`, result) pairs in completion order."""
+        batch_id = batch_id or uuid.uuid4().hex[:12]
+        if self.job_store is not None:
+            self.job_store.start_job(self._job_id(batch_id))
+        contexts = (
+            (idx, self._restore({**self._source("cv", cv_path), "item_key": document_key(cv_path), "parsed_jd": parsed_jd, "verbose": verbose, "batch_id": batch_id}))
+            for idx, cv_path in enumerate(cv_paths)
         )
+        dedup = self.deduplicator.index() if self.deduplicator is not None else None
+        if self.prescreener is None and not self.batch_cv_parsing:
+            fan_out = _DuplicateFanOut(late_duplicates=True) if dedup is not None else None
+            if dedup is not None:
+                contexts = ((idx, {**context, "dedup": dedup, "fan_out": fan_out}) for idx, context in contexts)
+            async with aclosing(self._arun_contexts(contexts)) as completed:
+                async for idx, context in completed:
+                    if fan_out is None:
+                        ready = [(idx, self._build_result(context))]
+                    elif "duplicate_of" not in context:
+                        ready = fan_out.add_canonical(idx, self._build_result(context))
+                    elif "parsed_cv" in context:
+                        ready = fan_out.add_late_duplicate(idx, self._build_result(context), context["duplicate_of"])
+                    else:
+                        ready = fan_out.add_duplicate(idx, context)
+                    for i, result in ready:
+                        yield i, self._record_outcome(result)
+        else:
+            async with aclosing(self._aiter_pooled(list(contexts), parsed_jd, batch_id, dedup, shortlist)) as results:
+                async for idx, result in results:
+                    yield idx, self._record_outcome(result)
+        self._finish_job(batch_id)
+        if verbose:
+            print("\nAll CVs processed.")
+
+    async def _aparse_pool(self, contexts: list[tuple[int, dict]], batch_id: Optional[str] = None, dedup: Optional[DuplicateIndex] = None) -> None:
+        """
+        Adds `parsed_cv` to every context, packing several CVs per model call if `batch_cv_parsing` is on.
+
+        With a `dedup` index, the pool is grouped after extraction and only the first
+        CV of each group is parsed; the others get a `duplicate_of` entry instead.
+        """
+        text = "compact_cv" if "compact_cv" in self.pipeline else "raw_cv"
+        parse_now = not self.batch_cv_parsing and dedup is None
+        async with aclosing(self._arun_contexts(contexts, targets=["parsed_cv"] if parse_now else [text])) as completed:
+            async for _ in completed:
+                pass
+
+        if dedup is not None:
+            for _, context in contexts:
+                if "parsed_cv" not in context and "error" not in context:
+                    duplicate_of = dedup.add(context["item_key"], self._parser_input(context, "cv").file_content)
+                    if duplicate_of is not None:
+                        context["duplicate_of"] = duplicate_of
+
+        def unparsed() -> list[tuple[int, dict]]:
+            return [item for item in contexts if not {"parsed_cv", "error", "duplicate_of"} & item[1].keys()]
+
+        if self.batch_cv_parsing:
+            pending = [context for _, context in unparsed()]
+            try:
+                with self._observe("parsed_cv_batch", batch_id):
+                    parsed_cvs = await self.cv_parser_agent.arun_batch(
+                        [self._parser_input(context, "cv") for context in pending], max_concurrency=self.max_concurrency
+                    )
+            except Exception as exc:
+                # the CVs are parsed one by one below instead
+                if any(context.get("verbose") for context in pending):
+                    print(f"Batch CV parsing failed ({type(exc).__name__}: {exc}), parsing individually...")
+            else:
+                for context, parsed_cv in zip(pending, parsed_cvs):
+                    self.pipeline.notify(context, "parsed_cv", parsed_cv)
+
+        async with aclosing(self._arun_contexts(unparsed(), targets=["parsed_cv"])) as completed:
+            async for _ in completed:
+                pass
+
+        for _, context in contexts:
+            # only the parsed CV is needed from here on
+            context.pop("raw_cv", None)
+            context.pop("cv_document", None)
+
+    async def _aiter_pooled(
+        self,
+        contexts: list[tuple[int, dict]],
+        parsed_jd: ParsedJobDescription,
+        batch_id: Optional[str] = None,
+        dedup: Optional[DuplicateIndex] = None,
+        shortlist: Optional[dict[str, bool]] = None,
+    ) -> AsyncIterator[tuple[int, CVAnalysisResult]]:
+        """
+        Parses the whole pool up front, then runs the LLM tail.
+
+        With a `prescreener`, only the local shortlist reaches the LLM tail; other
+        candidates get a deterministic result built from the pre-screen and are
+        marked with status "prescreened_out". Decisions already in `shortlist`
+        (item key -> shortlisted) are kept and new ones are added to it. Duplicates
+        found by `dedup` skip the tail and receive their group's result once it is ready.
+        """
+        await self._aparse_pool(contexts, batch_id, dedup)
+        # every duplicate is known before the first result, so no result is held longer than its group needs
+        fan_out = _DuplicateFanOut() if dedup is not None else None
 
-    def run_cvs_against_jd(self, cv_paths: list[str], jd_path: str, verbose: bool = False, sleep_time_between_requests: int = 0) -> list[CVAnalysisResult]:
+        def ready(idx: int, result: CVAnalysisResult) -> list[tuple[int, CVAnalysisResult]]:
+            return fan_out.add_canonical(idx, result) if fan_out is not None else [(idx, result)]
+
+        for idx, context in contexts:
+            if "duplicate_of" in context:
+                fan_out.add_duplicate(idx, context)
+        for idx, context in contexts:
+            if "error" in context:
+                for item in ready(idx, self._build_result(context)):
+                    yield item
+        contexts = [item for item in contexts if not {"error", "duplicate_of"} & item[1].keys()]
+        if self.prescreener is None:
+            async with aclosing(self._arun_contexts(contexts)) as completed:
+                async for idx, context in completed:
+                    for item in ready(idx, self._build_result(context)):
+                        yield item
+            return
+
+        with self._observe("prescreen", batch_id):
+            scores = self.prescreener.score([context["parsed_cv"] for _, context in contexts], parsed_jd)
+        if shortlist is not None:
+            # top_k is relative to the pool scored: a rerun over part of a batch must not move its cut
+            scores = [
+                dataclasses.replace(score, shortlisted=shortlist.get(context["item_key"], score.shortlisted))
+                for score, (_, context) in zip(scores, contexts)
+            ]
+            shortlist.update((context["item_key"], score.shortlisted) for score, (_, context) in zip(scores, contexts))
+        for score, (idx, context) in zip(scores, contexts):
+            if not score.shortlisted:
+                result = CVAnalysisResult(
+                    cv=context["parsed_cv"],
+                    job_description=parsed_jd,
+                    skill_match=self.prescreener.local_skill_match(score),
+                    insights=self.prescreener.local_insights(score),
+                    red_flags=self.prescreener.local_red_flags(score),
+                    source_path=context["cv_path"],
+                    item_key=context["item_key"],
+                    status="prescreened_out",
+                    batch_id=batch_id,
+                    compaction=self._compaction_reports(context),
+                )
+                for item in ready(idx, result):
+                    yield item
+
+        shortlist = [item for score, item in zip(scores, contexts) if score.shortlisted]
+        async with aclosing(self._arun_contexts(shortlist)) as completed:
+            async for idx, context in completed:
+                for item in ready(idx, self._build_result(context)):
+                    yield item
+
+    async def arun_cvs_against_parsed_jd(self, cv_paths: list[DocumentSource], parsed_jd: ParsedJobDescription, verbose: bool = False, batch_id: Optional[str] = None) -> list[CVAnalysisResult]:
+        """
+        Processes multiple CVs concurrently against an already-parsed job description.
+
+        At most `max_concurrency` CVs are in flight at any time. With a `prescreener`
+        or `batch_cv_parsing`, every CV is parsed first; with a `prescreener` only the
+        local shortlist then reaches the matching, insight and red-flag agents.
+
+        Args:
+            cv_paths (list[DocumentSource]): Candidate CV files: paths or InMemoryDocuments.
+            parsed_jd (ParsedJobDescription): Output of parse_job_description.
+            verbose (bool): If True, prints step-by-step progress for each CV.
+            batch_id (Optional[str]): Metrics label shared by the batch (default: a fresh id),
+                also set on every result.
+
+        Returns:
+            list[CVAnalysisResult]: List of structured analysis results, in the order of `cv_paths`.
+        """
+        results: list[Optional[CVAnalysisResult]] = [None] * len(cv_paths)
+        async with aclosing(self._aiter_indexed(cv_paths, parsed_jd, verbose=verbose, batch_id=batch_id)) as completed:
+            async for idx, result in completed:
+                results[idx] = result
+        return results
+
+    async def arun_cvs_against_jd(self, cv_paths: list[DocumentSource], jd_path: DocumentSource, verbose: bool = False, batch_id: Optional[str] = None) -> list[CVAnalysisResult]:
+        """
+        Processes multiple CVs concurrently against a job description.
+
+        The job description is read and parsed once and shared by every CV.
+
+        Args:
+            cv_paths (list[DocumentSource]): Candidate CV files: paths or InMemoryDocuments.
+            jd_path (DocumentSource): Path to the job description file, or an InMemoryDocument.
+            verbose (bool): If True, prints step-by-step progress for each CV.
+            batch_id (Optional[str]): Metrics label shared by the batch (default: a fresh id),
+                also set on every result.
+
+        Returns:
+            list[CVAnalysisResult]: List of structured analysis results, in the order of `cv_paths`.
+        """
+        batch_id = batch_id or uuid.uuid4().hex[:12]
+        parsed_jd = await self.aparse_job_description(jd_path, verbose=verbose, batch_id=batch_id)
+        return await self.arun_cvs_against_parsed_jd(cv_paths, parsed_jd, verbose=verbose, batch_id=batch_id)
+
+    async def aiter_cvs_against_parsed_jd(
+        self,
+        cv_paths: Iterable[DocumentSource],
+        parsed_jd: ParsedJobDescription,
+        verbose: bool = False,
+        batch_id: Optional[str] = None,
+        shortlist: Optional[dict[str, bool]] = None,
+    ) -> AsyncIterator[CVAnalysisResult]:
         """
-        Processes multiple CVs against a job description and returns a list of analysis results.
+        Screens CVs concurrently and yields each result as soon as it completes.
+
+        `cv_paths` is consumed lazily and at most `max_concurrency` CVs are in flight,
+        so memory stays bounded however many CVs the iterable produces (a `prescreener`
+        or `batch_cv_parsing` needs the whole pool and materializes it; a `deduplicator`
+        keeps a fingerprint and the parsed CV of every distinct CV, O(N) in the pool). Results come back in completion
+        order; use `CVAnalysisResult.item_key` (see input_service.document_key) to match them up.
 
         Args:
-            cv_paths (list[str]): List of paths to candidate CV files.
-            jd_path (str): Path to the job description file.
+            cv_paths (Iterable[DocumentSource]): Candidate CV files: paths or InMemoryDocuments.
+            parsed_jd (ParsedJobDescription): Output of parse_job_description.
             verbose (bool): If True, prints step-by-step progress for each CV.
+            batch_id (Optional[str]): Metrics label shared by the batch (default: a fresh id),
+                also set on every result.
+            shortlist (Optional[dict[str, bool]]): Pre-screen decisions by item key. Decisions
+                already in it are kept and new ones are added, so screening the rest of a batch
+                again (e.g. after an interruption) does not re-cut the shortlist over the subset.
+
+        Yields:
+            CVAnalysisResult: One structured analysis result per CV.
+        """
+        async with aclosing(self._aiter_indexed(cv_paths, parsed_jd, verbose=verbose, batch_id=batch_id, shortlist=shortlist)) as completed:
+            async for _, result in completed:
+                yield result
+
+    async def aiter_cvs_against_jd(self, cv_paths: Iterable[DocumentSource], jd_path: DocumentSource, verbose: bool = False, batch_id: Optional[str] = None) -> AsyncIterator[CVAnalysisResult]:
+        """
+        Parses the job description once, then yields each CV's result as it completes.
+
+        See aiter_cvs_against_parsed_jd.
+        """
+        batch_id = batch_id or uuid.uuid4().hex[:12]
+        parsed_jd = await self.aparse_job_description(jd_path, verbose=verbose, batch_id=batch_id)
+        async with aclosing(self.aiter_cvs_against_parsed_jd(cv_paths, parsed_jd, verbose=verbose, batch_id=batch_id)) as results:
+            async for result in results:
+                yield result
+
+    async def arun_matrix(self, cv_paths: list[DocumentSource], jd_paths: list[DocumentSource], verbose: bool = False, batch_id: Optional[str] = None) -> ScreeningMatrix:
+        """
+        Screens every CV against every job description.
+
+        Each job description and each CV is read and parsed exactly once; only the
+        matching, insight and red-flag stages run per (CV, JD) pair, at most
+        `max_concurrency` pairs at a time. With a `prescreener`, every role gets its
+        own local shortlist and the pairs outside it get a deterministic
+        "prescreened_out" result without any LLM call. With a `deduplicator`, duplicate
+        CVs are screened once and their row is copied from the group's first CV.
+
+        Args:
+            cv_paths (list[DocumentSource]): Candidate CV files, paths or InMemoryDocuments (matrix rows).
+            jd_paths (list[DocumentSource]): Job description files, paths or InMemoryDocuments (matrix columns).
+            verbose (bool): If True, prints step-by-step progress.
+            batch_id (Optional[str]): Metrics label shared by the whole matrix (default: a fresh id),
+                also set on every result.
 
         Returns:
-            list[CVAnalysisResult]: List of structured analysis results for each CV.
-        """
-        results: list[CVAnalysisResult] = []
-        for idx, cv_path in enumerate(cv_paths, 1):
-            time.sleep(sleep_time_between_requests)
-            if verbose:
-                print(f"\n--- Processing CV {idx}/{len(cv_paths)} ---")
-            result = self.run_cv_against_jd(cv_path, jd_path, verbose=verbose)
-            results.append(result)
+            ScreeningMatrix: Candidate x role scores and results.
+        """
+        batch_id = batch_id or uuid.uuid4().hex[:12]
+        parsed_jds = list(await asyncio.gather(
+            *(self.aparse_job_description(jd_path, verbose=verbose, batch_id=batch_id) for jd_path in jd_paths)
+        ))
+
+        contexts = [
+            (i, self._restore({**self._source("cv", cv_path), "item_key": document_key(cv_path), "verbose": verbose, "batch_id": batch_id}))
+            for i, cv_path in enumerate(cv_paths)
+        ]
+        cv_names = [context["cv_path"] for _, context in contexts]
+        jd_names = [source_name(jd_path) for jd_path in jd_paths]
+        # checkpoint keys of the (CV, JD) pairs; names alone may repeat
+        pair_keys = [[f"{context['item_key']}::{document_key(jd_path)}" for jd_path in jd_paths] for _, context in contexts]
+        dedup = self.deduplicator.index() if self.deduplicator is not None else None
+        await self._aparse_pool(contexts, batch_id, dedup)
+
+        results: list[list[Optional[CVAnalysisResult]]] = [[None] * len(jd_paths) for _ in cv_paths]
+        parsed = [(i, context) for i, context in contexts if not {"error", "duplicate_of"} & context.keys()]
+        if self.job_store is not None:
+            for _, context in parsed:
+                self.job_store.mark_item(self._job_id(batch_id), context["item_key"], "parsed")
+        for i, context in contexts:
+            if "error" in context:
+                for j, parsed_jd in enumerate(parsed_jds):
+                    results[i][j] = self._record_outcome(
+                        self._build_result({**context, "parsed_jd": parsed_jd, "item_key": pair_keys[i][j]})
+                    )
+
+        shortlisted = {(i, j) for i, _ in parsed for j in range(len(jd_paths))}
+        if self.prescreener is not None:
+            for j, parsed_jd in enumerate(parsed_jds):
+                with self._observe("prescreen", batch_id):
+                    scores = self.prescreener.score([context["parsed_cv"] for _, context in parsed], parsed_jd)
+                for score, (i, context) in zip(scores, parsed):
+                    if score.shortlisted:
+                        continue
+                    shortlisted.discard((i, j))
+                    results[i][j] = self._record_outcome(CVAnalysisResult(
+                        cv=context["parsed_cv"],
+                        job_description=parsed_jd,
+                        skill_match=self.prescreener.local_skill_match(score),
+                        insights=self.prescreener.local_insights(score),
+                        red_flags=self.prescreener.local_red_flags(score),
+                        source_path=context["cv_path"],
+                        item_key=pair_keys[i][j],
+                        status="prescreened_out",
+                        batch_id=batch_id,
+                        compaction=self._compaction_reports(context),
+                    ), pair_keys[i][j])
+
+        def pair_contexts() -> Iterator[tuple[int, dict]]:
+            for i, context in parsed:
+                for j, parsed_jd in enumerate(parsed_jds):
+                    if (i, j) in shortlisted:
+                        # only the parsed CV (and its compaction report) is shared between the pairs
+                        shared = {key: context[key] for key in ("cv_path", "parsed_cv", "compact_cv") if key in context}
+                        pair = {**shared, "parsed_jd": parsed_jd, "verbose": verbose, "batch_id": batch_id,
+                                "item_key": pair_keys[i][j]}
+                        yield i * len(jd_paths) + j, self._restore(pair)
+
+        async with aclosing(self._arun_contexts(pair_contexts())) as completed:
+            async for idx, context in completed:
+                i, j = divmod(idx, len(jd_paths))
+                results[i][j] = self._record_outcome(self._build_result(context), context["item_key"])
+
+        rows = {context["item_key"]: i for i, context in reversed(contexts)}
+        for i, context in contexts:
+            if "duplicate_of" in context:
+                results[i] = [
+                    self._record_outcome(_DuplicateFanOut._copy(result, {**context, "item_key": pair_keys[i][j]}))
+                    for j, result in enumerate(results[rows[context["duplicate_of"]]])
+                ]
+
+        self._finish_job(batch_id)
         if verbose:
-            print("\nAll CVs processed.")
-        return results
\ No newline at end of file
+            print("\nAll CV x JD pairs processed.")
+        return ScreeningMatrix(
+            cv_paths=cv_names,
+            jd_paths=jd_names,
+            job_descriptions=parsed_jds,
+            scores=[[result.skill_match.total_score if result.skill_match else None for result in row] for row in results],
+            results=results,
+            batch_id=batch_id,
+        )
+
+    async def arun_talent_pool(
+        self,
+        parsed_jd: ParsedJobDescription,
+        top_k: Optional[int] = None,
+        verbose: bool = False,
+        batch_id: Optional[str] = None,
+        exclude: Iterable[str] = (),
+    ) -> list[CVAnalysisResult]:
+        """
+        Screens a job description against the best prior candidates in the talent pool.
+
+        The pool is queried locally for the `top_k` candidates that best fit the job;
+        their stored ParsedCVs are seeded straight into the pipeline, so only the
+        matching, insight and red-flag stages run, at most `max_concurrency` at a time.
+
+        Args:
+            parsed_jd (ParsedJobDescription): Output of parse_job_description.
+            top_k (Optional[int]): Number of candidates to screen (default: DefaultCFG.talent_pool_top_k).
+            verbose (bool): If True, prints step-by-step progress.
+            batch_id (Optional[str]): Metrics label shared by the batch (default: a fresh id),
+                also set on every result.
+            exclude (Iterable[str]): Source paths to leave out (e.g. the CVs just screened
+                against the same job); `top_k` candidates are still returned if the pool has them.
+
+        Returns:
+            list[CVAnalysisResult]: Results in retrieval order (best pool match first); `source_path`
+                is the file each candidate was originally parsed from.
+
+        Raises:
+            ValueError: If the manager has no `talent_pool`.
+        """
+        if self.talent_pool is None:
+            raise ValueError("CVScreeningManager was created without a talent_pool")
+        batch_id = batch_id or uuid.uuid4().hex[:12]
+        top_k = DefaultCFG.talent_pool_top_k if top_k is None else top_k
+        exclude = set(exclude)
+        with self._observe("talent_pool_query", batch_id):
+            matches = self.talent_pool.query(parsed_jd, top_k + len(exclude))
+        matches = [match for match in matches if match.source_path not in exclude][:top_k]
+        if verbose:
+            print(f"Retrieved {len(matches)} candidates from the talent pool.")
+        if self.job_store is not None:
+            self.job_store.start_job(self._job_id(batch_id))
+
+        contexts = (
+            (idx, self._restore({
+                "cv_path": match.source_path or match.candidate_id, "item_key": f"pool:{match.candidate_id}",
+                "parsed_cv": match.cv, "parsed_jd": parsed_jd, "verbose": verbose, "batch_id": batch_id,
+            }))
+            for idx, match in enumerate(matches)
+        )
+        results: list[Optional[CVAnalysisResult]] = [None] * len(matches)
+        async with aclosing(self._arun_contexts(contexts)) as completed:
+            async for idx, context in completed:
+                results[idx] = self._record_outcome(self._build_result(context), context["item_key"])
+        self._finish_job(batch_id)
+        return results
+
+    # --- Synchronous API ---
+
+    def parse_job_description(self, jd_path: DocumentSource, verbose: bool = False, batch_id: Optional[str] = None) -> ParsedJobDescription:
+        """Synchronous wrapper around aparse_job_description."""
+        return run_sync(self.aparse_job_description(jd_path, verbose=verbose, batch_id=batch_id))
+
+    def run_cv_against_parsed_jd(self, cv_path: DocumentSource, parsed_jd: ParsedJobDescription, verbose: bool = False) -> CVAnalysisResult:
+        """Synchronous wrapper around arun_cv_against_parsed_jd."""
+        return run_sync(self.arun_cv_against_parsed_jd(cv_path, parsed_jd, verbose=verbose))
+
+    def run_cv_against_jd(self, cv_path: DocumentSource, jd_path: DocumentSource, verbose: bool = False) -> CVAnalysisResult:
+        """Synchronous wrapper around arun_cv_against_jd."""
+        return run_sync(self.arun_cv_against_jd(cv_path, jd_path, verbose=verbose))
+
+    def run_cvs_against_parsed_jd(self, cv_paths: list[DocumentSource], parsed_jd: ParsedJobDescription, verbose: bool = False, batch_id: Optional[str] = None) -> list[CVAnalysisResult]:
+        """Synchronous wrapper around arun_cvs_against_parsed_jd."""
+        return run_sync(self.arun_cvs_against_parsed_jd(cv_paths, parsed_jd, verbose=verbose, batch_id=batch_id))
+
+    def run_cvs_against_jd(self, cv_paths: list[DocumentSource], jd_path: DocumentSource, verbose: bool = False, batch_id: Optional[str] = None) -> list[CVAnalysisResult]:
+        """Synchronous wrapper around arun_cvs_against_jd."""
+        return run_sync(self.arun_cvs_against_jd(cv_paths, jd_path, verbose=verbose, batch_id=batch_id))
+
+    def iter_cvs_against_parsed_jd(
+        self,
+        cv_paths: Iterable[DocumentSource],
+        parsed_jd: ParsedJobDescription,
+        verbose: bool = False,
+        batch_id: Optional[str] = None,
+        shortlist: Optional[dict[str, bool]] = None,
+    ) -> Iterator[CVAnalysisResult]:
+        """Synchronous generator over aiter_cvs_against_parsed_jd."""
+        return iterate_sync(self.aiter_cvs_against_parsed_jd(cv_paths, parsed_jd, verbose=verbose, batch_id=batch_id, shortlist=shortlist))
+
+    def iter_cvs_against_jd(self, cv_paths: Iterable[DocumentSource], jd_path: DocumentSource, verbose: bool = False, batch_id: Optional[str] = None) -> Iterator[CVAnalysisResult]:
+        """Synchronous generator over aiter_cvs_against_jd."""
+        return iterate_sync(self.aiter_cvs_against_jd(cv_paths, jd_path, verbose=verbose, batch_id=batch_id))
+
+    def run_matrix(self, cv_paths: list[DocumentSource], jd_paths: list[DocumentSource], verbose: bool = False, batch_id: Optional[str] = None) -> ScreeningMatrix:
+        """Synchronous wrapper around arun_matrix."""
+        return run_sync(self.arun_matrix(cv_paths, jd_paths, verbose=verbose, batch_id=batch_id))
+
+    def run_talent_pool(self, parsed_jd: ParsedJobDescription, top_k: Optional[int] = None, verbose: bool = False, batch_id: Optional[str] = None, exclude: Iterable[str] = ()) -> list[CVAnalysisResult]:
+        """Synchronous wrapper around arun_talent_pool."""
+        return run_sync(self.arun_talent_pool(parsed_jd, top_k=top_k, verbose=verbose, batch_id=batch_id, exclude=exclude))
+
+    def run_full_analysis(self, result: CVAnalysisResult, verbose: bool = False) -> CVAnalysisResult:
+        """Synchronous wrapper around arun_full_analysis."""
+        return run_sync(self.arun_full_analysis(result, verbose=verbose))
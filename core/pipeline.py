@@ -0,0 +1,156 @@
+import asyncio
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from services.metrics_service import PipelineMetrics
+
+
+@dataclass
+class Stage:
+    """
+    One node of the screening pipeline.
+
+    Attributes:
+        name (str): Key under which the stage's output is stored in the context.
+        requires (Tuple[str, ...]): Context keys (stage outputs or seeded inputs) the stage reads.
+        run (Callable): Coroutine function taking the context dict and returning the stage output.
+    """
+
+    name: str
+    requires: Tuple[str, ...]
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class StageGraph:
+    """
+    A small dependency graph of pipeline stages.
+
+    Stages are scheduled as asyncio tasks, each starting as soon as everything it
+    `requires` is available, so independent stages run in parallel. Keys already
+    present in the context (seeded inputs or previously computed outputs) are
+    never recomputed. With `metrics`, every stage execution is observed under
+    its name and labelled with the context's `batch_id`.
+    """
+
+    def __init__(self, stages: Iterable[Stage] = (), metrics: Optional[PipelineMetrics] = None):
+        self.metrics = metrics
+        self._listeners: List[Callable[[Dict[str, Any], str, Any], None]] = []
+        self._stages: Dict[str, Stage] = {}
+        for stage in stages:
+            self.add(stage)
+
+    @property
+    def stages(self) -> List[Stage]:
+        return list(self._stages.values())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._stages
+
+    def add(self, stage: Stage, replace: bool = False) -> None:
+        """
+        Registers a stage.
+
+        Args:
+            stage (Stage): The stage to add.
+            replace (bool): If True, an existing stage with the same name is replaced.
+
+        Raises:
+            ValueError: If the name is taken (and `replace` is False) or the stage introduces a cycle.
+        """
+        if stage.name in self._stages and not replace:
+            raise ValueError(f"Stage already registered: {stage.name}")
+        previous = self._stages.get(stage.name)
+        self._stages[stage.name] = stage
+        try:
+            self._check_acyclic()
+        except ValueError:
+            if previous is None:
+                del self._stages[stage.name]
+            else:
+                self._stages[stage.name] = previous
+            raise
+
+    def remove(self, name: str) -> None:
+        """Unregisters the stage called `name`."""
+        del self._stages[name]
+
+    def add_listener(self, listener: Callable[[Dict[str, Any], str, Any], None]) -> None:
+        """Registers `listener(context, stage name, output)`, called after every stage computed by `run`."""
+        self._listeners.append(listener)
+
+    def notify(self, context: Dict[str, Any], name: str, output: Any) -> None:
+        """Stores a stage output computed outside `run` (e.g. by a pool-wide step) and tells the listeners."""
+        context[name] = output
+        for listener in self._listeners:
+            listener(context, name, output)
+
+    def sinks(self) -> List[str]:
+        """Returns the names of stages no other stage depends on."""
+        required = {dep for stage in self._stages.values() for dep in stage.requires}
+        return [name for name in self._stages if name not in required]
+
+    def _check_acyclic(self) -> None:
+        visiting, done = set(), set()
+
+        def visit(name: str) -> None:
+            if name in done or name not in self._stages:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage dependency cycle through: {name}")
+            visiting.add(name)
+            for dep in self._stages[name].requires:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self._stages:
+            visit(name)
+
+    async def run(self, context: Dict[str, Any], targets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Computes `targets` (default: every sink stage) and whatever they depend on.
+
+        Args:
+            context (Dict[str, Any]): Seeded inputs; stage outputs are written into it.
+            targets (Optional[Iterable[str]]): Stage names to compute.
+
+        Returns:
+            Dict[str, Any]: The same context, with the computed stage outputs added.
+
+        Raises:
+            KeyError: If a required key is neither seeded nor produced by a stage.
+        """
+        tasks: Dict[str, asyncio.Task] = {}
+
+        def schedule(name: str) -> Optional[asyncio.Task]:
+            if name in context:
+                return None
+            if name in tasks:
+                return tasks[name]
+            if name not in self._stages:
+                raise KeyError(f"Missing pipeline input: {name}")
+            stage = self._stages[name]
+            deps = [task for task in (schedule(dep) for dep in stage.requires) if task is not None]
+
+            async def execute() -> None:
+                if deps:
+                    await asyncio.gather(*deps)
+                observed = self.metrics.observe(stage.name, context.get("batch_id")) if self.metrics else nullcontext()
+                with observed:
+                    output = await stage.run(context)
+                self.notify(context, stage.name, output)
+
+            tasks[name] = asyncio.ensure_future(execute())
+            return tasks[name]
+
+        try:
+            for name in (self.sinks() if targets is None else targets):
+                schedule(name)
+            if tasks:
+                await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        return context
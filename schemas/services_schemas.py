@@ -45,8 +45,8 @@ class ParsedJobDescription(BaseModel):
 
 
 
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, WithJsonSchema
+from typing import Annotated, Any, Dict, List, Optional
 from pydantic_ai import Agent
 
 # ----------------------------
@@ -78,6 +78,42 @@ class ParsedJobDescription(BaseModel):
 
 
 
+class CompactionReport(BaseModel):
+    tokens_before: int = Field(..., description="Estimated tokens of the extracted text")
+    tokens_after: int = Field(..., description="Estimated tokens sent to the parser agent")
+    removed_lines: int = Field(0, description="Repeated page headers/footers and page numbers dropped")
+    sections: List[str] = Field(default_factory=list, description="Section headings detected, in document order")
+    dropped_sections: List[str] = Field(default_factory=list, description="Low-priority sections removed to fit the token budget")
+    truncated: bool = Field(False, description="Whether sections were shortened to fit the token budget")
+
+
+class CompactedDocument(BaseModel):
+    file_path: str
+    file_content: str
+    report: CompactionReport
+
+
+class IndexedDocument(BaseModel):
+    index: int
+    file_path: str
+    file_content: str
+
+
+class CVBatchInput(BaseModel):
+    documents: List[IndexedDocument]
+
+
+class ParsedCVBatchItem(BaseModel):
+    index: int = Field(..., description="Index of the input document this CV was parsed from")
+    # shown to the model as a ParsedCV but validated per item by the agent, so one malformed CV does not void the batch
+    cv: Annotated[Dict[str, Any], WithJsonSchema(ParsedCV.model_json_schema())]
+
+
+class ParsedCVBatch(BaseModel):
+    items: List[ParsedCVBatchItem]
+
+
+
 class SkillMatchingInput(BaseModel):
     candidate: ParsedCV
     job: ParsedJobDescription
@@ -122,8 +158,37 @@ class RedFlagReport(BaseModel):
 
 
 class CVAnalysisResult(BaseModel):
-    cv: ParsedCV
+    # only a "failed" result may miss stage outputs
+    cv: Optional[ParsedCV] = None
     job_description: ParsedJobDescription
-    skill_match: SkillMatchingOutput
-    insights: CandidateInsights
-    red_flags: RedFlagReport
\ No newline at end of file
+    skill_match: Optional[SkillMatchingOutput] = None
+    insights: Optional[CandidateInsights] = None
+    red_flags: Optional[RedFlagReport] = None
+    source_path: Optional[str] = Field(None, description="The CV file this result was produced from")
+    item_key: Optional[str] = Field(None, description="Identifies the CV within its batch (see input_service.document_key); unique even when file names repeat")
+    status: str = Field("complete", description="complete; prescreened_out when the LLM stages were skipped by the local pre-screen; low_score when the score gate skipped the insight and red-flag agents; failed when the CV kept failing after retries")
+    error: Optional[str] = Field(None, description="Last error of a failed CV")
+    duplicate_of: Optional[str] = Field(None, description="CV this one is an exact or near duplicate of; its result was copied from that CV")
+    batch_id: Optional[str] = Field(None, description="Batch this result was screened in; key of PipelineMetrics.report")
+    compaction: Dict[str, CompactionReport] = Field(default_factory=dict, description="Prompt-size reduction per input document (\"cv\", \"jd\")")
+    extras: Dict[str, Any] = Field(default_factory=dict, description="Outputs of additional pipeline stages, keyed by stage name")
+
+
+class ScreeningMatrix(BaseModel):
+    cv_paths: List[str] = Field(..., description="Row labels: the screened CV files")
+    jd_paths: List[str] = Field(..., description="Column labels: the job description files")
+    job_descriptions: List[ParsedJobDescription] = Field(..., description="Parsed job descriptions, aligned with jd_paths")
+    scores: List[List[Optional[float]]] = Field(..., description="total_score of every (CV, JD) pair, candidate x role; None where the pair failed")
+    results: List[List[CVAnalysisResult]] = Field(..., description="Full result of every (CV, JD) pair, candidate x role")
+    batch_id: Optional[str] = Field(None, description="Batch the matrix was screened in; key of PipelineMetrics.report")
+
+    def ranking(self, jd_index: int) -> List[int]:
+        """Row indices of the candidates for one role, best total_score first (failed pairs last)."""
+        column = [row[jd_index] for row in self.scores]
+        return sorted(range(len(column)), key=lambda i: (column[i] is None, -(column[i] or 0.0)))
+
+    def best_role(self, cv_index: int) -> Optional[int]:
+        """Column index of the role a candidate scores highest for, or None if every pair failed."""
+        row = self.scores[cv_index]
+        scored = [j for j, score in enumerate(row) if score is not None]
+        return max(scored, key=lambda j: row[j]) if scored else None
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Type
+
+from pydantic import BaseModel
+
+from config import DefaultCFG
+
+
+class AgentCache:
+    """
+    Content-addressed, on-disk cache of validated agent outputs.
+
+    Entries are keyed on a hash of everything that determines an agent's answer
+    (input payload, system prompt, output schema and model name), so a repeated
+    call with the same inputs returns the stored pydantic object instead of
+    hitting the LLM. Eviction is least-recently-used once `max_entries` is
+    exceeded, and entries older than `max_age_seconds` are treated as misses.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DefaultCFG.cache_path,
+        max_entries: int = DefaultCFG.cache_max_entries,
+        max_age_seconds: float = DefaultCFG.cache_max_age_seconds,
+        enabled: bool = DefaultCFG.cache_enabled,
+    ):
+        """
+        Args:
+            db_path (str): SQLite file to store entries in (":memory:" for a process-local cache).
+            max_entries (int): Maximum number of entries kept before LRU eviction.
+            max_age_seconds (float): Entries older than this are expired.
+            enabled (bool): If False, the cache is bypassed entirely (every lookup is a miss, nothing is stored).
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if db_path != ":memory:" and os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS agent_cache ("
+            " key TEXT PRIMARY KEY,"
+            " agent TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_agent_cache_accessed ON agent_cache (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(agent_name: str, system_prompt: str, output_type: Type[BaseModel], model_name: str, payload: str) -> str:
+        """
+        Builds the content hash identifying one agent call.
+
+        Args:
+            agent_name (str): Name of the agent.
+            system_prompt (str): The agent's system prompt.
+            output_type (Type[BaseModel]): The agent's result schema.
+            model_name (str): Name of the model answering the call.
+            payload (str): The serialized input sent to the model.
+
+        Returns:
+            str: Hex SHA-256 digest.
+        """
+        material = json.dumps(
+            {
+                "agent": agent_name,
+                "system_prompt": system_prompt,
+                "schema": output_type.model_json_schema(),
+                "model": model_name,
+                "payload": payload,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, output_type: Type[BaseModel]) -> Optional[BaseModel]:
+        """
+        Returns the cached output for `key`, or None on a miss or when bypassed.
+        """
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM agent_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.max_age_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM agent_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE agent_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return output_type.model_validate_json(row[0])
+
+    def set(self, key: str, agent_name: str, value: BaseModel) -> None:
+        """
+        Stores a validated output and evicts expired and least-recently-used entries.
+        """
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO agent_cache (key, agent, value, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, agent_name, value.model_dump_json(), now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM agent_cache WHERE created_at < ?", (now - self.max_age_seconds,))
+        self._conn.execute(
+            "DELETE FROM agent_cache WHERE key IN ("
+            " SELECT key FROM agent_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self) -> None:
+        """Removes every entry and resets the counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM agent_cache")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: hits, misses, hit_rate and the current number of entries.
+        """
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM agent_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": size,
+        }
@@ -0,0 +1,270 @@
+import asyncio
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+import httpx
+from pydantic_ai.exceptions import ModelHTTPError
+
+from services.metrics_service import current_call
+from services.rate_limiter import RateLimiter
+from config import DefaultCFG
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Returns True for failures worth retrying: timeouts, 408/5xx answers and connection errors (429s are the rate limiter's)."""
+    if isinstance(exc, ModelHTTPError):
+        return exc.status_code == 408 or exc.status_code >= 500
+    return isinstance(exc, (asyncio.TimeoutError, httpx.TransportError, ConnectionError))
+
+
+def default_timeouts() -> Dict[str, float]:
+    """Per-agent timeouts configured in DefaultCFG (agents without an override use `call_timeout_seconds`)."""
+    overrides = {
+        "CVParserAgent": DefaultCFG.cv_parser_timeout_seconds,
+        "JobDescriptionAgent": DefaultCFG.job_description_timeout_seconds,
+        "SkillMatchingAgent": DefaultCFG.skill_matching_timeout_seconds,
+        "InsightGeneratorAgent": DefaultCFG.insight_generator_timeout_seconds,
+        "RedFlagDetectorAgent": DefaultCFG.red_flag_detector_timeout_seconds,
+    }
+    return {agent: seconds for agent, seconds in overrides.items() if seconds}
+
+
+class CallPolicy:
+    """
+    Timeouts, retries and hedging around every model request of an agent.
+
+    Each request gets the timeout of its agent. A request that times out or
+    fails transiently (see `is_transient_error`) is retried up to
+    `max_retries` times after a jittered exponential backoff; other errors,
+    e.g. output validation failures, are raised at once.
+
+    With hedging, the policy keeps the recent latencies of every agent and
+    model; once `hedge_min_samples` are known, a request still running after
+    the `hedge_quantile` of them gets a duplicate, and whichever answers first
+    wins (the other is cancelled). Hedges only go out while the rate limiter
+    has capacity right away and while they stay below `hedge_max_share` of
+    all requests, so they never delay regular requests. A cancelled loser was
+    sent with the same prompt, so its rate-limit reservation is settled to the
+    winner's input tokens (its output was cut off).
+
+    One instance can be shared by every agent and thread; counters are kept
+    per agent and added to the observed stage's CallStats.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DefaultCFG.call_timeout_seconds,
+        timeouts: Optional[Dict[str, float]] = None,
+        max_retries: int = DefaultCFG.call_max_retries,
+        base_backoff: float = DefaultCFG.call_base_backoff,
+        max_backoff: float = DefaultCFG.call_max_backoff,
+        hedge: bool = DefaultCFG.hedge_enabled,
+        hedge_quantile: float = DefaultCFG.hedge_quantile,
+        hedge_min_samples: int = DefaultCFG.hedge_min_samples,
+        hedge_max_share: float = DefaultCFG.hedge_max_share,
+        max_samples: int = 500,
+    ):
+        """
+        Args:
+            timeout (float): Seconds a single request may take; 0 = no limit.
+            timeouts (Optional[Dict[str, float]]): Per-agent overrides of `timeout`, by agent name;
+                default: default_timeouts().
+            max_retries (int): Retries of a timed-out or transiently failing request before the error is raised.
+            base_backoff (float): First retry delay in seconds, doubled on every retry (with jitter).
+            max_backoff (float): Upper bound for the retry delay in seconds.
+            hedge (bool): Send a duplicate of requests running past the agent's latency quantile.
+            hedge_quantile (float): Latency quantile (0-1) after which a request is hedged.
+            hedge_min_samples (int): Latencies observed per agent and model before hedging starts.
+            hedge_max_share (float): Most hedges as a share (0-1) of all requests.
+            max_samples (int): Recent latencies kept per agent and model.
+        """
+        self.timeout = timeout
+        self.timeouts = default_timeouts() if timeouts is None else dict(timeouts)
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_max_share = hedge_max_share
+
+        self._lock = threading.Lock()
+        self._latencies: Dict[Tuple[str, str], Deque[float]] = defaultdict(lambda: deque(maxlen=max_samples))
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "timeouts": 0, "retries": 0, "hedges": 0, "hedge_wins": 0}
+        )
+        self._requests = 0
+        self._hedges = 0
+
+    def timeout_for(self, agent: str) -> Optional[float]:
+        """Returns the request timeout of `agent` in seconds, or None for no limit."""
+        return self.timeouts.get(agent, self.timeout) or None
+
+    def hedge_delay(self, agent: str, route: str = "") -> Optional[float]:
+        """Returns after how many seconds a request of `agent` on `route` is hedged, or None if it is not."""
+        if not self.hedge:
+            return None
+        with self._lock:
+            latencies = sorted(self._latencies[(agent, route)])
+        if len(latencies) < max(self.hedge_min_samples, 1):
+            return None
+        return latencies[min(len(latencies) - 1, int(self.hedge_quantile * len(latencies)))]
+
+    def _count(self, agent: str, counter: str) -> None:
+        with self._lock:
+            self._counts[agent][counter] += 1
+        stats = current_call()
+        if stats is not None and counter in ("timeouts", "retries", "hedges"):
+            setattr(stats, counter, getattr(stats, counter) + 1)
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.base_backoff * 2 ** attempt)
+        return random.uniform(delay / 2, delay)
+
+    async def arun(
+        self,
+        agent: str,
+        call: Callable[[], Awaitable[Any]],
+        rate_limiter: Optional[RateLimiter] = None,
+        estimated_tokens: int = 0,
+        route: str = "",
+        timeout_scale: float = 1.0,
+        input_tokens: Optional[Callable[[Any], int]] = None,
+    ) -> Any:
+        """
+        Runs `call` under the policy (and under `rate_limiter`, if given).
+
+        Args:
+            agent (str): Name of the calling agent; selects the timeout and the counters.
+            call (Callable[[], Awaitable]): Zero-argument coroutine function issuing the request.
+            rate_limiter (Optional[RateLimiter]): Limiter every attempt, hedges included, reserves capacity from.
+            estimated_tokens (int): Tokens to reserve per attempt.
+            route (str): Distinguishes latency histories of one agent, e.g. per model.
+            timeout_scale (float): Multiplies the agent's timeout, e.g. by the number of documents
+                in a batched request.
+            input_tokens (Optional[Callable[[Any], int]]): Returns the input tokens a result used;
+                the reservation of a cancelled hedge loser is settled to that amount.
+
+        Returns:
+            Any: Whatever `call` returns.
+        """
+        with self._lock:
+            self._counts[agent]["calls"] += 1
+            self._requests += 1
+        timeout = self.timeout_for(agent)
+        timeout = timeout * timeout_scale if timeout else None
+        attempt = 0
+        while True:
+            try:
+                return await self._attempt(agent, route, call, rate_limiter, estimated_tokens, timeout, input_tokens)
+            except Exception as exc:
+                if not is_transient_error(exc) or attempt >= self.max_retries:
+                    raise
+                self._count(agent, "retries")
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+
+    async def _timed(
+        self,
+        agent: str,
+        route: str,
+        call: Callable[[], Awaitable[Any]],
+        timeout: Optional[float],
+        sent: Optional[asyncio.Event] = None,
+    ) -> Any:
+        """Sends one request under `timeout` and records its latency when it succeeds."""
+        if sent is not None:
+            sent.set()
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(call(), timeout)
+        except asyncio.TimeoutError:
+            self._count(agent, "timeouts")
+            raise
+        with self._lock:
+            self._latencies[(agent, route)].append(time.monotonic() - started)
+        return result
+
+    async def _send(
+        self,
+        agent: str,
+        route: str,
+        call: Callable[[], Awaitable[Any]],
+        rate_limiter: Optional[RateLimiter],
+        estimated_tokens: int,
+        timeout: Optional[float],
+        sent: Optional[asyncio.Event] = None,
+    ) -> Any:
+        if rate_limiter is None:
+            return await self._timed(agent, route, call, timeout, sent)
+        return await rate_limiter.arun(lambda: self._timed(agent, route, call, timeout, sent), estimated_tokens)
+
+    def _may_hedge(self, rate_limiter: Optional[RateLimiter], estimated_tokens: int) -> bool:
+        """Takes a hedge from the budget (share of requests and rate-limit capacity) if one is left."""
+        with self._lock:
+            if self._hedges + 1 > self.hedge_max_share * self._requests:
+                return False
+            if rate_limiter is not None and not rate_limiter.try_acquire(estimated_tokens):
+                return False
+            self._hedges += 1
+            self._requests += 1
+        return True
+
+    async def _attempt(
+        self,
+        agent: str,
+        route: str,
+        call: Callable[[], Awaitable[Any]],
+        rate_limiter: Optional[RateLimiter],
+        estimated_tokens: int,
+        timeout: Optional[float],
+        input_tokens: Optional[Callable[[Any], int]],
+    ) -> Any:
+        delay = self.hedge_delay(agent, route)
+        if delay is None:
+            return await self._send(agent, route, call, rate_limiter, estimated_tokens, timeout)
+
+        sent = asyncio.Event()
+        primary = asyncio.ensure_future(self._send(agent, route, call, rate_limiter, estimated_tokens, timeout, sent))
+        hedge = None
+        try:
+            # the delay starts once the request is sent: time queued in the rate limiter does not count
+            waiting = asyncio.ensure_future(sent.wait())
+            await asyncio.wait({primary, waiting}, return_when=asyncio.FIRST_COMPLETED)
+            waiting.cancel()
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._may_hedge(rate_limiter, estimated_tokens):
+                return await primary
+            self._count(agent, "hedges")
+            hedge = asyncio.ensure_future(self._timed(agent, route, call, timeout))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._count(agent, "hedge_wins")
+                        if pending and rate_limiter is not None and input_tokens is not None:
+                            # the caller settles the winner; the loser about to be cancelled used the same input
+                            rate_limiter.settle(estimated_tokens, input_tokens(task.result()))
+                        return task.result()
+            # both failed: the primary's error decides whether the request is retried
+            raise primary.exception()
+        finally:
+            losers = [task for task in (primary, hedge) if task is not None and not task.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+
+    def report(self) -> Dict[str, dict]:
+        """
+        Returns:
+            Dict[str, dict]: Per agent: calls, timeouts, retries, hedges (duplicate requests sent)
+                and hedge_wins (hedges that answered first).
+        """
+        with self._lock:
+            return {agent: dict(counts) for agent, counts in self._counts.items()}
@@ -0,0 +1,107 @@
+import json
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from schemas.services_schemas import ParsedCV, ParsedJobDescription
+from config import DefaultCFG
+
+
+Confidence = Callable[[BaseModel, str], float]
+
+
+def _grounding(items: List[str], source: str) -> float:
+    """Share of extracted items that literally occur in the source text (1.0 when nothing was extracted)."""
+    items = [item.strip().lower() for item in items if item and item.strip()]
+    if not items:
+        return 1.0
+    return sum(item in source for item in items) / len(items)
+
+
+def _source_text(payload: str) -> str:
+    try:
+        return str(json.loads(payload).get("file_content", "")).lower()
+    except (ValueError, AttributeError):
+        return payload.lower()
+
+
+def parse_confidence(output: BaseModel, payload: str) -> float:
+    """
+    Heuristic confidence (0-1) of a parser output.
+
+    For a ParsedCV or ParsedJobDescription: the share of its key fields that
+    were filled in, times the share of extracted skills found verbatim in the
+    input text (so invented skills lower it too). Other outputs score 1.0.
+    """
+    source = _source_text(payload)
+    if isinstance(output, ParsedCV):
+        filled = [output.name, output.email, output.skills, output.experience, output.education]
+        skills = output.skills
+    elif isinstance(output, ParsedJobDescription):
+        filled = [output.job_title, output.required_skills, output.responsibilities]
+        skills = output.required_skills
+    else:
+        return 1.0
+    completeness = sum(bool(value) for value in filled) / len(filled)
+    return completeness * _grounding(skills, source)
+
+
+class ModelCascade:
+    """
+    Fast-model-first routing for an agent, with escalation to the agent's own model.
+
+    An agent given a cascade sends each request to `fast_model` first and only
+    re-sends it to its (stronger) configured model when the fast answer fails
+    output validation or its `confidence` is below `min_confidence`. Every
+    decision is counted per agent, so escalation rates can be reported; one
+    cascade can be shared by several agents.
+    """
+
+    def __init__(
+        self,
+        fast_model: Any,
+        min_confidence: float = DefaultCFG.cascade_min_confidence,
+        confidence: Optional[Confidence] = None,
+    ):
+        """
+        Args:
+            fast_model (Any): pydantic_ai model (or model name) tried first.
+            min_confidence (float): Fast answers scoring below this (0-1) are escalated.
+            confidence (Optional[Confidence]): `confidence(output, payload) -> float`;
+                default: parse_confidence.
+        """
+        self.fast_model = fast_model
+        self.min_confidence = min_confidence
+        self.confidence = confidence or parse_confidence
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: {"calls": 0, "validation": 0, "low_confidence": 0})
+
+    @property
+    def fast_model_name(self) -> str:
+        return getattr(self.fast_model, "model_name", None) or str(self.fast_model)
+
+    def accepts(self, output: BaseModel, payload: str) -> bool:
+        return self.confidence(output, payload) >= self.min_confidence
+
+    def record(self, agent: str, escalation: Optional[str] = None) -> None:
+        """Counts one routed request of `agent`; `escalation` is "validation", "low_confidence" or None."""
+        with self._lock:
+            counts = self._counts[agent]
+            counts["calls"] += 1
+            if escalation is not None:
+                counts[escalation] += 1
+
+    def report(self) -> Dict[str, dict]:
+        """
+        Returns:
+            Dict[str, dict]: Per agent: calls, escalations by reason ("validation",
+                "low_confidence"), total escalations and the escalation rate (0-1).
+        """
+        with self._lock:
+            counts = {agent: dict(values) for agent, values in self._counts.items()}
+        for values in counts.values():
+            values["escalations"] = values["validation"] + values["low_confidence"]
+            values["escalation_rate"] = round(values["escalations"] / values["calls"], 4) if values["calls"] else 0.0
+        return counts
@@ -0,0 +1,207 @@
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from schemas.services_schemas import CompactionReport
+from services.tokens import estimate_tokens
+from config import DefaultCFG
+
+
+# Headings recognised as section starts in CVs and job descriptions (lowercase, without a trailing colon).
+SECTION_HEADINGS = {
+    "summary", "professional summary", "profile", "about me", "objective", "career objective",
+    "experience", "work experience", "professional experience", "employment", "employment history", "work history",
+    "education", "academic background", "qualifications",
+    "skills", "technical skills", "core skills", "key skills", "competencies", "core competencies",
+    "certifications", "certificates", "licenses", "courses", "training",
+    "projects", "publications", "languages", "awards", "achievements", "volunteering", "volunteer experience",
+    "interests", "hobbies", "references", "personal details", "declaration",
+    "job description", "about the role", "role overview", "responsibilities", "key responsibilities", "duties",
+    "requirements", "minimum qualifications", "preferred qualifications", "nice to have", "what you will do",
+    "what we are looking for", "about us", "about the company", "benefits", "perks", "what we offer",
+    "equal opportunity", "how to apply",
+}
+
+# Sections dropped first when a document is over its token budget.
+LOW_PRIORITY_SECTIONS = {
+    "interests", "hobbies", "references", "personal details", "declaration",
+    "about us", "about the company", "benefits", "perks", "what we offer", "equal opportunity", "how to apply",
+}
+
+_PAGE_NUMBER_PATTERN = re.compile(r"^(page\s*)?\d{1,4}(\s*(of|/)\s*\d{1,4})?$", re.IGNORECASE)
+_DIGITS_PATTERN = re.compile(r"\d+")
+_WHITESPACE_PATTERN = re.compile(r"[ \t\u00a0\u200b]+")
+_HEADING_STRIP_PATTERN = re.compile(r"^[\W_]+|[\W_]+$")
+_EDGE_LINES = 3  # lines at the top and bottom of each page checked for running headers/footers
+
+
+@dataclass
+class _Section:
+    title: str
+    lines: List[str] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return self.title.lower()
+
+
+class TextCompactor:
+    """
+    Shrinks extracted CV/JD text before it is sent to the parser agents.
+
+    Compaction collapses whitespace, removes running page headers/footers (lines
+    repeated at the edges of most PDF pages, which FileManager separates with form
+    feeds) and page numbers, splits the text into sections by their headings and,
+    if the result is still over the token budget, drops low-priority sections and
+    then shortens every remaining section in proportion to its size. Token counts
+    come from the local `estimate_tokens`.
+    """
+
+    def __init__(
+        self,
+        cv_token_budget: int = DefaultCFG.compaction_cv_token_budget,
+        jd_token_budget: int = DefaultCFG.compaction_jd_token_budget,
+        repeat_ratio: float = DefaultCFG.compaction_repeat_ratio,
+    ):
+        """
+        Args:
+            cv_token_budget (int): Maximum estimated tokens of CV text sent to CVParserAgent; 0 = no limit.
+            jd_token_budget (int): Maximum estimated tokens of JD text sent to JobDescriptionAgent; 0 = no limit.
+            repeat_ratio (float): A line at the top/bottom of at least this share of pages is a running header/footer.
+        """
+        self.cv_token_budget = cv_token_budget
+        self.jd_token_budget = jd_token_budget
+        self.repeat_ratio = repeat_ratio
+
+    def compact(self, text: str, token_budget: int = 0) -> Tuple[str, CompactionReport]:
+        """
+        Compacts one document.
+
+        Args:
+            text (str): Extracted document text.
+            token_budget (int): Maximum estimated tokens of the output; 0 = no limit.
+
+        Returns:
+            Tuple[str, CompactionReport]: The compacted text and a report of what was removed.
+        """
+        text = text or ""
+        tokens_before = estimate_tokens(text)
+        lines, removed = self._strip_page_furniture(text)
+        sections = self._split_sections(lines)
+
+        dropped, truncated = [], False
+        if token_budget and self._tokens(sections) > token_budget:
+            sections, dropped = self._drop_low_priority(sections, token_budget)
+            if self._tokens(sections) > token_budget:
+                sections = self._shorten(sections, token_budget)
+                truncated = True
+
+        compacted = self._render(sections)
+        report = CompactionReport(
+            tokens_before=tokens_before,
+            tokens_after=estimate_tokens(compacted),
+            removed_lines=removed,
+            sections=[section.title for section in sections if section.title],
+            dropped_sections=dropped,
+            truncated=truncated,
+        )
+        return compacted, report
+
+    # --- Steps ---
+
+    def _strip_page_furniture(self, text: str) -> Tuple[List[str], int]:
+        """Normalizes whitespace and removes running headers/footers and page numbers; returns (lines, removed count)."""
+        pages = [
+            [_WHITESPACE_PATTERN.sub(" ", line).strip() for line in page.replace("\r", "\n").split("\n")]
+            for page in text.split("\f")
+        ]
+        pages = [[line for line in page if line] for page in pages]
+        pages = [page for page in pages if page]
+
+        repeated = set()
+        if len(pages) >= 2:
+            counts = Counter()
+            for page in pages:
+                counts.update({self._furniture_key(line) for line in page[:_EDGE_LINES] + page[-_EDGE_LINES:]})
+            needed = max(2, math.ceil(self.repeat_ratio * len(pages)))
+            repeated = {key for key, count in counts.items() if count >= needed}
+
+        lines, removed = [], 0
+        for page in pages:
+            edges = set(range(min(_EDGE_LINES, len(page)))) | set(range(max(0, len(page) - _EDGE_LINES), len(page)))
+            for i, line in enumerate(page):
+                if i in edges and (self._furniture_key(line) in repeated or (len(pages) >= 2 and _PAGE_NUMBER_PATTERN.match(line))):
+                    removed += 1
+                    continue
+                lines.append(line)
+        return lines, removed
+
+    @staticmethod
+    def _furniture_key(line: str) -> str:
+        # "Doe CV - page 3" and "Doe CV - page 4" are the same footer; other lines must repeat verbatim
+        line = line.lower()
+        return _DIGITS_PATTERN.sub("#", line) if "page" in line else line
+
+    @staticmethod
+    def _heading(line: str) -> Optional[str]:
+        """Returns the section title if `line` is a heading, else None."""
+        if len(line) > 40:
+            return None
+        title = _HEADING_STRIP_PATTERN.sub("", line).strip()
+        if title.lower() in SECTION_HEADINGS:
+            return title
+        return None
+
+    def _split_sections(self, lines: List[str]) -> List[_Section]:
+        sections = [_Section(title="")]  # preamble: name and contact details usually live here
+        for line in lines:
+            title = self._heading(line)
+            if title is not None:
+                sections.append(_Section(title=title))
+            else:
+                sections[-1].lines.append(line)
+        return [section for section in sections if section.title or section.lines]
+
+    @staticmethod
+    def _section_tokens(section: _Section) -> int:
+        return estimate_tokens(section.title) + sum(estimate_tokens(line) for line in section.lines)
+
+    def _tokens(self, sections: List[_Section]) -> int:
+        return sum(self._section_tokens(section) for section in sections)
+
+    def _drop_low_priority(self, sections: List[_Section], token_budget: int) -> Tuple[List[_Section], List[str]]:
+        """Drops low-priority sections, last first, until the document fits or none are left."""
+        kept, dropped = list(sections), []
+        for section in reversed(sections):
+            if self._tokens(kept) <= token_budget:
+                break
+            if section.key in LOW_PRIORITY_SECTIONS:
+                kept.remove(section)
+                dropped.append(section.title)
+        return kept, dropped[::-1]
+
+    def _shorten(self, sections: List[_Section], token_budget: int) -> List[_Section]:
+        """Keeps the beginning of every section, each getting a share of the budget proportional to its size."""
+        total = self._tokens(sections)
+        shortened = []
+        for section in sections:
+            share = int(token_budget * self._section_tokens(section) / total) - estimate_tokens(section.title)
+            kept, used = [], 0
+            for line in section.lines:
+                tokens = estimate_tokens(line)
+                if used + tokens > share:
+                    break
+                kept.append(line)
+                used += tokens
+            shortened.append(_Section(title=section.title, lines=kept))
+        return shortened
+
+    @staticmethod
+    def _render(sections: List[_Section]) -> str:
+        blocks = []
+        for section in sections:
+            block = ([section.title] if section.title else []) + section.lines
+            blocks.append("\n".join(block))
+        return "\n\n".join(block for block in blocks if block)
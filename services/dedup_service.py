@@ -0,0 +1,141 @@
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import DefaultCFG
+
+
+_WORD_PATTERN = re.compile(r"\w+")
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class DuplicateDetector:
+    """
+    Exact and near-duplicate detection of extracted CV text.
+
+    Text is normalized to lowercase word tokens. Identical normalized text is
+    caught by a SHA-256 fingerprint; edited copies by MinHash signatures over
+    word shingles, whose share of equal slots estimates the Jaccard similarity
+    of the two shingle sets. Candidate pairs are found with LSH banding, so
+    adding a document does not compare it against the whole pool.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DefaultCFG.dedup_threshold,
+        num_perm: int = DefaultCFG.dedup_num_perm,
+        shingle_size: int = DefaultCFG.dedup_shingle_size,
+        seed: int = 1,
+    ):
+        """
+        Args:
+            threshold (float): Minimum estimated Jaccard similarity (0-1) of two near-duplicates.
+            num_perm (int): MinHash signature length; longer signatures estimate similarity more precisely.
+            shingle_size (int): Words per shingle.
+            seed (int): Seed of the MinHash permutations.
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)[:, None]
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)[:, None]
+        self.bands, self.rows = self._lsh_params(threshold, num_perm)
+
+    @staticmethod
+    def _lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+        """
+        Picks (bands, rows per band): the most selective split that still makes a
+        pair at exactly `threshold` share a band with probability >= 0.99.
+        """
+        for rows in sorted((r for r in range(1, num_perm + 1) if num_perm % r == 0), reverse=True):
+            bands = num_perm // rows
+            if 1.0 - (1.0 - threshold ** rows) ** bands >= 0.99:
+                return bands, rows
+        return num_perm, 1
+
+    @staticmethod
+    def tokens(text: str) -> List[str]:
+        return _WORD_PATTERN.findall(text.lower())
+
+    def fingerprint(self, tokens: List[str]) -> str:
+        return hashlib.sha256(" ".join(tokens).encode("utf-8")).hexdigest()
+
+    def signature(self, tokens: List[str]) -> np.ndarray:
+        """MinHash signature (`num_perm` values) of the text's word shingles."""
+        size = min(self.shingle_size, len(tokens))
+        shingles = {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        # uint64 arithmetic wraps around, as in the usual universal-hash MinHash
+        permuted = (self._a * hashes[None, :] + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=1)
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return float(np.mean(first == second))
+
+    def index(self) -> "DuplicateIndex":
+        """Returns an empty index, one per batch."""
+        return DuplicateIndex(self)
+
+
+class DuplicateIndex:
+    """
+    Incremental duplicate grouping for one batch.
+
+    The first document of a group is its canonical member; every later document
+    that is an exact copy of it, or whose estimated similarity reaches the
+    detector's threshold, is assigned to it.
+    """
+
+    def __init__(self, detector: DuplicateDetector):
+        self.detector = detector
+        self._exact: Dict[str, str] = {}
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[str]] = defaultdict(list)
+
+    def add(self, key: str, text: str) -> Optional[str]:
+        """
+        Registers one document.
+
+        Args:
+            key (str): The document's identifier (its path).
+            text (str): The extracted text.
+
+        Returns:
+            Optional[str]: Key of the canonical document `key` duplicates, or None if it
+                starts a group of its own. Documents without any words are never grouped.
+        """
+        tokens = self.detector.tokens(text)
+        if not tokens:
+            return None
+        fingerprint = self.detector.fingerprint(tokens)
+        if fingerprint in self._exact:
+            return self._exact[fingerprint]
+
+        signature = self.detector.signature(tokens)
+        rows = self.detector.rows
+        bands = [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(self.detector.bands)]
+        candidates = dict.fromkeys(other for band in bands for other in self._buckets.get(band, ()))
+        best, best_similarity = None, self.detector.threshold
+        for other in candidates:
+            similarity = self.detector.similarity(signature, self._signatures[other])
+            if similarity >= best_similarity:
+                best, best_similarity = other, similarity
+        if best is not None:
+            return best
+
+        self._exact[fingerprint] = key
+        self._signatures[key] = signature
+        for band in bands:
+            self._buckets[band].append(key)
+        return None
@@ -0,0 +1,80 @@
+from typing import Dict, List, Optional
+
+from schemas.services_schemas import SkillMatchingOutput, CandidateInsights, RedFlagReport
+from config import DefaultCFG
+
+
+SCORE_FIELDS = ("total_score", "skill_score", "experience_score", "education_score", "qualification_score", "responsibility_score")
+
+
+class ScoreGate:
+    """
+    Early exit after skill matching for clearly weak candidates.
+
+    A candidate is gated when any configured SkillMatchingOutput score falls
+    below its minimum. Gated candidates skip InsightGeneratorAgent and
+    RedFlagDetectorAgent: their CandidateInsights and RedFlagReport are filled
+    deterministically from the skill match (matched/missing skills and
+    responsibilities, missing qualifications, education gaps), and the
+    manager marks the result "low_score" so a full analysis can be requested
+    later.
+    """
+
+    def __init__(self, min_scores: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            min_scores (Optional[Dict[str, float]]): Minimum (0-100) per SkillMatchingOutput score field
+                (see SCORE_FIELDS); default: `total_score` >= DefaultCFG.score_gate_min_total_score,
+                plus `skill_score` >= DefaultCFG.score_gate_min_skill_score when that is set.
+
+        Raises:
+            ValueError: If a key is not a score field.
+        """
+        if min_scores is None:
+            min_scores = {"total_score": DefaultCFG.score_gate_min_total_score}
+            if DefaultCFG.score_gate_min_skill_score:
+                min_scores["skill_score"] = DefaultCFG.score_gate_min_skill_score
+        unknown = set(min_scores) - set(SCORE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown score fields: {', '.join(sorted(unknown))}")
+        self.min_scores = dict(min_scores)
+
+    def failed_rules(self, skill_match: SkillMatchingOutput) -> List[str]:
+        """Returns a description of every rule the skill match falls short of (empty: not gated)."""
+        return [
+            f"{field.replace('_', ' ')} {getattr(skill_match, field):.0f}% < {minimum:.0f}%"
+            for field, minimum in self.min_scores.items()
+            if getattr(skill_match, field) < minimum
+        ]
+
+    def gates(self, skill_match: SkillMatchingOutput) -> bool:
+        return bool(self.failed_rules(skill_match))
+
+    def local_insights(self, skill_match: SkillMatchingOutput) -> CandidateInsights:
+        """Deterministic CandidateInsights for a gated candidate."""
+        return CandidateInsights(
+            strengths=[f"Has required skill: {skill}" for skill in skill_match.matched_skills]
+            + [f"Covers responsibility: {item}" for item in skill_match.matched_responsibilities],
+            weaknesses=[f"Missing required skill: {skill}" for skill in skill_match.missing_skills]
+            + [f"Missing qualification: {item}" for item in skill_match.missing_qualifications or []]
+            + [f"Education gap: {item}" for item in skill_match.education_gaps or []]
+            + [f"Does not cover responsibility: {item}" for item in skill_match.missing_responsibilities],
+            potential=None,
+            insight_summary=(
+                f"Not analysed by the LLM: low match score ({'; '.join(self.failed_rules(skill_match))}). "
+                "Strengths and weaknesses are taken from the skill match."
+            ),
+        )
+
+    def local_red_flags(self, skill_match: SkillMatchingOutput) -> RedFlagReport:
+        """Deterministic RedFlagReport for a gated candidate: High with missing qualifications or below half the total-score minimum, else Medium."""
+        missing_qualifications = skill_match.missing_qualifications or []
+        severe = bool(missing_qualifications) or skill_match.total_score < self.min_scores.get("total_score", 0.0) / 2
+        return RedFlagReport(
+            red_flags=[f"Low match score: {rule}" for rule in self.failed_rules(skill_match)]
+            + [f"Missing critical skill: {skill}" for skill in skill_match.missing_skills]
+            + [f"Missing qualification: {item}" for item in missing_qualifications]
+            + [f"Education gap: {item}" for item in skill_match.education_gaps or []],
+            severity_level="High" if severe else "Medium",
+            flagged_summary="Candidate fell below the score gate; red flags are derived from the skill match.",
+        )
@@ -1,28 +1,138 @@
+import hashlib
+import io
 import os
-import PyPDF2, docx
-from typing import Optional
+import signal
+import asyncio
+import itertools
+import multiprocessing
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
+
+from config import DefaultCFG
+
+
+@dataclass
+class InMemoryDocument:
+    """
+    A document held in memory, e.g. a Streamlit upload.
+
+    `name` is a file name: its extension selects the reader and it identifies the
+    document in results. `data` may be bytes, a memoryview or a seekable binary
+    buffer (BytesIO, an UploadedFile); it is read in place, never written to disk.
+    """
+    name: str
+    data: Union[bytes, bytearray, memoryview, BinaryIO]
+
+    def buffer(self) -> BinaryIO:
+        """A binary stream positioned at the start of the document."""
+        if isinstance(self.data, (bytes, bytearray, memoryview)):
+            return io.BytesIO(self.data)
+        self.data.seek(0)
+        return self.data
+
+    def to_bytes(self) -> bytes:
+        if isinstance(self.data, (bytes, bytearray, memoryview)):
+            return bytes(self.data)
+        if isinstance(self.data, io.BytesIO):
+            return self.data.getvalue()
+        return self.buffer().read()
+
+    def __reduce__(self):
+        # buffers and memoryviews cannot be pickled; the extraction pool gets plain bytes
+        return (InMemoryDocument, (self.name, self.to_bytes()))
+
+
+# a path on disk or an in-memory document
+DocumentSource = Union[str, InMemoryDocument]
+
+
+def source_name(source: DocumentSource) -> str:
+    """The path of a file, or the name of an in-memory document."""
+    return source.name if isinstance(source, InMemoryDocument) else source
+
+
+def document_key(source: DocumentSource) -> str:
+    """
+    Identifies a document within a batch: the path of a file, or an in-memory document's name and content hash.
+
+    Unlike source_name, two different uploads with the same file name get different keys.
+    """
+    if not isinstance(source, InMemoryDocument):
+        return source
+    data = source.data if isinstance(source.data, (bytes, bytearray, memoryview)) else source.to_bytes()
+    return f"{source.name}#{hashlib.sha256(data).hexdigest()[:16]}"
+
+
+def _open_binary(source: DocumentSource):
+    return nullcontext(source.buffer()) if isinstance(source, InMemoryDocument) else open(source, 'rb')
+
+
+@dataclass
+class FileReadResult:
+    """Outcome of one file in a bulk read: either `content` or an `error` message."""
+    file_path: str
+    content: Optional[str] = None
+    error: Optional[str] = None
 
 
 class FileManager:
-    
-    def _read_txt(self, file_path: str) -> str:
+
+    def __init__(
+        self,
+        max_workers: int = DefaultCFG.extraction_workers,
+        max_pages: Optional[int] = DefaultCFG.extraction_max_pages,
+        timeout: Optional[float] = DefaultCFG.extraction_timeout_seconds,
+    ):
+        """
+        Args:
+            max_workers (int): Size of the process pool used for PDF/DOCX extraction; 0 extracts on a thread instead.
+            max_pages (Optional[int]): Only the first `max_pages` pages of a PDF are extracted (None = all).
+            timeout (Optional[float]): Seconds allowed per pooled extraction before it is abandoned (None = no limit).
+        """
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    # the readers are static so pool workers get only the document and the limits, never the manager
+    @staticmethod
+    def _read_txt(file_path: DocumentSource) -> str:
+        if isinstance(file_path, InMemoryDocument):
+            wrapper = io.TextIOWrapper(file_path.buffer(), encoding='utf-8')
+            try:
+                return wrapper.read()
+            finally:
+                wrapper.detach()  # leave the caller's buffer open
         with open(file_path, 'r', encoding='utf-8') as f:
             return f.read()
 
-    def _read_pdf(self, file_path: str) -> str:
-        text = ""
-        with open(file_path, 'rb') as f:
+    @staticmethod
+    def _read_pdf(file_path: DocumentSource, max_pages: Optional[int] = None) -> str:
+        # the PDF/DOCX libraries are only imported once a file of that type is read
+        import PyPDF2
+
+        with _open_binary(file_path) as f:
             reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                text += page.extract_text() or ""
-        return text
+            pages = itertools.islice(reader.pages, max_pages)
+            # form feeds mark page boundaries for TextCompactor's header/footer detection
+            return "\f".join(page.extract_text() or "" for page in pages)
+
+    @staticmethod
+    def _read_docx(file_path: DocumentSource) -> str:
+        import docx
 
-    def _read_docx(self, file_path: str) -> str:
-        doc = docx.Document(file_path)
+        with _open_binary(file_path) as f:
+            doc = docx.Document(f)
         return "\n".join([para.text for para in doc.paragraphs])
 
 
-    def read_file(self, file_path: str) -> Optional[str]:
+    @staticmethod
+    def read_file(file_path: DocumentSource, max_pages: Optional[int] = None) -> Optional[str]:
 
         """
         Reads the content of a file based on its extension.
@@ -31,22 +141,131 @@ class FileManager:
         Raises a ValueError if the file type is unsupported.
 
         Args:
-            file_path (str): The path to the file to be read.
+            file_path (DocumentSource): The path to the file to be read, or an InMemoryDocument.
+            max_pages (Optional[int]): For PDFs, only extract this many pages (None = all).
 
         Returns:
             Optional[str]: The text content of the file, or None if the file cannot be read.
         """
 
-        
-        ext = os.path.splitext(file_path)[1].lower()
+
+        ext = os.path.splitext(source_name(file_path))[1].lower()
         if ext == '.txt':
-            return self._read_txt(file_path)
+            return FileManager._read_txt(file_path)
         elif ext == '.pdf':
-            return self._read_pdf(file_path)
+            return FileManager._read_pdf(file_path, max_pages=max_pages)
         elif ext == '.docx':
-            return self._read_docx(file_path)
+            return FileManager._read_docx(file_path)
         else:
             raise ValueError(f"Unsupported file type: {ext}")
 
+    # --- Pooled extraction ---
+
+    def _pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers <= 0:
+            return None
+        with self._executor_lock:
+            if self._executor is None:
+                # spawned, not forked: forking a threaded process (Streamlit, the asyncio runner) can copy held locks
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def _uses_pool(self, file_path: DocumentSource) -> bool:
+        # plain text is cheaper to read in-process than to ship across a process boundary
+        return os.path.splitext(source_name(file_path))[1].lower() != '.txt' and self.max_workers > 0
+
+    def _submit(self, file_path: DocumentSource) -> Future:
+        return self._pool().submit(_extract_text, file_path, self.max_pages, self.timeout)
+
+    async def aread_file(self, file_path: DocumentSource) -> Optional[str]:
+        """
+        Async read_file: PDF/DOCX are extracted in the process pool, everything else on a thread.
+
+        Raises:
+            TimeoutError: If extraction takes longer than `timeout`.
+        """
+        if not self._uses_pool(file_path):
+            return await asyncio.to_thread(self.read_file, file_path, self.max_pages)
+        future = asyncio.wrap_future(self._submit(file_path))
+        try:
+            # the worker enforces `timeout` itself; this backstop leaves room for queueing
+            return await asyncio.wait_for(future, timeout=2 * self.timeout if self.timeout else None)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Extraction timed out after {self.timeout}s: {source_name(file_path)}") from None
+
+    def read_files(self, file_paths: Iterable[DocumentSource], max_in_flight: Optional[int] = None) -> Iterator[FileReadResult]:
+        """
+        Reads many files, yielding each result as soon as it is ready.
+
+        PDF/DOCX extraction runs in a process pool so large documents neither block
+        the caller nor each other; at most `max_in_flight` files (default: twice the
+        pool size) are queued at a time, so `file_paths` may be an arbitrarily long
+        lazy iterable. Failures and timeouts are reported per file instead of raising.
+
+        Args:
+            file_paths (Iterable[DocumentSource]): Paths of the files to read, or InMemoryDocuments.
+            max_in_flight (Optional[int]): Maximum number of files being extracted concurrently.
+
+        Yields:
+            FileReadResult: One result per input, in completion order (`file_path` is the path or document name).
+        """
+        max_in_flight = max_in_flight or max(1, 2 * self.max_workers)
+        paths = iter(file_paths)
+        pending: dict = {}
+        while True:
+            while len(pending) < max_in_flight:
+                file_path = next(paths, None)
+                if file_path is None:
+                    break
+                if not self._uses_pool(file_path):
+                    try:
+                        yield FileReadResult(source_name(file_path), content=self.read_file(file_path, self.max_pages))
+                    except Exception as exc:
+                        yield FileReadResult(source_name(file_path), error=f"{type(exc).__name__}: {exc}")
+                    continue
+                # workers enforce `timeout` themselves; the parent-side deadline (with room
+                # for queueing) only guards against a wedged process
+                deadline = time.monotonic() + 2 * self.timeout if self.timeout else None
+                pending[self._submit(file_path)] = (file_path, deadline)
+            if not pending:
+                return
+
+            deadlines = [deadline for _, deadline in pending.values() if deadline is not None]
+            wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for future, (file_path, deadline) in list(pending.items()):
+                if future not in done and deadline is not None and now >= deadline:
+                    future.cancel()
+                    del pending[future]
+                    yield FileReadResult(source_name(file_path), error=f"TimeoutError: extraction exceeded {self.timeout}s")
+            for future in done:
+                file_path, _ = pending.pop(future)
+                try:
+                    yield FileReadResult(source_name(file_path), content=future.result())
+                except Exception as exc:
+                    yield FileReadResult(source_name(file_path), error=f"{type(exc).__name__}: {exc}")
+
+    def close(self, wait: bool = False) -> None:
+        """Shuts the extraction pool down; with `wait`, blocks until the worker processes have exited."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("extraction time limit exceeded")
 
 
+def _extract_text(file_path: DocumentSource, max_pages: Optional[int], timeout: Optional[float]) -> Optional[str]:
+    """Process-pool entry point: reads one file (a path, or an InMemoryDocument pickled as its bytes), aborting after `timeout` seconds where SIGALRM is available."""
+    use_alarm = timeout and hasattr(signal, "setitimer")
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return FileManager.read_file(file_path, max_pages=max_pages)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
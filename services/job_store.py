@@ -0,0 +1,180 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Type
+
+from pydantic import BaseModel
+
+from config import DefaultCFG
+
+
+class JobStore:
+    """
+    Durable, per-stage checkpoints of screening jobs.
+
+    A job is one batch (its id is the manager's `batch_id`); an item is one CV
+    (or the job description) inside it. Every checkpointed stage output is stored
+    as soon as it is computed, together with each item's status, attempts and
+    last error, so a crashed or interrupted batch can be resumed by running it
+    again with the same job id: completed stages are loaded instead of recomputed.
+
+    Jobs not updated for `max_age_seconds` are evicted, as are the least recently
+    updated ones once more than `max_jobs` are stored; the manager deletes a job
+    itself as soon as it completes without failures.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DefaultCFG.job_store_path,
+        max_jobs: int = DefaultCFG.job_store_max_jobs,
+        max_age_seconds: float = DefaultCFG.job_store_max_age_seconds,
+    ):
+        """
+        Args:
+            db_path (str): SQLite file to store jobs in (":memory:" for a process-local store).
+            max_jobs (int): Maximum number of jobs kept before the least recently updated are evicted.
+            max_age_seconds (float): Jobs not updated for this long are evicted.
+        """
+        self.db_path = db_path
+        self.max_jobs = max_jobs
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+
+        if db_path != ":memory:" and os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " job_id TEXT PRIMARY KEY,"
+            " jd_path TEXT,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_items ("
+            " job_id TEXT NOT NULL,"
+            " item_key TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " error TEXT,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (job_id, item_key))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_checkpoints ("
+            " job_id TEXT NOT NULL,"
+            " item_key TEXT NOT NULL,"
+            " stage TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " PRIMARY KEY (job_id, item_key, stage))"
+        )
+        self._conn.commit()
+
+    def start_job(self, job_id: str, jd_path: Optional[str] = None) -> None:
+        """Registers `job_id` (a no-op, apart from the timestamp, when resuming) and evicts expired and surplus jobs."""
+        now = time.time()
+        with self._lock:
+            self._touch(job_id, now, jd_path)
+            self._evict(now)
+            self._conn.commit()
+
+    def _touch(self, job_id: str, now: float, jd_path: Optional[str] = None) -> None:
+        self._conn.execute(
+            "INSERT INTO jobs (job_id, jd_path, created_at, updated_at) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (job_id) DO UPDATE SET updated_at = excluded.updated_at,"
+            " jd_path = COALESCE(excluded.jd_path, jobs.jd_path)",
+            (job_id, jd_path, now, now),
+        )
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM jobs WHERE updated_at < ?", (now - self.max_age_seconds,))
+        self._conn.execute(
+            "DELETE FROM jobs WHERE job_id IN ("
+            " SELECT job_id FROM jobs ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_jobs,),
+        )
+        # every item and checkpoint write touches its job, so rows without one belong to evicted jobs
+        for table in ("job_checkpoints", "job_items"):
+            self._conn.execute(f"DELETE FROM {table} WHERE job_id NOT IN (SELECT job_id FROM jobs)")
+
+    def save_stage(self, job_id: str, item_key: str, stage: str, value: BaseModel) -> None:
+        """Checkpoints one stage output of one item."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_checkpoints (job_id, item_key, stage, value, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, item_key, stage, value.model_dump_json(), now),
+            )
+            self._touch(job_id, now)
+            self._conn.execute(
+                "INSERT INTO job_items (job_id, item_key, status, updated_at) VALUES (?, ?, 'running', ?)"
+                " ON CONFLICT (job_id, item_key) DO UPDATE SET updated_at = excluded.updated_at",
+                (job_id, item_key, now),
+            )
+            self._conn.commit()
+
+    def load_stages(self, job_id: str, item_key: str, types: Dict[str, Type[BaseModel]]) -> Dict[str, BaseModel]:
+        """
+        Returns the checkpointed outputs of one item.
+
+        Args:
+            job_id (str): The job.
+            item_key (str): The item inside the job.
+            types (Dict[str, Type[BaseModel]]): Output model of each stage to load; other stages are ignored.
+
+        Returns:
+            Dict[str, BaseModel]: {stage name: validated output}.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stage, value FROM job_checkpoints WHERE job_id = ? AND item_key = ?", (job_id, item_key)
+            ).fetchall()
+        return {stage: types[stage].model_validate_json(value) for stage, value in rows if stage in types}
+
+    def mark_item(self, job_id: str, item_key: str, status: str, error: Optional[str] = None) -> None:
+        """Records an item's outcome ("complete", "low_score", "prescreened_out" or "failed"); `attempts` counts the runs that reached one."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO job_items (job_id, item_key, status, attempts, error, updated_at) VALUES (?, ?, ?, 1, ?, ?)"
+                " ON CONFLICT (job_id, item_key) DO UPDATE SET status = excluded.status,"
+                " attempts = job_items.attempts + 1, error = excluded.error, updated_at = excluded.updated_at",
+                (job_id, item_key, status, error, now),
+            )
+            self._touch(job_id, now)
+            self._conn.commit()
+
+    def items(self, job_id: str, status: Optional[str] = None) -> List[dict]:
+        """
+        Returns:
+            List[dict]: item_key, status, attempts and error of the job's items (optionally only those with `status`).
+        """
+        query = "SELECT item_key, status, attempts, error FROM job_items WHERE job_id = ?"
+        params = [job_id]
+        if status is not None:
+            query += " AND status = ?"
+            params.append(status)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY item_key", params).fetchall()
+        return [dict(zip(("item_key", "status", "attempts", "error"), row)) for row in rows]
+
+    def summary(self, job_id: str) -> dict:
+        """
+        Returns:
+            dict: The job's jd_path and its number of items per status.
+        """
+        with self._lock:
+            job = self._conn.execute("SELECT jd_path FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            counts = self._conn.execute(
+                "SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall()
+        return {"job_id": job_id, "jd_path": job[0] if job else None, "items": dict(counts)}
+
+    def delete_job(self, job_id: str) -> None:
+        """Removes a job with all its items and checkpoints."""
+        with self._lock:
+            for table in ("job_checkpoints", "job_items", "jobs"):
+                self._conn.execute(f"DELETE FROM {table} WHERE job_id = ?", (job_id,))
+            self._conn.commit()
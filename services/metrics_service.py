@@ -0,0 +1,287 @@
+import json
+import math
+import threading
+import time
+import warnings
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+
+from config import DefaultCFG
+
+
+@dataclass
+class CallStats:
+    """
+    Measurements of one observed stage execution.
+
+    Agents and the rate limiter add to the CallStats of the stage they run in
+    (see `current_call`), so one record covers the whole stage: model calls,
+    retries, timeouts, hedged requests, rate-limit waits, token usage, cache
+    hits, coalesced requests and model-cascade escalations.
+    """
+    stage: str
+    batch_id: Optional[str] = None
+    agent: Optional[str] = None
+    started_at: float = 0.0
+    wall_seconds: float = 0.0
+    wait_seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    model_calls: int = 0
+    retries: int = 0
+    timeouts: int = 0
+    hedges: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0
+    escalations: int = 0
+    error: Optional[str] = None
+
+
+_current_call: ContextVar[Optional[CallStats]] = ContextVar("current_call", default=None)
+
+
+def current_call() -> Optional[CallStats]:
+    """Returns the CallStats of the stage being observed in the current task, if any."""
+    return _current_call.get()
+
+
+@dataclass
+class _StageTotals:
+    count: int = 0
+    errors: int = 0
+    wall_seconds: float = 0.0
+    wait_seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    model_calls: int = 0
+    retries: int = 0
+    timeouts: int = 0
+    hedges: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0
+    escalations: int = 0
+    recent: Deque[float] = field(default_factory=deque)
+
+    def add(self, stats: CallStats) -> None:
+        self.count += 1
+        self.errors += stats.error is not None
+        self.wall_seconds += stats.wall_seconds
+        self.wait_seconds += stats.wait_seconds
+        self.input_tokens += stats.input_tokens
+        self.output_tokens += stats.output_tokens
+        self.model_calls += stats.model_calls
+        self.retries += stats.retries
+        self.timeouts += stats.timeouts
+        self.hedges += stats.hedges
+        self.cache_hits += stats.cache_hits
+        self.coalesced += stats.coalesced
+        self.escalations += stats.escalations
+        self.recent.append(stats.wall_seconds)
+
+    def summary(self) -> dict:
+        durations = sorted(self.recent)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "escalations": self.escalations,
+            "model_calls": self.model_calls,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "hedges": self.hedges,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "wall_seconds_total": round(self.wall_seconds, 6),
+            "wait_seconds_total": round(self.wait_seconds, 6),
+            "p50_seconds": _percentile(durations, 0.50),
+            "p95_seconds": _percentile(durations, 0.95),
+            "max_seconds": durations[-1] if durations else None,
+        }
+
+
+def _percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    rank = max(0, math.ceil(q * len(sorted_values)) - 1)
+    return round(sorted_values[rank], 6)
+
+
+class PipelineMetrics:
+    """
+    Per-stage latency, token, retry and cache instrumentation.
+
+    Wrap a unit of work in `observe(stage)`; everything the agents and the rate
+    limiter report while it runs is collected into one CallStats, which is added
+    to the running per-stage totals and to its batch, then passed to every hook.
+    The collected data can be exported as a JSON report (overall or per batch)
+    or in the Prometheus text exposition format.
+
+    Memory is bounded: only the last `max_samples` durations per stage feed the
+    percentiles, and only the last `max_batches` batches keep their records.
+    """
+
+    def __init__(
+        self,
+        max_samples: int = DefaultCFG.metrics_max_samples,
+        max_batches: int = DefaultCFG.metrics_max_batches,
+        namespace: str = "cv_screening",
+    ):
+        """
+        Args:
+            max_samples (int): Durations kept per stage for the p50/p95 estimates.
+            max_batches (int): Batches whose individual records are kept for per-batch reports.
+            namespace (str): Prefix of the exported Prometheus metric names.
+        """
+        self.max_samples = max_samples
+        self.max_batches = max_batches
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._totals: Dict[str, _StageTotals] = {}
+        self._batches: "OrderedDict[str, List[CallStats]]" = OrderedDict()
+        self._hooks: List[Callable[[CallStats], None]] = []
+
+    def add_hook(self, hook: Callable[[CallStats], None]) -> None:
+        """Registers `hook`, called with the CallStats of every observed stage once it finishes."""
+        self._hooks.append(hook)
+
+    @contextmanager
+    def observe(self, stage: str, batch_id: Optional[str] = None) -> Iterator[CallStats]:
+        """
+        Measures the enclosed block as one execution of `stage`.
+
+        Works in sync code and inside coroutines; in asyncio the stats are bound to
+        the current task, so concurrent stages never mix their numbers.
+        """
+        stats = CallStats(stage=stage, batch_id=batch_id, started_at=time.time())
+        token = _current_call.set(stats)
+        start = time.perf_counter()
+        try:
+            yield stats
+        except BaseException as exc:
+            stats.error = type(exc).__name__
+            raise
+        finally:
+            stats.wall_seconds = time.perf_counter() - start
+            _current_call.reset(token)
+            self.record(stats)
+
+    def record(self, stats: CallStats) -> None:
+        """Adds a finished CallStats to the totals and its batch, then runs the hooks."""
+        with self._lock:
+            totals = self._totals.get(stats.stage)
+            if totals is None:
+                totals = self._totals[stats.stage] = _StageTotals(recent=deque(maxlen=self.max_samples))
+            totals.add(stats)
+            if stats.batch_id is not None:
+                if stats.batch_id not in self._batches:
+                    self._batches[stats.batch_id] = []
+                    while len(self._batches) > self.max_batches:
+                        self._batches.popitem(last=False)
+                self._batches[stats.batch_id].append(stats)
+        for hook in self._hooks:
+            try:
+                hook(stats)
+            except Exception as exc:
+                warnings.warn(f"Metrics hook {hook!r} failed: {exc!r}")
+
+    def report(self, batch_id: Optional[str] = None) -> dict:
+        """
+        Summarizes the collected metrics.
+
+        Args:
+            batch_id (Optional[str]): Restrict the report to one batch; None reports the running totals.
+
+        Returns:
+            dict: {"batch_id", "stages": {stage: summary}} and, for a batch, its individual "records".
+        """
+        with self._lock:
+            if batch_id is None:
+                return {"batch_id": None, "stages": {name: totals.summary() for name, totals in self._totals.items()}}
+            records = list(self._batches.get(batch_id, []))
+
+        stages: Dict[str, _StageTotals] = {}
+        for stats in records:
+            stages.setdefault(stats.stage, _StageTotals()).add(stats)
+        return {
+            "batch_id": batch_id,
+            "stages": {name: totals.summary() for name, totals in stages.items()},
+            "records": [asdict(stats) for stats in records],
+        }
+
+    def to_json(self, batch_id: Optional[str] = None, path: Optional[str] = None) -> str:
+        """Returns `report(batch_id)` as JSON, also writing it to `path` if given."""
+        text = json.dumps(self.report(batch_id), indent=2)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
+
+    def to_prometheus(self) -> str:
+        """Renders the running totals in the Prometheus text exposition format."""
+        ns = self.namespace
+        with self._lock:
+            stages = {name: totals.summary() for name, totals in self._totals.items()}
+
+        lines = [
+            f"# HELP {ns}_stage_seconds Wall time of pipeline stages.",
+            f"# TYPE {ns}_stage_seconds summary",
+        ]
+        for name, summary in stages.items():
+            for quantile, key in (("0.5", "p50_seconds"), ("0.95", "p95_seconds")):
+                if summary[key] is not None:
+                    lines.append(f'{ns}_stage_seconds{{stage="{name}",quantile="{quantile}"}} {summary[key]}')
+            lines.append(f'{ns}_stage_seconds_sum{{stage="{name}"}} {summary["wall_seconds_total"]}')
+            lines.append(f'{ns}_stage_seconds_count{{stage="{name}"}} {summary["count"]}')
+
+        counters = (
+            ("stage_wait_seconds_total", "wait_seconds_total", "Time stages spent waiting on the rate limiter."),
+            ("stage_input_tokens_total", "input_tokens", "Input tokens reported by the model."),
+            ("stage_output_tokens_total", "output_tokens", "Output tokens reported by the model."),
+            ("stage_model_calls_total", "model_calls", "Model requests issued."),
+            ("stage_retries_total", "retries", "Requests retried after a rate-limit answer, timeout or transient error."),
+            ("stage_timeouts_total", "timeouts", "Requests that ran past their timeout."),
+            ("stage_hedges_total", "hedges", "Duplicate requests sent for slow requests."),
+            ("stage_cache_hits_total", "cache_hits", "Agent outputs served from the cache."),
+            ("stage_coalesced_total", "coalesced", "Requests that waited on an identical in-flight request."),
+            ("stage_escalations_total", "escalations", "Requests escalated from the cascade's fast model."),
+            ("stage_errors_total", "errors", "Stage executions that raised."),
+        )
+        for metric, key, help_text in counters:
+            lines.append(f"# HELP {ns}_{metric} {help_text}")
+            lines.append(f"# TYPE {ns}_{metric} counter")
+            for name, summary in stages.items():
+                lines.append(f'{ns}_{metric}{{stage="{name}"}} {summary[key]}')
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = DefaultCFG.metrics_port, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Serves `to_prometheus()` at http://host:port/metrics from a daemon thread.
+
+        Returns:
+            ThreadingHTTPServer: The running server; call `shutdown()` to stop it.
+        """
+        metrics = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        return server
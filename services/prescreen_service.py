@@ -0,0 +1,203 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from schemas.services_schemas import ParsedCV, ParsedJobDescription, SkillMatchingOutput, CandidateInsights, RedFlagReport
+from config import DefaultCFG
+
+
+# Common spellings/abbreviations mapped onto one canonical skill token.
+SKILL_ALIASES: Dict[str, str] = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "golang": "go",
+    "c sharp": "c#",
+    "csharp": "c#",
+    "cpp": "c++",
+    "node": "nodejs",
+    "node.js": "nodejs",
+    "react.js": "react",
+    "reactjs": "react",
+    "vue.js": "vue",
+    "vuejs": "vue",
+    "angularjs": "angular",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "k8s": "kubernetes",
+    "gcp": "google cloud",
+    "google cloud platform": "google cloud",
+    "aws": "amazon web services",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "tf": "tensorflow",
+    "ci/cd": "ci cd",
+    "cicd": "ci cd",
+    "rest": "rest api",
+    "restful": "rest api",
+    "restful api": "rest api",
+    "ms excel": "excel",
+    "microsoft excel": "excel",
+}
+
+_SPLIT_PATTERN = re.compile(r"[,;|/()\[\]]|\band\b")
+_VERSION_PATTERN = re.compile(r"\s+v?\d+(\.\d+)*$")
+_CLEAN_PATTERN = re.compile(r"[^\w+#./\- ]")
+
+
+def normalize_skill(skill: str, aliases: Dict[str, str] = SKILL_ALIASES) -> str:
+    """
+    Maps one skill string onto its canonical token, e.g. "ReactJS" -> "react", "Python 3" -> "python".
+    """
+    token = " ".join(_CLEAN_PATTERN.sub(" ", skill.lower()).split())
+    if token in aliases:
+        return aliases[token]
+    token = _VERSION_PATTERN.sub("", token.replace("-", " ")).strip(" .")
+    token = " ".join(token.split())
+    return aliases.get(token, token)
+
+
+def skill_tokens(skills: Optional[List[str]], aliases: Dict[str, str] = SKILL_ALIASES) -> set:
+    """
+    Splits and normalizes a list of free-form skill strings into a set of canonical tokens.
+
+    Entries such as "Python (Django, Flask)" or "SQL/NoSQL" contribute one token per part.
+    """
+    tokens = set()
+    for skill in skills or []:
+        if skill.lower().strip() in aliases:
+            tokens.add(aliases[skill.lower().strip()])
+            continue
+        for part in _SPLIT_PATTERN.split(skill.lower()):
+            token = normalize_skill(part, aliases)
+            if token:
+                tokens.add(token)
+    return tokens
+
+
+@dataclass
+class PreScreenResult:
+    index: int
+    score: float
+    matched_skills: List[str] = field(default_factory=list)
+    missing_skills: List[str] = field(default_factory=list)
+    shortlisted: bool = True
+
+
+class SkillPreScreener:
+    """
+    Cheap, deterministic shortlist before any LLM matching.
+
+    Each candidate's normalized skills are compared against the JD's required
+    skills across the whole pool at once: required skills are weighted by their
+    inverse document frequency over the pool (a skill every applicant lists
+    discriminates less than a rare one), and a candidate's score is the weighted
+    share of required skills they cover, 0-100.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DefaultCFG.prescreen_threshold,
+        top_k: int = DefaultCFG.prescreen_top_k,
+        aliases: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            threshold (float): Minimum score (0-100) needed to reach the LLM stages.
+            top_k (int): Keep at most this many candidates; 0 means no limit.
+            aliases (Optional[Dict[str, str]]): Extra alias entries merged over SKILL_ALIASES.
+        """
+        self.threshold = threshold
+        self.top_k = top_k
+        self.aliases = {**SKILL_ALIASES, **(aliases or {})}
+
+    def score(self, cvs: List[ParsedCV], jd: ParsedJobDescription) -> List[PreScreenResult]:
+        """
+        Scores every candidate and marks who is shortlisted.
+
+        Args:
+            cvs (List[ParsedCV]): The whole candidate pool.
+            jd (ParsedJobDescription): The job to screen against.
+
+        Returns:
+            List[PreScreenResult]: One entry per CV, aligned with `cvs`.
+        """
+        required = sorted(skill_tokens(jd.required_skills, self.aliases))
+        candidate_tokens = [skill_tokens(cv.skills, self.aliases) for cv in cvs]
+        if not cvs:
+            return []
+        if not required:
+            # nothing to compare against: everyone goes through
+            return [PreScreenResult(index=i, score=100.0) for i in range(len(cvs))]
+
+        column = {token: j for j, token in enumerate(required)}
+        hits = np.zeros((len(cvs), len(required)), dtype=np.float32)
+        for i, tokens in enumerate(candidate_tokens):
+            for token in tokens & column.keys():
+                hits[i, column[token]] = 1.0
+
+        document_frequency = hits.sum(axis=0)
+        idf = np.log((1.0 + len(cvs)) / (1.0 + document_frequency)) + 1.0
+        scores = 100.0 * (hits @ idf) / idf.sum()
+
+        shortlisted = scores >= self.threshold
+        if self.top_k and shortlisted.sum() > self.top_k:
+            ranked = np.argsort(-scores, kind="stable")
+            keep = np.zeros(len(cvs), dtype=bool)
+            keep[ranked[: self.top_k]] = True
+            shortlisted &= keep
+
+        return [
+            PreScreenResult(
+                index=i,
+                score=float(scores[i]),
+                matched_skills=[token for token in required if hits[i, column[token]]],
+                missing_skills=[token for token in required if not hits[i, column[token]]],
+                shortlisted=bool(shortlisted[i]),
+            )
+            for i in range(len(cvs))
+        ]
+
+    def local_skill_match(self, result: PreScreenResult) -> SkillMatchingOutput:
+        """Deterministic SkillMatchingOutput for a candidate that skipped the LLM matching."""
+        return SkillMatchingOutput(
+            skill_score=result.score,
+            experience_score=0,
+            education_score=0,
+            qualification_score=0,
+            responsibility_score=0,
+            total_score=result.score,
+            matched_skills=result.matched_skills,
+            missing_skills=result.missing_skills,
+            matched_responsibilities=[],
+            missing_responsibilities=[],
+            summary=(
+                f"Screened out by the local skill pre-screen ({result.score:.0f}% weighted overlap with the required skills). "
+                "Experience, education, qualifications and responsibilities were not evaluated."
+            ),
+        )
+
+    def local_insights(self, result: PreScreenResult) -> CandidateInsights:
+        return CandidateInsights(
+            strengths=[f"Has required skill: {skill}" for skill in result.matched_skills],
+            weaknesses=[f"Missing required skill: {skill}" for skill in result.missing_skills],
+            potential=None,
+            insight_summary="Not analysed by the LLM: below the pre-screen shortlist.",
+        )
+
+    def local_red_flags(self, result: PreScreenResult) -> RedFlagReport:
+        return RedFlagReport(
+            red_flags=[f"Low required-skill overlap ({result.score:.0f}%)"]
+            + [f"Missing critical skill: {skill}" for skill in result.missing_skills],
+            severity_level="High",
+            flagged_summary="Candidate did not make the local pre-screen shortlist.",
+        )
@@ -0,0 +1,193 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable
+
+from pydantic_ai.exceptions import ModelHTTPError
+
+from services.metrics_service import current_call
+from config import DefaultCFG
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Returns True if `exc` is the provider telling us to slow down (HTTP 429 / RESOURCE_EXHAUSTED)."""
+    if isinstance(exc, ModelHTTPError):
+        return exc.status_code == 429
+    return "RESOURCE_EXHAUSTED" in str(exc)
+
+
+class RateLimiter:
+    """
+    Shared token-bucket limiter for LLM requests.
+
+    Two buckets are tracked: requests per minute and tokens per minute. Callers
+    reserve one request plus an estimate of the tokens they will use, and wait only
+    when a bucket is empty. When the provider still answers with a rate-limit error,
+    every caller is paused for an exponentially growing, jittered backoff.
+
+    The bucket state is guarded by a threading lock that is never held across an
+    await, so one instance can be shared by threads (e.g. Streamlit sessions) and
+    by asyncio tasks alike.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = DefaultCFG.requests_per_minute,
+        tokens_per_minute: float = DefaultCFG.tokens_per_minute,
+        max_retries: int = DefaultCFG.rate_limit_max_retries,
+        base_backoff: float = DefaultCFG.rate_limit_base_backoff,
+        max_backoff: float = DefaultCFG.rate_limit_max_backoff,
+    ):
+        """
+        Args:
+            requests_per_minute (float): Request quota; 0 disables the request bucket.
+            tokens_per_minute (float): Token quota; 0 disables the token bucket.
+            max_retries (int): How many times a rate-limited call is retried before the error is raised.
+            base_backoff (float): First backoff delay in seconds after a rate-limit error.
+            max_backoff (float): Upper bound for the backoff delay in seconds.
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()
+        self._request_level = float(requests_per_minute)
+        self._token_level = float(tokens_per_minute)
+        self._updated_at = time.monotonic()
+        self._cooldown_until = 0.0
+
+        self.rate_limited_responses = 0
+        self.total_wait_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        if self.requests_per_minute:
+            self._request_level = min(self.requests_per_minute, self._request_level + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self._token_level = min(self.tokens_per_minute, self._token_level + elapsed * self.tokens_per_minute / 60)
+
+    def _try_reserve(self, tokens: int) -> float:
+        """Reserves capacity and returns 0.0, or returns how long to wait before trying again."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._cooldown_until:
+                return self._cooldown_until - now
+
+            wait = 0.0
+            if self.requests_per_minute and self._request_level < 1:
+                wait = max(wait, (1 - self._request_level) * 60 / self.requests_per_minute)
+            if self.tokens_per_minute:
+                # a single request larger than the whole quota only waits for a full bucket
+                needed = min(tokens, self.tokens_per_minute)
+                if self._token_level < needed:
+                    wait = max(wait, (needed - self._token_level) * 60 / self.tokens_per_minute)
+            if wait > 0:
+                return wait
+
+            if self.requests_per_minute:
+                self._request_level -= 1
+            if self.tokens_per_minute:
+                self._token_level -= tokens
+            return 0.0
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Blocks the calling thread until a request of `tokens` estimated tokens may be sent.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            wait = self._try_reserve(tokens)
+            if wait <= 0:
+                break
+            time.sleep(wait)
+            waited += wait
+        with self._lock:
+            self.total_wait_seconds += waited
+        return waited
+
+    def try_acquire(self, tokens: int = 0) -> bool:
+        """Reserves a request of `tokens` estimated tokens if it may be sent right now, without waiting."""
+        return self._try_reserve(tokens) <= 0
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """
+        Async version of `acquire`; waits with asyncio.sleep so other tasks keep running.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            wait = self._try_reserve(tokens)
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+            waited += wait
+        with self._lock:
+            self.total_wait_seconds += waited
+        return waited
+
+    def settle(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Corrects the token bucket once the real usage of a request is known."""
+        if not self.tokens_per_minute:
+            return
+        with self._lock:
+            self._token_level -= actual_tokens - estimated_tokens
+
+    def _backoff(self, attempt: int) -> float:
+        """Registers a rate-limit response and pauses every caller for a jittered exponential delay."""
+        delay = min(self.max_backoff, self.base_backoff * 2 ** attempt)
+        delay = random.uniform(delay / 2, delay)
+        with self._lock:
+            self.rate_limited_responses += 1
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+        return delay
+
+    async def arun(self, call: Callable[[], Awaitable[Any]], estimated_tokens: int = 0) -> Any:
+        """
+        Runs `call` under the limiter, retrying with backoff on rate-limit errors.
+
+        Args:
+            call (Callable[[], Awaitable]): Zero-argument coroutine function issuing the request.
+            estimated_tokens (int): Tokens to reserve for the request.
+
+        Returns:
+            Any: Whatever `call` returns.
+        """
+        stats = current_call()
+        attempt = 0
+        while True:
+            waited = await self.aacquire(estimated_tokens)
+            if stats is not None:
+                stats.wait_seconds += waited
+            try:
+                return await call()
+            except Exception as exc:
+                if not is_rate_limit_error(exc) or attempt >= self.max_retries:
+                    raise
+                self._backoff(attempt)
+                attempt += 1
+                if stats is not None:
+                    stats.retries += 1
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Current bucket levels, number of rate-limit responses seen and total time spent waiting.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "requests_available": self._request_level,
+                "tokens_available": self._token_level,
+                "rate_limited_responses": self.rate_limited_responses,
+                "total_wait_seconds": self.total_wait_seconds,
+            }
@@ -0,0 +1,100 @@
+import asyncio
+import concurrent.futures
+import copy
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+from services.metrics_service import current_call
+
+
+class _Abandoned(Exception):
+    """Set on a flight whose leader was cancelled; its followers start a new one."""
+
+
+class SingleFlight:
+    """
+    In-process coalescing of identical concurrent requests.
+
+    The first caller of `run(key, call)` (the leader) executes `call`; every
+    caller arriving with the same key while it is in flight (a follower) waits
+    for that one execution instead of issuing its own, and gets a copy of its
+    result. Flights are plain concurrent.futures Futures, so followers can wait
+    from any thread or event loop, e.g. other Streamlit sessions.
+
+    If the leader's call raises, every follower of that flight raises the same
+    error (nothing is cached, so a later call tries again). If the leader is
+    cancelled, its followers are not: one of them starts a new flight. A
+    cancelled follower never affects the flight.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, concurrent.futures.Future] = {}
+        self._counts = {"leaders": 0, "followers": 0, "errors": 0, "abandoned": 0}
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Args:
+            key (str): Identity of the request; equal keys must mean interchangeable results.
+            call (Callable[[], Awaitable[Any]]): Produces the result; only awaited by the leader.
+
+        Returns:
+            Any: The result of the flight (a deep copy of it for followers).
+        """
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = concurrent.futures.Future()
+                self._counts["leaders" if leader else "followers"] += 1
+
+            if leader:
+                return await self._lead(key, flight, call)
+
+            stats = current_call()
+            if stats is not None:
+                stats.coalesced += 1
+            waiter = asyncio.wrap_future(flight)
+            # consume the outcome even if this follower is cancelled before it arrives
+            waiter.add_done_callback(lambda done: done.cancelled() or done.exception())
+            try:
+                # shielded: cancelling a follower must not cancel the shared flight
+                return copy.deepcopy(await asyncio.shield(waiter))
+            except _Abandoned:
+                continue
+
+    async def _lead(self, key: str, flight: concurrent.futures.Future, call: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await call()
+        except Exception as exc:
+            self._land(key, "errors")
+            flight.set_exception(exc)
+            raise
+        except BaseException:
+            # cancelled (or interrupted): the followers did not ask for that
+            self._land(key, "abandoned")
+            flight.set_exception(_Abandoned())
+            raise
+        self._land(key)
+        flight.set_result(result)
+        return result
+
+    def _land(self, key: str, outcome: str = "") -> None:
+        with self._lock:
+            del self._flights[key]
+            if outcome:
+                self._counts[outcome] += 1
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def report(self) -> dict:
+        """
+        Returns:
+            dict: leaders (calls executed), followers (calls coalesced into another), errors
+                (failed flights, shared with their followers) and abandoned (cancelled leaders).
+        """
+        with self._lock:
+            return dict(self._counts)
@@ -0,0 +1,257 @@
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from schemas.services_schemas import ParsedCV, ParsedJobDescription
+from services.prescreen_service import SKILL_ALIASES, skill_tokens
+from config import DefaultCFG
+
+
+_WORD_PATTERN = re.compile(r"[a-z0-9+#]+")
+_ROLE_STOPWORDS = {"a", "an", "and", "at", "for", "in", "of", "the", "to", "with", "i", "ii", "iii"}
+# weight of a matched term by the field it comes from
+FIELD_WEIGHTS: Dict[str, float] = {"skill": 1.0, "role": 0.5, "cert": 0.5}
+
+
+@dataclass
+class PoolMatch:
+    candidate_id: str
+    source_path: Optional[str]
+    cv: ParsedCV
+    score: float
+    matched_terms: List[str] = field(default_factory=list)
+
+
+class TalentPool:
+    """
+    Persistent, locally searchable index of every candidate parsed so far.
+
+    Each ParsedCV is stored once (keyed by e-mail, else by its content) with an
+    inverted index over normalized skills, role words and certifications, and
+    optionally a feature-hashed bag-of-words vector of the whole CV. A new job
+    description retrieves the best prior candidates without re-reading or
+    re-parsing any file: the keyword score is the IDF-weighted share of the JD's
+    terms a candidate covers, optionally blended with the cosine similarity of
+    the hashed vectors. The index lives in SQLite and is mirrored in memory, so
+    queries take milliseconds.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DefaultCFG.talent_pool_path,
+        vector_dim: int = DefaultCFG.talent_pool_vector_dim,
+        vector_weight: float = DefaultCFG.talent_pool_vector_weight,
+        aliases: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            db_path (str): SQLite file of the pool (":memory:" for a process-local pool).
+            vector_dim (int): Size of the hashed vectors; 0 disables them (keyword retrieval only).
+            vector_weight (float): Share (0-1) of the final score taken from vector similarity.
+            aliases (Optional[Dict[str, str]]): Extra skill aliases merged over SKILL_ALIASES.
+        """
+        self.db_path = db_path
+        self.vector_dim = vector_dim
+        self.vector_weight = vector_weight if vector_dim else 0.0
+        self.aliases = {**SKILL_ALIASES, **(aliases or {})}
+        self._lock = threading.Lock()
+
+        if db_path != ":memory:" and os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS candidates ("
+            " candidate_id TEXT PRIMARY KEY,"
+            " source_path TEXT,"
+            " cv TEXT NOT NULL,"
+            " terms TEXT NOT NULL,"
+            " added_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+        # in-memory mirror: candidate -> (terms, source_path, cv json), term -> candidates
+        self._terms: Dict[str, Set[str]] = {}
+        self._sources: Dict[str, Optional[str]] = {}
+        self._cvs: Dict[str, str] = {}
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._vectors: Dict[str, np.ndarray] = {}
+        # query arrays (candidate rows, per-term rows, vectors), rebuilt lazily after changes
+        self._matrix_ids: Optional[List[str]] = None
+        self._rows: Dict[str, int] = {}
+        self._term_cache: Dict[str, np.ndarray] = {}
+        self._matrix: Optional[np.ndarray] = None
+        for candidate_id, source_path, cv_json, terms in self._conn.execute(
+            "SELECT candidate_id, source_path, cv, terms FROM candidates"
+        ):
+            self._index(candidate_id, source_path, cv_json, set(terms.split("\n")) - {""}, ParsedCV.model_validate_json(cv_json))
+
+    # --- Terms and vectors ---
+
+    @staticmethod
+    def _words(text: Optional[str]) -> List[str]:
+        return _WORD_PATTERN.findall((text or "").lower())
+
+    def cv_terms(self, cv: ParsedCV) -> Set[str]:
+        """Index terms of a candidate: "skill:<token>", "role:<word>" and "cert:<name>"."""
+        terms = {f"skill:{token}" for token in skill_tokens(cv.skills, self.aliases)}
+        terms |= {f"role:{word}" for word in self._words(cv.role) if word not in _ROLE_STOPWORDS}
+        terms |= {f"cert:{' '.join(self._words(cert))}" for cert in cv.certifications or [] if self._words(cert)}
+        return terms
+
+    def jd_terms(self, jd: ParsedJobDescription) -> Set[str]:
+        """Query terms of a job: its required skills, the words of its title and certifications named in its qualifications."""
+        terms = {f"skill:{token}" for token in skill_tokens(jd.required_skills, self.aliases)}
+        terms |= {f"role:{word}" for word in self._words(jd.job_title) if word not in _ROLE_STOPWORDS}
+        qualifications = " ".join(" ".join(self._words(line)) for line in jd.qualifications or [])
+        terms |= {term for term in self._postings if term.startswith("cert:") and term[5:] in qualifications}
+        return terms
+
+    def _vector(self, words: Iterable[str]) -> np.ndarray:
+        """L2-normalized feature-hashed bag of words (signed, so collisions cancel out on average)."""
+        vector = np.zeros(self.vector_dim, dtype=np.float32)
+        for word in words:
+            digest = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+            vector[digest % self.vector_dim] += 1.0 if digest >> 63 else -1.0
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def _cv_vector(self, cv: ParsedCV, terms: Set[str]) -> np.ndarray:
+        text = " ".join([cv.role or "", cv.summary or "", *cv.experience, *cv.education])
+        return self._vector([*terms, *self._words(text)])
+
+    def _jd_vector(self, jd: ParsedJobDescription, terms: Set[str]) -> np.ndarray:
+        text = " ".join([jd.job_title or "", jd.job_summary or "", *jd.responsibilities, *(jd.qualifications or [])])
+        return self._vector([*terms, *self._words(text)])
+
+    # --- Writes ---
+
+    @staticmethod
+    def candidate_id(cv: ParsedCV) -> str:
+        """The same person (by e-mail) keeps one entry; CVs without an e-mail are keyed by content."""
+        key = cv.email.strip().lower() if cv.email else cv.model_dump_json()
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+    def _index(self, candidate_id: str, source_path: Optional[str], cv_json: str, terms: Set[str], cv: ParsedCV) -> None:
+        self._unindex(candidate_id)
+        self._terms[candidate_id] = terms
+        self._sources[candidate_id] = source_path
+        self._cvs[candidate_id] = cv_json
+        for term in terms:
+            self._postings[term].add(candidate_id)
+        if self.vector_dim:
+            self._vectors[candidate_id] = self._cv_vector(cv, terms)
+        self._matrix_ids = None
+
+    def _unindex(self, candidate_id: str) -> None:
+        for term in self._terms.pop(candidate_id, ()):
+            self._postings[term].discard(candidate_id)
+            if not self._postings[term]:
+                del self._postings[term]
+        self._sources.pop(candidate_id, None)
+        self._cvs.pop(candidate_id, None)
+        self._vectors.pop(candidate_id, None)
+        self._matrix_ids = None
+
+    def add(self, cv: ParsedCV, source_path: Optional[str] = None) -> str:
+        """
+        Adds (or replaces) one candidate.
+
+        Args:
+            cv (ParsedCV): The parsed CV.
+            source_path (Optional[str]): The file it was parsed from, kept for reference.
+
+        Returns:
+            str: The candidate's id in the pool.
+        """
+        candidate_id = self.candidate_id(cv)
+        cv_json = cv.model_dump_json()
+        terms = self.cv_terms(cv)
+        with self._lock:
+            if self._cvs.get(candidate_id) == cv_json and self._sources.get(candidate_id) == source_path:
+                return candidate_id
+            self._conn.execute(
+                "INSERT OR REPLACE INTO candidates (candidate_id, source_path, cv, terms, added_at) VALUES (?, ?, ?, ?, ?)",
+                (candidate_id, source_path, cv_json, "\n".join(sorted(terms)), time.time()),
+            )
+            self._conn.commit()
+            self._index(candidate_id, source_path, cv_json, terms, cv)
+        return candidate_id
+
+    def remove(self, candidate_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM candidates WHERE candidate_id = ?", (candidate_id,))
+            self._conn.commit()
+            self._unindex(candidate_id)
+
+    def __len__(self) -> int:
+        return len(self._cvs)
+
+    # --- Retrieval ---
+
+    def query(self, jd: ParsedJobDescription, top_k: int = DefaultCFG.talent_pool_top_k) -> List[PoolMatch]:
+        """
+        Returns the `top_k` prior candidates that best fit a job description.
+
+        Args:
+            jd (ParsedJobDescription): The job to retrieve candidates for.
+            top_k (int): Number of candidates to return.
+
+        Returns:
+            List[PoolMatch]: Best first; `score` is 0-100.
+        """
+        with self._lock:
+            if not self._cvs or top_k <= 0:
+                return []
+            terms = self.jd_terms(jd)
+            ids = self._ids()
+            scores = np.zeros(len(ids), dtype=np.float64)
+            weights = {
+                term: FIELD_WEIGHTS[term.split(":", 1)[0]] * (math.log((1.0 + len(ids)) / (1.0 + len(self._postings.get(term, ())))) + 1.0)
+                for term in terms
+            }
+            total_weight = sum(weights.values())
+            for term, weight in weights.items():
+                scores[self._term_rows(term)] += 100.0 * weight / total_weight
+            if self.vector_weight:
+                similarity = np.clip(self._matrix @ self._jd_vector(jd, terms), 0.0, None)
+                scores = (1.0 - self.vector_weight) * scores + self.vector_weight * 100.0 * similarity
+
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > top_k:
+                candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+            ranked = sorted(candidates, key=lambda row: (-scores[row], ids[row]))
+            return [
+                PoolMatch(
+                    candidate_id=ids[row],
+                    source_path=self._sources[ids[row]],
+                    cv=ParsedCV.model_validate_json(self._cvs[ids[row]]),
+                    score=round(float(scores[row]), 2),
+                    matched_terms=sorted(terms & self._terms[ids[row]]),
+                )
+                for row in ranked
+            ]
+
+    def _ids(self) -> List[str]:
+        """Candidate ids in row order of the query arrays, rebuilt after the pool changed."""
+        if self._matrix_ids is None:
+            self._matrix_ids = list(self._cvs)
+            self._rows = {candidate_id: row for row, candidate_id in enumerate(self._matrix_ids)}
+            self._term_cache = {}
+            if self.vector_dim:
+                self._matrix = np.stack([self._vectors[candidate_id] for candidate_id in self._matrix_ids])
+        return self._matrix_ids
+
+    def _term_rows(self, term: str) -> np.ndarray:
+        """Rows of the candidates indexed under `term`."""
+        if term not in self._term_cache:
+            self._term_cache[term] = np.fromiter((self._rows[c] for c in self._postings.get(term, ())), dtype=np.intp)
+        return self._term_cache[term]
@@ -1,8 +1,9 @@
 # 📄 intro_page.py
 import streamlit as st
 import pathlib
-import tempfile
-import os
+import hashlib
+
+from services.input_service import InMemoryDocument
 
 class IntroductoryPage:
     def __init__(self):
@@ -34,24 +35,21 @@ class IntroductoryPage:
             st.success("Files uploaded successfully! Ready for analysis.")
             if st.button("🚀 Run Screening"):
                 with st.spinner("Analyzing CVs..."):
-                    temp_dir = tempfile.mkdtemp()
-
-                    # Save JD
-                    jd_path = os.path.join(temp_dir, self.jd_file.name)
-                    with open(jd_path, "wb") as f:
-                        f.write(self.jd_file.read())
+                    # uploads are screened straight from memory: no temp files to write or clean up
+                    jd_document = InMemoryDocument(self.jd_file.name, self.jd_file.getbuffer())
+                    cv_documents = [InMemoryDocument(cv_file.name, cv_file.getbuffer()) for cv_file in self.cv_files]
 
-                    # Save CVs
-                    cv_paths = []
-                    for cv_file in self.cv_files:
-                        path = os.path.join(temp_dir, cv_file.name)
-                        with open(path, "wb") as f:
-                            f.write(cv_file.read())
-                        cv_paths.append(path)
+                    # identifies this upload batch so results survive reruns
+                    batch_hash = hashlib.sha256()
+                    batch_hash.update(jd_document.data)
+                    for document in cv_documents:
+                        batch_hash.update(document.name.encode("utf-8"))
+                        batch_hash.update(document.data)
 
                     st.session_state["show_results"] = True
-                    st.session_state["jd_path"] = jd_path
-                    st.session_state["cv_paths"] = cv_paths
+                    st.session_state["jd_document"] = jd_document
+                    st.session_state["cv_documents"] = cv_documents
+                    st.session_state["batch_key"] = batch_hash.hexdigest()
 
                     st.rerun()
         else:
@@ -1,6 +1,9 @@
+import hashlib
+import os
 import streamlit as st
-from typing import List
+from typing import Dict, List, Optional
 from core.cv_manager import CVScreeningManager
+from services.input_service import DocumentSource, document_key
 from schemas.services_schemas import CVAnalysisResult, ParsedCV, ParsedJobDescription, SkillMatchingOutput, CandidateInsights, RedFlagReport
 from config import DefaultCFG
 
@@ -8,136 +11,306 @@ from config import DefaultCFG
 from schemas.services_schemas import CVAnalysisResult, ParsedCV, ParsedJobDescription, SkillMatchingOutput, CandidateInsights, RedFlagReport
 
 
+SORT_COLUMNS = ["Total", "Skills", "Experience", "Education", "Qualifications", "Responsibilities", "Severity", "Name", "#"]
+DESCENDING_BY_DEFAULT = {"Total", "Skills", "Experience", "Education", "Qualifications", "Responsibilities"}
+SEVERITY_ORDER = {"Low": 0, "Medium": 1, "High": 2}
+PAGE_SIZES = [10, 25, 50, 100]
 
 
 class ResultsPage:
-    def __init__(self, screening_manager: CVScreeningManager, jd_path: str, cv_paths: List[str]):
+    def __init__(self, screening_manager: CVScreeningManager, jd_source: DocumentSource, cv_sources: List[DocumentSource], batch_key: Optional[str] = None):
         self.screening_manager = screening_manager
-        self.jd_path = jd_path
-        self.cv_paths = cv_paths
+        self.jd_source = jd_source
+        self.cv_sources = cv_sources
+        # results are keyed by CVAnalysisResult.item_key: upload names may repeat, keys do not
+        self.cv_keys = [document_key(source) for source in cv_sources]
+        self.batch_key = batch_key or "|".join([document_key(jd_source), *self.cv_keys])
+
+    def _batch_state(self) -> dict:
+        """
+        Returns the session-scoped results of the current upload batch.
+
+        Streamlit re-executes the page on every widget interaction, so finished
+        results live in st.session_state and only CVs without a result are screened.
+        The pre-screen shortlist is kept too: it is cut once over the whole batch, and
+        screening the rest after a rerun keeps those decisions. Only the latest batch is kept.
+        """
+        state = st.session_state.get("screening_results")
+        if state is None or state["batch_key"] != self.batch_key:
+            state = {"batch_key": self.batch_key, "parsed_jd": None, "shortlist": {}, "results": {}}
+            st.session_state["screening_results"] = state
+        return state
 
     def render(self):
         st.markdown('<div class="header-text">📊 Screening Results</div>', unsafe_allow_html=True)
-        st.markdown('<div class="subheader-text">Click on a candidate card to view personalized insights and match details.</div>', unsafe_allow_html=True)
+        st.markdown('<div class="subheader-text">Filter and sort the candidate index, then pick a candidate to view personalized insights and match details.</div>', unsafe_allow_html=True)
+
+        state = self._batch_state()
+        results: Dict[str, CVAnalysisResult] = state["results"]
+
+        remaining = [source for source, cv_key in zip(self.cv_sources, self.cv_keys) if cv_key not in results]
+        if remaining:
+            self._screen(state, remaining)
+
+        self._render_index(results)
+        self._render_metrics()
+
+    def _screen(self, state: dict, remaining: List[DocumentSource]):
+        """Screens the CVs without a result, showing progress; a rerun mid-batch keeps every finished result."""
+        results: Dict[str, CVAnalysisResult] = state["results"]
+        total = len(self.cv_keys)
+        progress = st.progress(len(results) / total, text=f"Screened {len(results)}/{total} CVs")
+        if state["parsed_jd"] is None:
+            state["parsed_jd"] = self.screening_manager.parse_job_description(self.jd_source, batch_id=self.metrics_batch_id)
+
+        for result in self.screening_manager.iter_cvs_against_parsed_jd(
+            remaining, state["parsed_jd"], batch_id=self.metrics_batch_id, shortlist=state["shortlist"]
+        ):
+            results[result.item_key] = result
+            progress.progress(len(results) / total, text=f"Screened {len(results)}/{total} CVs")
+        progress.empty()
+
+    # --- Candidate index ---
+
+    @staticmethod
+    def _summary_row(position: int, result: CVAnalysisResult) -> dict:
+        """One flat row of the candidate index (sub-scores are None for failed CVs)."""
+        skill = result.skill_match
+        name = result.cv.name if result.cv and result.cv.name else None
+        return {
+            "#": position,
+            "Name": name or os.path.basename(result.source_path or "") or f"Candidate {position}",
+            "Total": round(skill.total_score, 1) if skill else None,
+            "Skills": round(skill.skill_score) if skill else None,
+            "Experience": round(skill.experience_score) if skill else None,
+            "Education": round(skill.education_score) if skill else None,
+            "Qualifications": round(skill.qualification_score) if skill else None,
+            "Responsibilities": round(skill.responsibility_score) if skill else None,
+            "Severity": result.red_flags.severity_level if result.red_flags else None,
+            "Status": result.status + (" (duplicate)" if result.duplicate_of else ""),
+            "File": os.path.basename(result.source_path or ""),
+        }
+
+    @staticmethod
+    def _filter_rows(rows: List[dict], query: str, min_total: float, severities: List[str], statuses: List[str]) -> List[dict]:
+        query = query.strip().lower()
+        return [
+            row for row in rows
+            if (not query or query in row["Name"].lower() or query in row["File"].lower())
+            and (row["Total"] or 0.0) >= min_total
+            and (not severities or row["Severity"] in severities)
+            and (not statuses or row["Status"].split(" ")[0] in statuses)
+        ]
 
-        results: List[CVAnalysisResult] = self.screening_manager.run_cvs_against_jd(
-            self.cv_paths, self.jd_path, verbose=False, sleep_time_between_requests=DefaultCFG.sleep_time_between_requests
+    @staticmethod
+    def _sort_rows(rows: List[dict], column: str, descending: bool) -> List[dict]:
+        # rows without a value (failed CVs) always go last
+        present = [row for row in rows if row[column] is not None]
+        missing = [row for row in rows if row[column] is None]
+        if column == "Severity":
+            key = lambda row: SEVERITY_ORDER.get(row[column], len(SEVERITY_ORDER))
+        elif column in ("Name", "File"):
+            key = lambda row: str(row[column]).lower()
+        else:
+            key = lambda row: row[column]
+        return sorted(present, key=key, reverse=descending) + missing
+
+    def _render_index(self, results: Dict[str, CVAnalysisResult]):
+        """
+        Renders a filterable, sortable, paginated index of the results and the detail card of one candidate.
+
+        Filtering, sorting and paging happen here, so only one page of rows goes to
+        the browser (as a single dataframe) and only the selected card is built.
+        """
+        rows = [self._summary_row(idx, results[cv_key]) for idx, cv_key in enumerate(self.cv_keys, 1) if cv_key in results]
+        if not rows:
+            return
+
+        col1, col2 = st.columns([2, 1])
+        query = col1.text_input("Search name or file", key="results_query")
+        min_total = col2.slider("Minimum total match", 0, 100, 0, key="results_min_total")
+        col1, col2 = st.columns(2)
+        severities = col1.multiselect("Severity", sorted({row["Severity"] for row in rows if row["Severity"]}, key=lambda s: SEVERITY_ORDER.get(s, 99)), key="results_severity")
+        statuses = col2.multiselect("Status", sorted({row["Status"].split(" ")[0] for row in rows}), key="results_status")
+        col1, col2, col3 = st.columns([2, 1, 1])
+        sort_column = col1.selectbox("Sort by", SORT_COLUMNS, key="results_sort")
+        descending = col2.toggle("Descending", value=sort_column in DESCENDING_BY_DEFAULT, key=f"results_descending_{sort_column}")
+        page_size = col3.selectbox("Per page", PAGE_SIZES, index=PAGE_SIZES.index(DefaultCFG.results_page_size) if DefaultCFG.results_page_size in PAGE_SIZES else 0, key="results_page_size")
+
+        visible = self._sort_rows(self._filter_rows(rows, query, min_total, severities, statuses), sort_column, descending)
+        pages = max(1, -(-len(visible) // page_size))
+        # session state is the page widget's only source of value, so it can be clamped before the widget exists
+        st.session_state.setdefault("results_page", 1)
+        if st.session_state["results_page"] > pages:
+            st.session_state["results_page"] = pages  # the filters shrank the result set
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key="results_page") if pages > 1 else 1
+        page_rows = visible[(page - 1) * page_size:page * page_size]
+
+        st.caption(f"{len(visible)} of {len(rows)} candidates match the filters")
+        if not page_rows:
+            return
+        st.dataframe(page_rows, hide_index=True, width="stretch")
+
+        labels = {
+            row["#"]: f"{row['Name']} ({row['Total']:.0f}% match)" if row["Total"] is not None else f"{row['Name']} (failed)"
+            for row in page_rows
+        }
+        selected = st.selectbox("View candidate", list(labels), format_func=lambda position: labels.get(position, str(position)), key="results_selected")
+        self._render_candidate(selected, results[self.cv_keys[selected - 1]])
+
+    @property
+    def metrics_batch_id(self) -> str:
+        # every rerun of the same uploads reports into one batch
+        return hashlib.sha256(self.batch_key.encode("utf-8")).hexdigest()[:12]
+
+    def _render_metrics(self):
+        metrics = getattr(self.screening_manager, "metrics", None)
+        if metrics is None:
+            return
+        st.download_button(
+            "⬇️ Download stage metrics (JSON)",
+            data=metrics.to_json(self.metrics_batch_id),
+            file_name=f"screening_metrics_{self.metrics_batch_id}.json",
+            mime="application/json",
         )
-        for idx, result in enumerate(results, 1):
-            cv: ParsedCV = result.cv
-            jd: ParsedJobDescription = result.job_description
-            skill: SkillMatchingOutput = result.skill_match
-            insights: CandidateInsights = result.insights
-            red_flags: RedFlagReport = result.red_flags
-
-            candidate_name = cv.name or f"Candidate {idx}"
-
-            with st.expander(f"👤 {candidate_name} ({round(skill.total_score)}% match)"):
-                # --- Job Description Summary Sticky Box ---
-                st.markdown(
-                    f"""
-                    <div style='background-color: #26272B; border-radius: 10px; padding: 1rem; margin-bottom: 1rem;'>
-                        <strong>📋 {jd.job_title}</strong> at <strong>{jd.company}</strong><br>
-                        <span style="color: #aaa;">{jd.location or 'Location N/A'} | {jd.employment_type}, {jd.seniority_level}</span><br><br>
-                        <em>{jd.job_summary or 'No summary available.'}</em>
-                    </div>
-                    """,
-                    unsafe_allow_html=True
-                )
-
-                # --- Metrics Row ---
-                col1, col2, col3 = st.columns(3)
-                col1.metric("Total Match", f"{skill.total_score:.1f}%", delta=None)
-                col2.metric("Skill Score", f"{skill.skill_score:.0f}%")
-                col3.metric("Experience Score", f"{skill.experience_score:.0f}%")
-
-                st.divider()
-
-                # 🎯 Skills Section
-                st.subheader("🎯 Skills & Responsibilities Overview")
-
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.markdown("**✅ Matched Skills**")
-                    for skill_tag in skill.matched_skills or []:
-                        st.markdown(f"<span style='background:#0e6251;padding:6px 10px;border-radius:5px;margin-right:4px;color:white;'>{skill_tag}</span>", unsafe_allow_html=True)
-                with col2:
-                    st.markdown("**❌ Missing Skills**")
-                    for missing in skill.missing_skills or []:
-                        st.markdown(f"<span style='background:#922b21;padding:6px 10px;border-radius:5px;margin-right:4px;color:white;'>{missing}</span>", unsafe_allow_html=True)
-
-                # Responsibilities
-                with st.container():
-                    st.markdown("#### 📋 Responsibilities Match")
-                    st.markdown("**✅ Matched Responsibilities:**")
-                    for r in skill.matched_responsibilities or []:
-                        st.success(f"✓ {r}")
-                    st.markdown("**❌ Missing Responsibilities:**")
-                    for r in skill.missing_responsibilities or []:
-                        st.error(f"✗ {r}")
-
-                st.divider()
-
-                # 💡 Insights
-                st.subheader("💡 Candidate Insights")
-                st.markdown(f"> {insights.insight_summary or 'No insight summary.'}")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.markdown("**✔️ Strengths**")
-                    for s in insights.strengths or []:
-                        st.success(f"{s}")
-                with col2:
-                    st.markdown("**⚠️ Weaknesses**")
-                    for w in insights.weaknesses or []:
-                        st.warning(f"{w}")
-
-                if insights.potential:
-                    st.info(f"🌟 Potential: _{insights.potential}_")
-
-                st.divider()
-
-                # 🚩 Red Flags
-                if red_flags.red_flags:
-                    st.subheader("🚩 Red Flags")
-                    for f in red_flags.red_flags:
-                        st.error(f"⚠️ {f}")
-                    st.caption(f"Severity: **{red_flags.severity_level}** — {red_flags.flagged_summary}")
-                else:
-                    st.success("✅ No red flags detected.")
-
-                st.divider()
-
-                # 📄 CV Details Tabs
-                tab1, tab2 = st.tabs(["📄 Candidate Info", "📋 JD Requirements"])
-
-                with tab1:
-                    st.markdown(f"**Name:** {cv.name}")
-                    st.markdown(f"**Email:** `{cv.email}` | **Phone:** `{cv.phone}`")
-                    st.markdown("**Summary:**")
-                    st.markdown(f"> {cv.summary or 'N/A'}")
-                    st.markdown("**🎓 Education:**")
-                    for edu in cv.education or []:
-                        st.markdown(f"- {edu}")
-                    st.markdown("**💼 Experience:**")
-                    for exp in cv.experience or []:
-                        st.markdown(f"- {exp}")
-                    if cv.certifications:
-                        st.markdown("**📜 Certifications:**")
-                        for cert in cv.certifications:
-                            st.markdown(f"- {cert}")
-                    if cv.skills:
-                        st.markdown("**🏷️ Skills:**")
-                        st.code(", ".join(cv.skills))
-
-                with tab2:
-                    st.markdown("**Required Skills:**")
-                    st.code(", ".join(jd.required_skills or []))
-                    if jd.qualifications:
-                        st.markdown("**Qualifications:**")
-                        for q in jd.qualifications:
-                            st.markdown(f"- {q}")
-                    if jd.responsibilities:
-                        st.markdown("**Responsibilities:**")
-                        for r in jd.responsibilities:
-                            st.markdown(f"- {r}")
-                    st.markdown(f"**Industry:** {jd.industry}")
+
+    def _render_candidate(self, idx: int, result: CVAnalysisResult):
+        cv: ParsedCV = result.cv
+        jd: ParsedJobDescription = result.job_description
+        skill: SkillMatchingOutput = result.skill_match
+        insights: CandidateInsights = result.insights
+        red_flags: RedFlagReport = result.red_flags
+
+        if result.status == "failed":
+            name = cv.name if cv and cv.name else os.path.basename(result.source_path or "") or f"Candidate {idx}"
+            with st.expander(f"⚠️ {name} (screening failed)", expanded=True):
+                st.error(f"This CV could not be screened: {result.error}")
+            return
+
+        candidate_name = cv.name or f"Candidate {idx}"
+
+        status_tag = {"prescreened_out": " · screened out", "low_score": " · low score"}.get(result.status, "")
+        if result.duplicate_of:
+            status_tag += " · duplicate"
+
+        with st.expander(f"👤 {candidate_name} ({round(skill.total_score)}% match{status_tag})", expanded=True):
+            if result.duplicate_of:
+                st.info(f"Duplicate of {os.path.basename(result.duplicate_of)}: the same CV was screened once and its result is shown here.")
+            if result.status == "prescreened_out":
+                st.info("Below the local skill pre-screen shortlist: scores are a local skill-overlap estimate and no LLM analysis was run.")
+            if result.status == "low_score":
+                st.info("Below the score gate: insights and red flags below are derived from the skill match, without the LLM.")
+                if st.button("🔍 Run full analysis", key=f"full_analysis_{idx}"):
+                    with st.spinner("Generating insights and red flags..."):
+                        full = self.screening_manager.run_full_analysis(result)
+                    self._batch_state()["results"][result.item_key] = full
+                    st.rerun()
+
+            # --- Job Description Summary Sticky Box ---
+            st.markdown(
+                f"""
+                <div style='background-color: #26272B; border-radius: 10px; padding: 1rem; margin-bottom: 1rem;'>
+                    <strong>📋 {jd.job_title}</strong> at <strong>{jd.company}</strong><br>
+                    <span style="color: #aaa;">{jd.location or 'Location N/A'} | {jd.employment_type}, {jd.seniority_level}</span><br><br>
+                    <em>{jd.job_summary or 'No summary available.'}</em>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+
+            # --- Metrics Row ---
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Total Match", f"{skill.total_score:.1f}%", delta=None)
+            col2.metric("Skill Score", f"{skill.skill_score:.0f}%")
+            col3.metric("Experience Score", f"{skill.experience_score:.0f}%")
+
+            st.divider()
+
+            # 🎯 Skills Section
+            st.subheader("🎯 Skills & Responsibilities Overview")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("**✅ Matched Skills**")
+                for skill_tag in skill.matched_skills or []:
+                    st.markdown(f"<span style='background:#0e6251;padding:6px 10px;border-radius:5px;margin-right:4px;color:white;'>{skill_tag}</span>", unsafe_allow_html=True)
+            with col2:
+                st.markdown("**❌ Missing Skills**")
+                for missing in skill.missing_skills or []:
+                    st.markdown(f"<span style='background:#922b21;padding:6px 10px;border-radius:5px;margin-right:4px;color:white;'>{missing}</span>", unsafe_allow_html=True)
+
+            # Responsibilities
+            with st.container():
+                st.markdown("#### 📋 Responsibilities Match")
+                st.markdown("**✅ Matched Responsibilities:**")
+                for r in skill.matched_responsibilities or []:
+                    st.success(f"✓ {r}")
+                st.markdown("**❌ Missing Responsibilities:**")
+                for r in skill.missing_responsibilities or []:
+                    st.error(f"✗ {r}")
+
+            st.divider()
+
+            # 💡 Insights
+            st.subheader("💡 Candidate Insights")
+            st.markdown(f"> {insights.insight_summary or 'No insight summary.'}")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("**✔️ Strengths**")
+                for s in insights.strengths or []:
+                    st.success(f"{s}")
+            with col2:
+                st.markdown("**⚠️ Weaknesses**")
+                for w in insights.weaknesses or []:
+                    st.warning(f"{w}")
+
+            if insights.potential:
+                st.info(f"🌟 Potential: _{insights.potential}_")
+
+            st.divider()
+
+            # 🚩 Red Flags
+            if red_flags.red_flags:
+                st.subheader("🚩 Red Flags")
+                for f in red_flags.red_flags:
+                    st.error(f"⚠️ {f}")
+                st.caption(f"Severity: **{red_flags.severity_level}** — {red_flags.flagged_summary}")
+            else:
+                st.success("✅ No red flags detected.")
+
+            st.divider()
+
+            # 📄 CV Details Tabs
+            tab1, tab2 = st.tabs(["📄 Candidate Info", "📋 JD Requirements"])
+
+            with tab1:
+                st.markdown(f"**Name:** {cv.name}")
+                st.markdown(f"**Email:** `{cv.email}` | **Phone:** `{cv.phone}`")
+                st.markdown("**Summary:**")
+                st.markdown(f"> {cv.summary or 'N/A'}")
+                st.markdown("**🎓 Education:**")
+                for edu in cv.education or []:
+                    st.markdown(f"- {edu}")
+                st.markdown("**💼 Experience:**")
+                for exp in cv.experience or []:
+                    st.markdown(f"- {exp}")
+                if cv.certifications:
+                    st.markdown("**📜 Certifications:**")
+                    for cert in cv.certifications:
+                        st.markdown(f"- {cert}")
+                if cv.skills:
+                    st.markdown("**🏷️ Skills:**")
+                    st.code(", ".join(cv.skills))
+
+            with tab2:
+                st.markdown("**Required Skills:**")
+                st.code(", ".join(jd.required_skills or []))
+                if jd.qualifications:
+                    st.markdown("**Qualifications:**")
+                    for q in jd.qualifications:
+                        st.markdown(f"- {q}")
+                if jd.responsibilities:
+                    st.markdown("**Responsibilities:**")
+                    for r in jd.responsibilities:
+                        st.markdown(f"- {r}")
+                st.markdown(f"**Industry:** {jd.industry}")